@@ -48,6 +48,77 @@ class Config:
 
     # --- QGIS Settings ---
     IDPM_PLUGIN_GROUP_NAME = "IDPM Layers"
+    # Interval for polling the QC tables for new rows (0 disables polling)
+    QC_SYNC_INTERVAL_MS = int(os.getenv("QC_SYNC_INTERVAL_MS", "60000"))
+    # Image list thumbnails: parallel downloads and decoded pixmaps kept in memory
+    THUMBNAIL_MAX_CONCURRENT = int(os.getenv("THUMBNAIL_MAX_CONCURRENT", "4"))
+    THUMBNAIL_MEMORY_CACHE_SIZE = int(os.getenv("THUMBNAIL_MEMORY_CACHE_SIZE", "200"))
+    # Disk budget for cached thumbnails; least recently used files go first
+    THUMBNAIL_DISK_CACHE_MAX_BYTES = (
+        int(os.getenv("THUMBNAIL_DISK_CACHE_MAX_MB", "100")) * 1024 * 1024
+    )
+    # Features requested per catalog page
+    CATALOG_PAGE_SIZE = int(os.getenv("CATALOG_PAGE_SIZE", "200"))
+
+    # --- Download Settings ---
+    # Parallel connections across all downloads, and ranged segments per file
+    DOWNLOAD_MAX_CONNECTIONS = int(os.getenv("DOWNLOAD_MAX_CONNECTIONS", "6"))
+    DOWNLOAD_MAX_PER_HOST = int(os.getenv("DOWNLOAD_MAX_PER_HOST", "4"))
+    DOWNLOAD_SEGMENTS = int(os.getenv("DOWNLOAD_SEGMENTS", "4"))
+    # Files smaller than this per segment are fetched with fewer connections
+    DOWNLOAD_MIN_SEGMENT_SIZE = int(
+        os.getenv("DOWNLOAD_MIN_SEGMENT_SIZE", str(8 * 1024 * 1024))
+    )
+    # Global bandwidth cap in bytes per second (0 = unlimited)
+    DOWNLOAD_MAX_BYTES_PER_SEC = int(os.getenv("DOWNLOAD_MAX_BYTES_PER_SEC", "0"))
+    DOWNLOAD_MAX_RETRIES = int(os.getenv("DOWNLOAD_MAX_RETRIES", "3"))
+    # Finished downloads are rewritten as tiled COGs with internal overviews
+    COG_INGEST_ENABLED = os.getenv("COG_INGEST_ENABLED", "true").lower() == "true"
+    COG_BLOCK_SIZE = int(os.getenv("COG_BLOCK_SIZE", "512"))
+    # Generated products (NDVI, false color, custom index, AOI crops) are
+    # written as COGs with internal overviews built with this resampling
+    PRODUCT_OVERVIEWS_ENABLED = (
+        os.getenv("PRODUCT_OVERVIEWS_ENABLED", "true").lower() == "true"
+    )
+    OVERVIEW_RESAMPLING = os.getenv("OVERVIEW_RESAMPLING", "AVERAGE").upper()
+    # Disk budget for AOI crops and outputs; least recently used files go first
+    AOI_CACHE_MAX_BYTES = int(os.getenv("AOI_CACHE_MAX_MB", "2048")) * 1024 * 1024
+    # 512x512 blocks per windowed COG read (fewer when blocks are larger);
+    # cancellation is checked between reads
+    COG_READ_CHUNK_TILES = int(os.getenv("COG_READ_CHUNK_TILES", "4"))
+    # Kernel used when bands of different resolutions are aligned to one grid
+    BAND_RESAMPLING = os.getenv("BAND_RESAMPLING", "bilinear")
+    # AOI products whose bands fit in this budget are computed in memory,
+    # writing only the final product (0 = always crop bands to files)
+    AOI_IN_MEMORY_MAX_BYTES = int(os.getenv("AOI_IN_MEMORY_MAX_MB", "256")) * 1024 * 1024
+    # Scenes read concurrently when extracting polygon time series
+    TIME_SERIES_WORKERS = int(os.getenv("TIME_SERIES_WORKERS", "4"))
+    # Optional per-pixel cloud masking from the Sentinel-2 SCL band in index
+    # kernels (off by default). Virtual products are never masked.
+    # Masked classes: no data, saturated, cloud shadow, cloud (medium/high), cirrus
+    CLOUD_MASK_ENABLED = os.getenv("CLOUD_MASK_ENABLED", "false").lower() == "true"
+    CLOUD_MASK_SCL_CLASSES = tuple(
+        int(c) for c in os.getenv("CLOUD_MASK_SCL_CLASSES", "0,1,3,8,9,10").split(",")
+    )
+
+    # Temporal compositing: output block size (pixels) and worker threads
+    COMPOSITE_BLOCK_SIZE = int(os.getenv("COMPOSITE_BLOCK_SIZE", "512"))
+    COMPOSITE_WORKERS = int(os.getenv("COMPOSITE_WORKERS", "4"))
+    # Most scenes per composite (the least cloudy are used) and the block
+    # memory a composite may need; larger requests are refused
+    COMPOSITE_MAX_SCENES = int(os.getenv("COMPOSITE_MAX_SCENES", "30"))
+    COMPOSITE_MAX_MEMORY_BYTES = (
+        int(os.getenv("COMPOSITE_MAX_MEMORY_MB", "2048")) * 1024 * 1024
+    )
+
+    # Tiles read concurrently when an AOI spans several tiles
+    MOSAIC_WORKERS = int(os.getenv("MOSAIC_WORKERS", "4"))
+
+    # Publish AOI NDVI, False Color and custom products as VRTs over the band
+    # COGs, computed lazily while rendering, instead of writing GeoTIFFs
+    VIRTUAL_PRODUCTS_ENABLED = (
+        os.getenv("VIRTUAL_PRODUCTS_ENABLED", "false").lower() == "true"
+    )
 
     # --- Database Configuration (from .env) ---
     DB_HOST = os.getenv("DB_HOST")
@@ -1,6 +1,19 @@
 from .main import IDPMPlugin
 from .ndvi_worker import NdviTask
 from .asset_model import RasterAsset
+from .catalog_index import CatalogIndex
+from .thumbnail_loader import ThumbnailLoader
+from .catalog_client import CatalogClient, CatalogQuery
+from .cog_ingest import CogIngestTask, finalize_product, translate_to_cog
+from .local_product_index import LocalProductIndex
+from .cache_manager import CacheCompactionTask, CacheManager
+from .band_alignment import BandAligner, TargetGrid
+from .download_manager import (
+    DownloadJob,
+    DownloadManager,
+    PRIORITY_NORMAL,
+    PRIORITY_VISIBLE,
+)
 from .aoi_processing_tasks import (
     AoiVisualProcessingTask,
     AoiNdviProcessingTask,
@@ -8,6 +21,7 @@ from .aoi_processing_tasks import (
     AoiCustomCalculationTask,
 )
 from .cog_aio_loader import (
+    BandSourceResolver,
     CogAoiLoader,
     CogBandProcessor,
     QgisPluginIntegration,
@@ -15,7 +29,16 @@ from .cog_aio_loader import (
 )
 from .false_color_worker import FalseColorTask
 from .raster_calculator_worker import RasterCalculatorTask
-from .zonal_stats_worker import ZonalStatsTask
+from .zonal_stats_worker import (
+    BatchZonalStatsTask,
+    RemoteZonalStatsTask,
+    ZonalStatsTask,
+)
+from .zonal_statistics import compute_remote_zonal_statistics, compute_zonal_statistics
+from .time_series import TimeSeriesTask, select_scenes
+from .cloud_mask import SclCloudMask
+from .compositing import TemporalCompositeTask
+from .mosaic import MosaicReader, select_mosaic_tiles
 from .mangrove_classifier import (
     EnhancedMangroveClassificationTask,
 )
@@ -30,9 +53,36 @@ __all__ = [
     "NdviTask",
     "FalseColorTask",
     "RasterAsset",
+    "CatalogIndex",
+    "ThumbnailLoader",
+    "CatalogClient",
+    "CatalogQuery",
+    "DownloadManager",
+    "DownloadJob",
+    "PRIORITY_VISIBLE",
+    "PRIORITY_NORMAL",
+    "CogIngestTask",
+    "translate_to_cog",
+    "finalize_product",
+    "LocalProductIndex",
+    "CacheManager",
+    "CacheCompactionTask",
+    "BandAligner",
+    "TargetGrid",
     "RasterCalculatorTask",
     "ZonalStatsTask",
+    "BatchZonalStatsTask",
+    "RemoteZonalStatsTask",
+    "compute_zonal_statistics",
+    "compute_remote_zonal_statistics",
+    "TimeSeriesTask",
+    "select_scenes",
+    "SclCloudMask",
+    "TemporalCompositeTask",
+    "MosaicReader",
+    "select_mosaic_tiles",
     "EnhancedMangroveClassificationTask",  # NEW: Export mangrove task
+    "BandSourceResolver",
     "CogAoiLoader",  # Add placeholder to prevent import errors
     "CogBandProcessor",  # Add placeholder to prevent import errors
     "QgisPluginIntegration",  # Add placeholder to prevent import errors
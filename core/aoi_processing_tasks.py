@@ -1,6 +1,7 @@
 import os
+import shutil
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import TYPE_CHECKING, Callable, Dict, Optional, List, Union
 from qgis.core import (
     QgsTask,
     QgsRectangle,
@@ -10,6 +11,13 @@ from qgis.core import (
 )
 from PyQt5.QtCore import pyqtSignal
 
+from ..config import Config
+from .cog_ingest import finalize_product
+
+if TYPE_CHECKING:
+    from .cloud_mask import SclCloudMask
+    from .cog_aio_loader import AoiBand
+
 
 def _generate_timestamp() -> str:
     """Generate timestamp string for unique file naming."""
@@ -29,6 +37,7 @@ class AoiVisualProcessingTask(QgsTask):
         aoi_rect: QgsRectangle,
         canvas_crs: QgsCoordinateReferenceSystem,
         cache_dir: str,
+        local_visual_path: Optional[str] = None,
     ):
         task_name = f"Processing Visual AOI for {asset_id}"
         super().__init__(task_name, QgsTask.CanCancel)
@@ -38,23 +47,28 @@ class AoiVisualProcessingTask(QgsTask):
         self.aoi_rect = aoi_rect
         self.canvas_crs = canvas_crs
         self.cache_dir = cache_dir
+        self.local_visual_path = local_visual_path
         self.timestamp = _generate_timestamp()
         self.exception = None
 
     def run(self):
-        """Execute AOI visual processing - download with timestamped filename."""
+        """Execute AOI visual processing - crop into a timestamped file."""
         try:
-            from ..core import CogAoiLoader
+            from ..core import BandSourceResolver, CogAoiLoader
 
             self.setProgress(10)
             if self.isCanceled():
                 return False
 
-            # Initialize COG loader
+            # Initialize COG loader and pick the cheapest visual source
             cog_loader = CogAoiLoader()
+            resolver = BandSourceResolver(
+                cog_loader,
+                self.cache_dir,
+                {"visual": self.local_visual_path} if self.local_visual_path else None,
+            )
 
             # Create timestamped output path
-            base_name = os.path.basename(self.visual_url).replace(".tif", "")
             visual_cache_path = os.path.join(
                 self.cache_dir, f"{self.asset_id}_visual_aoi_{self.timestamp}.tif"
             )
@@ -64,7 +78,7 @@ class AoiVisualProcessingTask(QgsTask):
                 return False
 
             QgsMessageLog.logMessage(
-                f"Downloading visual from URL for AOI with timestamp {self.timestamp}",
+                f"Preparing visual for AOI with timestamp {self.timestamp}",
                 "AOIProcessing",
                 Qgis.Info,
             )
@@ -73,21 +87,24 @@ class AoiVisualProcessingTask(QgsTask):
             if self.isCanceled():
                 return False
 
-            cropped_path = cog_loader.load_cog_with_aoi(
+            cropped_path = resolver.resolve(
+                self.asset_id,
+                "visual",
                 self.visual_url,
                 self.aoi_rect,
                 self.canvas_crs,
-                cache_dir=self.cache_dir,
+                is_canceled=self.isCanceled,
             )
 
             self.setProgress(80)
             if self.isCanceled():
                 return False
 
-            if cropped_path and cropped_path != visual_cache_path:
-                # Rename to timestamped filename
-                os.rename(cropped_path, visual_cache_path)
+            if cropped_path:
+                # The AOI crop stays cached; the layer gets its own timestamped copy
+                shutil.copyfile(cropped_path, visual_cache_path)
                 cropped_path = visual_cache_path
+                finalize_product(visual_cache_path)
 
             if not cropped_path or not os.path.exists(cropped_path):
                 self.exception = Exception("Failed to download visual AOI from URL")
@@ -133,6 +150,9 @@ class AoiNdviProcessingTask(QgsTask):
         aoi_rect: QgsRectangle,
         canvas_crs: QgsCoordinateReferenceSystem,
         cache_dir: str,
+        local_band_paths: Optional[Dict[str, str]] = None,
+        scl_url: Optional[str] = None,
+        mosaic_tiles: Optional[List[Dict[str, str]]] = None,
     ):
         task_name = f"Processing NDVI AOI for {asset_id}"
         super().__init__(task_name, QgsTask.CanCancel)
@@ -143,6 +163,10 @@ class AoiNdviProcessingTask(QgsTask):
         self.aoi_rect = aoi_rect
         self.canvas_crs = canvas_crs
         self.cache_dir = cache_dir
+        self.local_band_paths = local_band_paths or {}
+        self.scl_url = scl_url
+        # Band URLs of further tiles the AOI spans, in priority order
+        self.mosaic_tiles = mosaic_tiles or []
         self.timestamp = _generate_timestamp()
         self.exception = None
 
@@ -175,15 +199,31 @@ class AoiNdviProcessingTask(QgsTask):
                 return False
 
             QgsMessageLog.logMessage(
-                f"Downloading NIR and Red bands with timestamp {self.timestamp}",
+                f"Preparing NIR and Red bands with timestamp {self.timestamp}",
                 "AOIProcessing",
                 Qgis.Info,
             )
 
-            # Process bands with timestamp
-            result_paths = band_processor.process_bands_with_aoi(
-                band_urls, self.aoi_rect, self.canvas_crs, self.asset_id, {}
+            # An AOI across tile boundaries is read as one mosaic; otherwise
+            # bands stay in memory when the AOI is small enough
+            result_paths = band_processor.prepare_mosaic_bands(
+                dict(band_urls, scl=self.scl_url),
+                self.mosaic_tiles,
+                self.aoi_rect,
+                self.canvas_crs,
+                self.local_band_paths,
+                is_canceled=self.isCanceled,
             )
+            mosaicked = bool(result_paths)
+            if not mosaicked:
+                result_paths = band_processor.prepare_bands_for_aoi(
+                    band_urls,
+                    self.aoi_rect,
+                    self.canvas_crs,
+                    self.asset_id,
+                    self.local_band_paths,
+                    is_canceled=self.isCanceled,
+                )
 
             self.setProgress(70)
             if self.isCanceled():
@@ -200,8 +240,16 @@ class AoiNdviProcessingTask(QgsTask):
                 "Calculating NDVI from downloaded bands...", "AOIProcessing", Qgis.Info
             )
 
+            # A mosaic is already cloud-masked while blending the tiles
+            cloud_mask = (
+                None
+                if mosaicked
+                else band_processor.cloud_mask(
+                    self.scl_url, self.local_band_paths, self.isCanceled
+                )
+            )
             success = band_processor.calculate_ndvi_from_aoi_bands(
-                result_paths["nir"], result_paths["red"], ndvi_output_path
+                result_paths["nir"], result_paths["red"], ndvi_output_path, cloud_mask
             )
 
             self.setProgress(90)
@@ -250,6 +298,9 @@ class AoiFalseColorProcessingTask(QgsTask):
         aoi_rect: QgsRectangle,
         canvas_crs: QgsCoordinateReferenceSystem,
         cache_dir: str,
+        local_band_paths: Optional[Dict[str, str]] = None,
+        scl_url: Optional[str] = None,
+        mosaic_tiles: Optional[List[Dict[str, str]]] = None,
     ):
         task_name = f"Processing False Color AOI for {asset_id}"
         super().__init__(task_name, QgsTask.CanCancel)
@@ -259,6 +310,10 @@ class AoiFalseColorProcessingTask(QgsTask):
         self.aoi_rect = aoi_rect
         self.canvas_crs = canvas_crs
         self.cache_dir = cache_dir
+        self.local_band_paths = local_band_paths or {}
+        self.scl_url = scl_url
+        # Band URLs of further tiles the AOI spans, in priority order
+        self.mosaic_tiles = mosaic_tiles or []
         self.timestamp = _generate_timestamp()
         self.exception = None
 
@@ -288,15 +343,31 @@ class AoiFalseColorProcessingTask(QgsTask):
                 return False
 
             QgsMessageLog.logMessage(
-                f"Downloading NIR, Red, and Green bands with timestamp {self.timestamp}",
+                f"Preparing NIR, Red, and Green bands with timestamp {self.timestamp}",
                 "AOIProcessing",
                 Qgis.Info,
             )
 
-            # Process bands with timestamp
-            result_paths = band_processor.process_bands_with_aoi(
-                self.band_urls, self.aoi_rect, self.canvas_crs, self.asset_id, {}
+            # An AOI across tile boundaries is read as one mosaic; otherwise
+            # bands stay in memory when the AOI is small enough
+            result_paths = band_processor.prepare_mosaic_bands(
+                dict(self.band_urls, scl=self.scl_url),
+                self.mosaic_tiles,
+                self.aoi_rect,
+                self.canvas_crs,
+                self.local_band_paths,
+                is_canceled=self.isCanceled,
             )
+            mosaicked = bool(result_paths)
+            if not mosaicked:
+                result_paths = band_processor.prepare_bands_for_aoi(
+                    self.band_urls,
+                    self.aoi_rect,
+                    self.canvas_crs,
+                    self.asset_id,
+                    self.local_band_paths,
+                    is_canceled=self.isCanceled,
+                )
 
             self.setProgress(70)
             if self.isCanceled():
@@ -319,11 +390,20 @@ class AoiFalseColorProcessingTask(QgsTask):
                 Qgis.Info,
             )
 
+            # A mosaic is already cloud-masked while blending the tiles
+            cloud_mask = (
+                None
+                if mosaicked
+                else band_processor.cloud_mask(
+                    self.scl_url, self.local_band_paths, self.isCanceled
+                )
+            )
             success = band_processor.calculate_false_color_composite(
                 result_paths["nir"],
                 result_paths["red"],
                 result_paths["green"],
                 fc_output_path,
+                cloud_mask,
             )
 
             self.setProgress(90)
@@ -377,6 +457,9 @@ class AoiCustomCalculationTask(QgsTask):
         aoi_rect: QgsRectangle,
         canvas_crs: QgsCoordinateReferenceSystem,
         cache_dir: str,
+        local_band_paths: Optional[Dict[str, str]] = None,
+        scl_url: Optional[str] = None,
+        mosaic_tiles: Optional[List[Dict[str, str]]] = None,
     ):
         task_name = f"Processing {output_name} AOI for {asset_id}"
         super().__init__(task_name, QgsTask.CanCancel)
@@ -389,6 +472,10 @@ class AoiCustomCalculationTask(QgsTask):
         self.aoi_rect = aoi_rect
         self.canvas_crs = canvas_crs
         self.cache_dir = cache_dir
+        self.local_band_paths = local_band_paths or {}
+        self.scl_url = scl_url
+        # Band URLs of further tiles the AOI spans, in priority order
+        self.mosaic_tiles = mosaic_tiles or []
         self.timestamp = _generate_timestamp()
         self.exception = None
 
@@ -420,15 +507,31 @@ class AoiCustomCalculationTask(QgsTask):
 
             band_names = list(self.band_urls.keys())
             QgsMessageLog.logMessage(
-                f"Downloading {', '.join(band_names)} bands with timestamp {self.timestamp}",
+                f"Preparing {', '.join(band_names)} bands with timestamp {self.timestamp}",
                 "AOIProcessing",
                 Qgis.Info,
             )
 
-            # Process bands with timestamp
-            result_paths = band_processor.process_bands_with_aoi(
-                self.band_urls, self.aoi_rect, self.canvas_crs, self.asset_id, {}
+            # An AOI across tile boundaries is read as one mosaic; otherwise
+            # bands stay in memory when the AOI is small enough
+            result_paths = band_processor.prepare_mosaic_bands(
+                dict(self.band_urls, scl=self.scl_url),
+                self.mosaic_tiles,
+                self.aoi_rect,
+                self.canvas_crs,
+                self.local_band_paths,
+                is_canceled=self.isCanceled,
             )
+            mosaicked = bool(result_paths)
+            if not mosaicked:
+                result_paths = band_processor.prepare_bands_for_aoi(
+                    self.band_urls,
+                    self.aoi_rect,
+                    self.canvas_crs,
+                    self.asset_id,
+                    self.local_band_paths,
+                    is_canceled=self.isCanceled,
+                )
 
             self.setProgress(60)
             if self.isCanceled():
@@ -452,8 +555,20 @@ class AoiCustomCalculationTask(QgsTask):
                 Qgis.Info,
             )
 
+            # A mosaic is already cloud-masked while blending the tiles
+            cloud_mask = (
+                None
+                if mosaicked
+                else band_processor.cloud_mask(
+                    self.scl_url, self.local_band_paths, self.isCanceled
+                )
+            )
             success = band_processor.calculate_custom_index(
-                result_paths, self.formula, output_path, self.coefficients
+                result_paths,
+                self.formula,
+                output_path,
+                self.coefficients,
+                cloud_mask,
             )
 
             self.setProgress(90)
@@ -515,67 +630,178 @@ class TimestampedCogBandProcessor:
         stac_id: str,
         local_band_paths: Optional[Dict[str, str]] = None,
         target_resolution: Optional[float] = None,
+        is_canceled: Optional[Callable[[], bool]] = None,
     ) -> Dict[str, str]:
         """
-        Download and process multiple bands with timestamps to prevent file conflicts.
+        Crop multiple bands to the AOI. Band crops are shared through the AOI
+        cache (see BandSourceResolver); only the final outputs are timestamped.
         """
+        from ..core import BandSourceResolver
+
+        resolver = BandSourceResolver(self.cog_loader, self.cache_dir, local_band_paths)
         downloaded_bands = {}
 
         QgsMessageLog.logMessage(
-            f"Starting timestamped AOI band processing ({self.timestamp}) - downloading from URLs",
+            f"Starting timestamped AOI band processing ({self.timestamp})",
             "COGProcessor",
             Qgis.Info,
         )
 
         for band_name, band_url in band_urls.items():
+            if is_canceled is not None and is_canceled():
+                break
             try:
-                # Create timestamped cache filename
-                cache_filename = f"{stac_id}_{band_name}_aoi_{self.timestamp}.tif"
-                cache_path = os.path.join(self.cache_dir, cache_filename)
-
-                QgsMessageLog.logMessage(
-                    f"Downloading {band_name} with timestamp {self.timestamp}",
-                    "COGProcessor",
-                    Qgis.Info,
-                )
-
-                # Always download from URL
-                result_path = self.cog_loader.load_cog_with_aoi(
-                    band_url, aoi_rect, aoi_crs, target_resolution, self.cache_dir
+                result_path = resolver.resolve(
+                    stac_id,
+                    band_name,
+                    band_url,
+                    aoi_rect,
+                    aoi_crs,
+                    target_resolution,
+                    is_canceled,
                 )
 
                 if result_path:
-                    # Rename to timestamped filename
-                    if result_path != cache_path:
-                        os.rename(result_path, cache_path)
-
-                    downloaded_bands[band_name] = cache_path
+                    downloaded_bands[band_name] = result_path
 
                     # Log success with file size
-                    file_size_mb = os.path.getsize(cache_path) / (1024 * 1024)
+                    file_size_mb = os.path.getsize(result_path) / (1024 * 1024)
                     QgsMessageLog.logMessage(
-                        f"Downloaded {band_name} with timestamp ({file_size_mb:.2f} MB)",
+                        f"Prepared {band_name} for AOI ({file_size_mb:.2f} MB)",
                         "COGProcessor",
                         Qgis.Info,
                     )
                 else:
                     QgsMessageLog.logMessage(
-                        f"Failed to download {band_name} for AOI",
+                        f"Failed to prepare {band_name} for AOI",
                         "COGProcessor",
                         Qgis.Warning,
                     )
 
             except Exception as e:
                 QgsMessageLog.logMessage(
-                    f"Error downloading band {band_name}: {str(e)}",
+                    f"Error preparing band {band_name}: {str(e)}",
                     "COGProcessor",
                     Qgis.Critical,
                 )
 
         return downloaded_bands
 
+    def prepare_bands_for_aoi(
+        self,
+        band_urls: Dict[str, str],
+        aoi_rect: QgsRectangle,
+        aoi_crs: QgsCoordinateReferenceSystem,
+        stac_id: str,
+        local_band_paths: Optional[Dict[str, str]] = None,
+        is_canceled: Optional[Callable[[], bool]] = None,
+    ) -> Dict[str, Union[str, "AoiBand"]]:
+        """
+        Bands for an AOI product: read into memory when they fit in
+        Config.AOI_IN_MEMORY_MAX_BYTES, so only the final product is written,
+        otherwise cropped to files as in process_bands_with_aoi().
+        """
+        from ..core import CogBandProcessor
+        from .cog_aio_loader import AoiTooLargeForMemory
+
+        if Config.AOI_IN_MEMORY_MAX_BYTES > 0:
+            try:
+                return CogBandProcessor(self.cache_dir).read_bands_for_aoi(
+                    band_urls,
+                    aoi_rect,
+                    aoi_crs,
+                    stac_id,
+                    local_band_paths,
+                    is_canceled,
+                    Config.AOI_IN_MEMORY_MAX_BYTES,
+                )
+            except AoiTooLargeForMemory as e:
+                QgsMessageLog.logMessage(
+                    f"{e}; cropping bands to files instead",
+                    "COGProcessor",
+                    Qgis.Info,
+                )
+
+        return self.process_bands_with_aoi(
+            band_urls,
+            aoi_rect,
+            aoi_crs,
+            stac_id,
+            local_band_paths,
+            is_canceled=is_canceled,
+        )
+
+    def prepare_mosaic_bands(
+        self,
+        band_urls: Dict[str, Optional[str]],
+        mosaic_tiles: List[Dict[str, str]],
+        aoi_rect: QgsRectangle,
+        aoi_crs: QgsCoordinateReferenceSystem,
+        local_band_paths: Optional[Dict[str, str]] = None,
+        is_canceled: Optional[Callable[[], bool]] = None,
+    ) -> Dict[str, "AoiBand"]:
+        """
+        In-memory mosaic of this scene's tile (band_urls, downloaded bands
+        preferred) and the further tiles the AOI spans, on one grid.
+
+        Returns:
+            Band name -> (data, profile), or an empty dict if there are no
+            further tiles, the mosaic exceeds Config.AOI_IN_MEMORY_MAX_BYTES
+            or it could not be read; the caller then uses this tile only
+        """
+        from .cog_aio_loader import AoiTooLargeForMemory
+        from .mosaic import MosaicReader
+
+        if not mosaic_tiles:
+            return {}
+
+        band_names = [band for band in band_urls if band != "scl"]
+        primary = {
+            band: (local_band_paths or {}).get(band) or url
+            for band, url in band_urls.items()
+            if url
+        }
+        try:
+            return MosaicReader(self.cog_loader).read_bands(
+                [primary] + list(mosaic_tiles),
+                band_names,
+                aoi_rect,
+                aoi_crs,
+                is_canceled,
+                Config.AOI_IN_MEMORY_MAX_BYTES,
+            )
+        except AoiTooLargeForMemory as e:
+            QgsMessageLog.logMessage(
+                f"{e}; processing the selected tile only",
+                "COGProcessor",
+                Qgis.Warning,
+            )
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"Error mosaicking tiles: {str(e)}; processing the selected tile only",
+                "COGProcessor",
+                Qgis.Warning,
+            )
+        return {}
+
+    def cloud_mask(
+        self,
+        scl_url: Optional[str],
+        local_band_paths: Optional[Dict[str, str]] = None,
+        is_canceled: Optional[Callable[[], bool]] = None,
+    ) -> Optional["SclCloudMask"]:
+        """Per-pixel cloud mask for the scene, or None if disabled or unavailable."""
+        from .cloud_mask import scene_cloud_mask
+
+        local_scl_path = (local_band_paths or {}).get("scl")
+        return scene_cloud_mask(scl_url, self.cog_loader, local_scl_path, is_canceled)
+
     def calculate_ndvi_from_aoi_bands(
-        self, nir_path: str, red_path: str, output_path: str
+        self,
+        nir_path: str,
+        red_path: str,
+        output_path: str,
+        cloud_mask: Optional["SclCloudMask"] = None,
     ) -> bool:
         """Calculate NDVI from timestamped band files."""
         # Import the original processor methods
@@ -584,18 +810,23 @@ class TimestampedCogBandProcessor:
         # Create temporary processor to use existing calculation methods
         temp_processor = CogBandProcessor(self.cache_dir)
         return temp_processor.calculate_ndvi_from_aoi_bands(
-            nir_path, red_path, output_path
+            nir_path, red_path, output_path, cloud_mask
         )
 
     def calculate_false_color_composite(
-        self, nir_path: str, red_path: str, green_path: str, output_path: str
+        self,
+        nir_path: str,
+        red_path: str,
+        green_path: str,
+        output_path: str,
+        cloud_mask: Optional["SclCloudMask"] = None,
     ) -> bool:
         """Create False Color composite from timestamped band files."""
         from ..core import CogBandProcessor
 
         temp_processor = CogBandProcessor(self.cache_dir)
         return temp_processor.calculate_false_color_composite(
-            nir_path, red_path, green_path, output_path
+            nir_path, red_path, green_path, output_path, cloud_mask
         )
 
     def calculate_custom_index(
@@ -604,11 +835,12 @@ class TimestampedCogBandProcessor:
         formula: str,
         output_path: str,
         coefficients: Optional[Dict] = None,
+        cloud_mask: Optional["SclCloudMask"] = None,
     ) -> bool:
         """Calculate custom index from timestamped band files."""
         from ..core import CogBandProcessor
 
         temp_processor = CogBandProcessor(self.cache_dir)
         return temp_processor.calculate_custom_index(
-            band_paths, formula, output_path, coefficients
+            band_paths, formula, output_path, coefficients, cloud_mask=cloud_mask
         )
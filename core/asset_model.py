@@ -1,63 +1,233 @@
 import os
+from array import array
 from datetime import datetime
-from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 from qgis.core import Qgis, QgsMessageLog
 
 from ..config import Config
 
 
-@dataclass
+# Property keys of a catalog feature, mapped to RasterAsset attributes
+PROPERTY_FIELDS = (
+    ("stac_id", "stac_id"),
+    ("thumb", "thumbnail_url"),
+    ("visual", "visual_url"),
+    ("asset_nir", "nir_url"),
+    ("asset_red", "red_url"),
+    ("asset_green", "green_url"),
+    ("asset_blue", "blue_url"),
+    ("asset_swir_b11", "swir_b11_url"),
+    ("asset_swir_b12", "swir_b12_url"),
+    ("asset_scl", "scl_url"),
+)
+
+
+def pack_footprint(
+    geometry: Optional[Dict[str, Any]],
+) -> Tuple[Optional[array], Optional[array], Optional[array]]:
+    """
+    Packs a GeoJSON Polygon/MultiPolygon into flat arrays.
+
+    Returns:
+        (coords, ring_ends, part_ends): interleaved x/y doubles, the end index
+        (in points) of every ring, and the end index (in rings) of every
+        polygon part; (None, None, None) if there is no usable footprint.
+    """
+    if not geometry or "coordinates" not in geometry:
+        return None, None, None
+    try:
+        if geometry.get("type") == "MultiPolygon":
+            polygons = geometry["coordinates"]
+        else:
+            polygons = [geometry["coordinates"]]
+        coords = array("d")
+        ring_ends = array("I")
+        part_ends = array("I")
+        for polygon in polygons:
+            if not polygon or not polygon[0]:
+                continue
+            for ring in polygon:
+                for point in ring:
+                    coords.append(float(point[0]))
+                    coords.append(float(point[1]))
+                ring_ends.append(len(coords) // 2)
+            part_ends.append(len(ring_ends))
+        if not part_ends:
+            return None, None, None
+        return coords, ring_ends, part_ends
+    except (IndexError, TypeError, ValueError):
+        return None, None, None
+
+
 class RasterAsset:
     """
-    A data class to represent a single raster asset from the GeoPortal API.
+    A single raster asset from the GeoPortal API.
     It centralizes property access and path management.
+
+    Instances are slotted and keep no reference to the source GeoJSON: the
+    footprint is packed into coordinate arrays and the capture date string is
+    only parsed on first access.
     """
 
-    feature: Dict[str, Any]  # The GeoJSON feature containing the asset data
-    stac_id: str = field(init=False)
-    capture_date: Optional[datetime] = field(init=False)
-    cloud_cover: float = field(init=False)
-    thumbnail_url: Optional[str] = field(init=False)
-    visual_url: Optional[str] = field(init=False)
-    nir_url: Optional[str] = field(init=False)
-    red_url: Optional[str] = field(init=False)
-    green_url: Optional[str] = field(init=False)
-    blue_url: Optional[str] = field(init=False)
-    swir_b11_url: Optional[str] = field(init=False)
-    swir_b12_url: Optional[str] = field(init=False)
-    properties: Dict[str, Any] = field(init=False)
-    geometry: Optional[Dict[str, Any]] = field(init=False)
-
-    def __post_init__(self):
+    __slots__ = (
+        "stac_id",
+        "cloud_cover",
+        "thumbnail_url",
+        "visual_url",
+        "nir_url",
+        "red_url",
+        "green_url",
+        "blue_url",
+        "swir_b11_url",
+        "swir_b12_url",
+        "scl_url",
+        "_date_str",
+        "_capture_date",
+        "_coords",
+        "_ring_ends",
+        "_part_ends",
+    )
+
+    def __init__(self, feature: Dict[str, Any]):
         """
-        Initializes calculated fields after the main dataclass initialization.
+        Args:
+            feature: The GeoJSON feature containing the asset data
         """
-        self.properties = self.feature.get("properties", {})
-        if not self.properties:
+        properties = feature.get("properties") or {}
+        if not properties:
             QgsMessageLog.logMessage(
                 "RasterAsset initialized with empty properties.",
                 "IDPMPlugin",
                 Qgis.Warning,
             )
+        self.stac_id = properties.get("stac_id", "UNKNOWN")
+        self.cloud_cover = float(properties.get("cloud", 0.0))
+        self.thumbnail_url = properties.get("thumb")
+        self.visual_url = properties.get("visual")
+        self.nir_url = properties.get("asset_nir")
+        self.red_url = properties.get("asset_red")
+        self.green_url = properties.get("asset_green")
+        self.blue_url = properties.get("asset_blue")
+        self.swir_b11_url = properties.get("asset_swir_b11")
+        self.swir_b12_url = properties.get("asset_swir_b12")
+        self.scl_url = properties.get("asset_scl")  # Scene classification (cloud mask)
+        self._date_str = properties.get("tanggal", "") or ""
+        self._capture_date = False  # False = not parsed yet; None = unparseable
+        self._coords, self._ring_ends, self._part_ends = pack_footprint(
+            feature.get("geometry")
+        )
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, Sequence[Any]]) -> List["RasterAsset"]:
+        """
+        Builds assets in bulk from a columnar (struct-of-arrays) catalog.
+
+        Args:
+            columns: Equal-length sequences keyed by feature property name
+                ("stac_id", "cloud", "thumb", "visual", "asset_nir", ...,
+                "tanggal"), plus an optional "geometry" column of GeoJSON
+                geometries. Missing columns are treated as all-None.
+
+        Returns:
+            One RasterAsset per row.
+        """
+        count = len(columns["stac_id"])
+        none_column = [None] * count
+        string_columns = [
+            (attr, columns.get(key, none_column)) for key, attr in PROPERTY_FIELDS
+        ]
+        clouds = columns.get("cloud", none_column)
+        dates = columns.get("tanggal", none_column)
+        geometries = columns.get("geometry", none_column)
+
+        assets = []
+        new = cls.__new__
+        for i in range(count):
+            asset = new(cls)
+            for attr, column in string_columns:
+                setattr(asset, attr, column[i])
+            if asset.stac_id is None:
+                asset.stac_id = "UNKNOWN"
+            cloud = clouds[i]
+            asset.cloud_cover = float(cloud) if cloud is not None else 0.0
+            asset._date_str = dates[i] or ""
+            asset._capture_date = False
+            asset._coords, asset._ring_ends, asset._part_ends = pack_footprint(
+                geometries[i]
+            )
+            assets.append(asset)
+        return assets
 
-        # Parse the geometry from the feature
-        self.geometry = self.feature.get("geometry")
+    def to_feature(self) -> Dict[str, Any]:
+        """
+        The asset as a GeoJSON-like feature that RasterAsset(feature) reads
+        back into an equal asset, e.g. for a JSON cache.
+        """
+        properties = {key: getattr(self, attr) for key, attr in PROPERTY_FIELDS}
+        properties["cloud"] = self.cloud_cover
+        properties["tanggal"] = self._date_str
+        return {"type": "Feature", "properties": properties, "geometry": self.geometry}
 
-        self.stac_id = self.properties.get("stac_id", "UNKNOWN")
-        self.cloud_cover = float(self.properties.get("cloud", 0.0))
-        self.thumbnail_url = self.properties.get("thumb")
-        self.visual_url = self.properties.get("visual")
-        self.nir_url = self.properties.get("asset_nir")
-        self.red_url = self.properties.get("asset_red")
-        self.green_url = self.properties.get("asset_green")
-        self.blue_url = self.properties.get("asset_blue")
-        self.swir_b11_url = self.properties.get("asset_swir_b11")
-        self.swir_b12_url = self.properties.get("asset_swir_b12")
+    def __repr__(self) -> str:
+        return f"RasterAsset(stac_id={self.stac_id!r}, cloud_cover={self.cloud_cover})"
 
-        # Parse the capture date safely
-        date_str = self.properties.get("tanggal", "")
-        self.capture_date = self._parse_date(date_str)
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RasterAsset):
+            return NotImplemented
+        return self.stac_id == other.stac_id
+
+    def __hash__(self) -> int:
+        return hash(self.stac_id)
+
+    @property
+    def capture_date(self) -> Optional[datetime]:
+        """The capture date, parsed on first access and cached."""
+        if self._capture_date is False:
+            self._capture_date = self._parse_date(self._date_str)
+        return self._capture_date
+
+    def footprint_polygons(self) -> List[List[List[Tuple[float, float]]]]:
+        """The footprint as polygons -> rings -> (x, y) points."""
+        if self._coords is None:
+            return []
+        coords = self._coords
+        polygons = []
+        ring_start = 0
+        part_start = 0
+        for part_end in self._part_ends:
+            rings = []
+            for ring_end in self._ring_ends[part_start:part_end]:
+                rings.append(
+                    list(
+                        zip(
+                            coords[2 * ring_start : 2 * ring_end : 2],
+                            coords[2 * ring_start + 1 : 2 * ring_end : 2],
+                        )
+                    )
+                )
+                ring_start = ring_end
+            polygons.append(rings)
+            part_start = part_end
+        return polygons
+
+    def footprint_bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """(xmin, ymin, xmax, ymax) of the footprint, straight from the packed array."""
+        if self._coords is None:
+            return None
+        xs = self._coords[0::2]
+        ys = self._coords[1::2]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    @property
+    def geometry(self) -> Optional[Dict[str, Any]]:
+        """The footprint as a GeoJSON geometry dict, rebuilt on demand."""
+        polygons = self.footprint_polygons()
+        if not polygons:
+            return None
+        as_lists = [[[list(p) for p in ring] for ring in poly] for poly in polygons]
+        if len(as_lists) == 1:
+            return {"type": "Polygon", "coordinates": as_lists[0]}
+        return {"type": "MultiPolygon", "coordinates": as_lists}
 
     @staticmethod
     def _parse_date(date_str: str) -> Optional[datetime]:
@@ -104,7 +274,7 @@ class RasterAsset:
         Constructs the expected local file path for a given asset type.
 
         Args:
-            asset_type: The type of asset ('visual', 'nir', 'red', 'green', 'blue', 'swir_b11', 'swir_b12', 'ndvi', or 'false_color').
+            asset_type: The type of asset ('visual', 'nir', 'red', 'green', 'blue', 'swir_b11', 'swir_b12', 'scl', 'ndvi', or 'false_color').
 
         Returns:
             The full local file path as a string.
@@ -126,6 +296,8 @@ class RasterAsset:
             file_name = os.path.basename(self.swir_b11_url.split("?")[0])
         elif asset_type == "swir_b12" and self.swir_b12_url:
             file_name = os.path.basename(self.swir_b12_url.split("?")[0])
+        elif asset_type == "scl" and self.scl_url:
+            file_name = os.path.basename(self.scl_url.split("?")[0])
         elif asset_type == "ndvi":
             file_name = f"{self.stac_id}_NDVI.tif"
         elif asset_type == "false_color":
@@ -0,0 +1,177 @@
+import math
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from osgeo import gdal
+from qgis.core import Qgis, QgsMessageLog, QgsRectangle
+
+from ..config import Config
+
+RESAMPLING_KERNELS = ("nearest", "bilinear", "cubic", "cubicspline", "lanczos", "average")
+
+
+@dataclass
+class TargetGrid:
+    """A north-up pixel grid shared by all bands of a calculation."""
+
+    xmin: float
+    ymin: float
+    xmax: float
+    ymax: float
+    res_x: float
+    res_y: float
+    crs_wkt: str
+
+    @property
+    def width(self) -> int:
+        return int(round((self.xmax - self.xmin) / self.res_x))
+
+    @property
+    def height(self) -> int:
+        return int(round((self.ymax - self.ymin) / self.res_y))
+
+    def extent(self) -> QgsRectangle:
+        return QgsRectangle(self.xmin, self.ymin, self.xmax, self.ymax)
+
+
+def _band_grid(path: str) -> Tuple[Tuple[float, ...], int, int, str]:
+    ds = gdal.Open(path)
+    if ds is None:
+        raise RuntimeError(f"Could not open band: {path}")
+    try:
+        return ds.GetGeoTransform(), ds.RasterXSize, ds.RasterYSize, ds.GetProjection()
+    finally:
+        ds = None
+
+
+def plan_target_grid(band_paths: Dict[str, str]) -> Tuple[TargetGrid, bool]:
+    """
+    Builds the grid for a calculation: the finest input resolution over the
+    intersection of the band extents, snapped to the finest band's pixel
+    grid so that band is used without resampling.
+
+    Returns:
+        (grid, aligned) where aligned is True if every band already lies on
+        exactly that grid
+    """
+    grids = {name: _band_grid(path) for name, path in band_paths.items()}
+    ref_name = min(grids, key=lambda name: abs(grids[name][0][1]))
+    (x0, res_x, _, y0, _, neg_res_y), _, _, crs_wkt = grids[ref_name]
+    res_y = abs(neg_res_y)
+
+    xmin, ymax = -math.inf, math.inf
+    xmax, ymin = math.inf, -math.inf
+    for gt, width, height, _ in grids.values():
+        xmin = max(xmin, gt[0])
+        xmax = min(xmax, gt[0] + gt[1] * width)
+        ymax = min(ymax, gt[3])
+        ymin = max(ymin, gt[3] + gt[5] * height)
+    if xmin >= xmax or ymin >= ymax:
+        raise RuntimeError("Bands do not overlap")
+
+    # Snap inwards onto the reference grid (small epsilon absorbs float noise)
+    eps = 1e-6
+    grid = TargetGrid(
+        xmin=x0 + math.ceil((xmin - x0) / res_x - eps) * res_x,
+        xmax=x0 + math.floor((xmax - x0) / res_x + eps) * res_x,
+        ymax=y0 - math.ceil((y0 - ymax) / res_y - eps) * res_y,
+        ymin=y0 - math.floor((y0 - ymin) / res_y + eps) * res_y,
+        res_x=res_x,
+        res_y=res_y,
+        crs_wkt=crs_wkt,
+    )
+
+    aligned = all(
+        abs(gt[1] - grid.res_x) < eps
+        and abs(abs(gt[5]) - grid.res_y) < eps
+        and abs(gt[0] - grid.xmin) < eps
+        and abs(gt[3] - grid.ymax) < eps
+        and width == grid.width
+        and height == grid.height
+        for gt, width, height, _ in grids.values()
+    )
+    return grid, aligned
+
+
+class BandAligner:
+    """
+    Puts the bands of a calculation on one target grid without writing
+    resampled copies to disk.
+
+    Each band that is off the grid gets a VRT in GDAL's in-memory
+    filesystem (/vsimem) describing the target grid and kernel; GDAL then
+    resamples block by block as the calculator reads it. Use as a context
+    manager, or call release() when done, to free the VRT descriptions.
+    """
+
+    def __init__(
+        self,
+        band_paths: Dict[str, str],
+        resampling: str = Config.BAND_RESAMPLING,
+        grid: Optional[TargetGrid] = None,
+    ):
+        if resampling not in RESAMPLING_KERNELS:
+            raise ValueError(
+                f"Unknown resampling kernel '{resampling}', "
+                f"expected one of: {', '.join(RESAMPLING_KERNELS)}"
+            )
+        self.band_paths = dict(band_paths)
+        self.resampling = resampling
+        if grid is None:
+            grid, self.already_aligned = plan_target_grid(self.band_paths)
+        else:
+            self.already_aligned = False
+        self.grid = grid
+        self._vsimem_dir = f"/vsimem/idpm_align_{uuid.uuid4().hex}"
+        self._vrt_paths: Dict[str, str] = {}
+
+    def aligned_paths(self) -> Dict[str, str]:
+        """Band name -> path readable on the target grid."""
+        if self.already_aligned:
+            return dict(self.band_paths)
+        paths = {}
+        for band_name, path in self.band_paths.items():
+            if band_name not in self._vrt_paths:
+                self._vrt_paths[band_name] = self._build_vrt(band_name, path)
+            paths[band_name] = self._vrt_paths[band_name]
+        return paths
+
+    def _build_vrt(self, band_name: str, path: str) -> str:
+        vrt_path = f"{self._vsimem_dir}/{band_name}.vrt"
+        grid = self.grid
+        options = gdal.WarpOptions(
+            format="VRT",
+            outputBounds=(grid.xmin, grid.ymin, grid.xmax, grid.ymax),
+            xRes=grid.res_x,
+            yRes=grid.res_y,
+            dstSRS=grid.crs_wkt,
+            resampleAlg=self.resampling,
+            targetAlignedPixels=False,
+            multithread=True,
+        )
+        ds = gdal.Warp(vrt_path, path, options=options)
+        if ds is None:
+            raise RuntimeError(
+                f"Could not align {band_name}: {gdal.GetLastErrorMsg() or 'unknown error'}"
+            )
+        ds = None
+        QgsMessageLog.logMessage(
+            f"Aligning {band_name} ({os.path.basename(path)}) to "
+            f"{grid.res_x:g} resolution grid with {self.resampling} resampling",
+            "IDPMPlugin",
+            Qgis.Info,
+        )
+        return vrt_path
+
+    def release(self) -> None:
+        for vrt_path in self._vrt_paths.values():
+            gdal.Unlink(vrt_path)
+        self._vrt_paths.clear()
+
+    def __enter__(self) -> "BandAligner":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
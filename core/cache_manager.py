@@ -0,0 +1,454 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from qgis.core import Qgis, QgsMessageLog, QgsTask
+from PyQt5.QtCore import QSettings, pyqtSignal
+
+from ..config import Config
+
+MANIFEST_NAME = "manifest.sqlite"
+MANIFEST_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    pinned INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (pinned, last_access);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class CacheManager:
+    """
+    Byte-budgeted cache backed by a SQLite manifest.
+
+    Every cached file has a row (path, key, size, last access, pin state),
+    and running totals live in a counters table. Size accounting, hit/miss
+    statistics and registration are therefore O(1), and eviction walks the
+    LRU index only as far as it needs to free space. The cache tree is
+    walked once, when a manifest is first created, to adopt files written
+    before it existed.
+
+    All methods are thread-safe; band crops are registered from task threads.
+    """
+
+    _instances: Dict[str, "CacheManager"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_aoi_cache(cls) -> "CacheManager":
+        """The shared manager for the AOI cache under IDPMPlugin/cache_dir."""
+        return cls._shared("idpm_aoi_cache", Config.AOI_CACHE_MAX_BYTES)
+
+    @classmethod
+    def for_thumbnail_cache(cls) -> "CacheManager":
+        """The shared manager for the thumbnail cache under IDPMPlugin/cache_dir."""
+        return cls._shared("idpm_thumbnail_cache", Config.THUMBNAIL_DISK_CACHE_MAX_BYTES)
+
+    @classmethod
+    def _shared(cls, folder: str, max_bytes: int) -> "CacheManager":
+        settings = QSettings()
+        cache_base = settings.value("IDPMPlugin/cache_dir", tempfile.gettempdir())
+        cache_root = os.path.normpath(os.path.join(cache_base, folder))
+        with cls._instances_lock:
+            if cache_root not in cls._instances:
+                cls._instances[cache_root] = cls(cache_root, max_bytes)
+            return cls._instances[cache_root]
+
+    def __init__(
+        self, cache_root: str, max_bytes: int = Config.AOI_CACHE_MAX_BYTES
+    ):
+        self.cache_root = os.path.normpath(cache_root)
+        self.max_bytes = max_bytes
+        self.db_path = os.path.join(self.cache_root, MANIFEST_NAME)
+        self._lock = threading.RLock()
+        os.makedirs(self.cache_root, exist_ok=True)
+        self._db = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            self._db.executemany(
+                "INSERT OR IGNORE INTO counters (name, value) VALUES (?, 0)",
+                [
+                    ("total_bytes",),
+                    ("file_count",),
+                    ("hits",),
+                    ("misses",),
+                    ("evicted",),
+                    ("imported",),
+                ],
+            )
+            self._db.execute(
+                "INSERT OR IGNORE INTO counters (name, value) VALUES ('version', ?)",
+                (MANIFEST_SCHEMA_VERSION,),
+            )
+
+    # --- Accounting ---
+
+    def register(
+        self, path: str, key: Optional[str] = None, pinned: bool = False
+    ) -> None:
+        """
+        Records a file just written into the cache, then evicts least
+        recently used entries if the cache is over budget.
+
+        Args:
+            path: Path of the cached file
+            key: Grouping key, by default the asset folder name (stac_id)
+            pinned: Pinned entries are never evicted
+        """
+        path = os.path.normpath(path)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        key = key or os.path.basename(os.path.dirname(path))
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT size, pinned FROM entries WHERE path = ?", (path,)
+            ).fetchone()
+            old_size = row[0] if row else 0
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (path, key, size, last_access, pinned) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, key, size, time.time(), int(pinned or bool(row and row[1]))),
+            )
+            self._bump("total_bytes", size - old_size)
+            if row is None:
+                self._bump("file_count", 1)
+        if self.max_bytes and self.total_bytes() > self.max_bytes:
+            self.evict_to_budget()
+
+    def lookup(self, path: str) -> bool:
+        """
+        True if path is a usable cached file. Counts a hit (and refreshes its
+        LRU position) or a miss; a row whose file has vanished is dropped and
+        an existing file without a row is adopted.
+        """
+        path = os.path.normpath(path)
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT size FROM entries WHERE path = ?", (path,)
+            ).fetchone()
+            exists = os.path.exists(path)
+            if exists and row is None:
+                # Written before it could be registered; adopt it
+                self.register(path)
+            if exists:
+                self._db.execute(
+                    "UPDATE entries SET last_access = ? WHERE path = ?",
+                    (time.time(), path),
+                )
+                self._bump("hits", 1)
+                return True
+            if row is not None:
+                self._forget(path, row[0])
+            self._bump("misses", 1)
+            return False
+
+    def touch(self, path: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE entries SET last_access = ? WHERE path = ?",
+                (time.time(), os.path.normpath(path)),
+            )
+
+    def pin(self, path: str) -> None:
+        self._set_pinned(path, True)
+
+    def unpin(self, path: str) -> None:
+        self._set_pinned(path, False)
+
+    def sync_pins(self, in_use: Iterable[str]) -> None:
+        """Pins exactly the given paths (e.g. sources of open layers)."""
+        paths = {os.path.normpath(p) for p in in_use}
+        with self._lock, self._db:
+            pinned = {
+                row[0]
+                for row in self._db.execute("SELECT path FROM entries WHERE pinned = 1")
+            }
+            self._db.executemany(
+                "UPDATE entries SET pinned = 0 WHERE path = ?",
+                [(p,) for p in pinned - paths],
+            )
+            self._db.executemany(
+                "UPDATE entries SET pinned = 1 WHERE path = ?",
+                [(p,) for p in paths - pinned],
+            )
+
+    def remove(self, path: str) -> None:
+        """Deletes a cached file and its manifest row."""
+        path = os.path.normpath(path)
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT size FROM entries WHERE path = ?", (path,)
+            ).fetchone()
+            if os.path.exists(path):
+                os.remove(path)
+            if row is not None:
+                self._forget(path, row[0])
+
+    def total_bytes(self) -> int:
+        return self._counter("total_bytes")
+
+    # --- Eviction ---
+
+    def evict_to_budget(self, max_bytes: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Removes unpinned entries, least recently used first, until the cache
+        fits in max_bytes (Config.AOI_CACHE_MAX_BYTES by default).
+
+        Returns:
+            (files removed, bytes freed)
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            excess = self.total_bytes() - budget
+            if excess <= 0:
+                return 0, 0
+            cursor = self._db.execute(
+                "SELECT path, size FROM entries WHERE pinned = 0 ORDER BY last_access"
+            )
+            victims = []
+            while excess > 0:
+                rows = cursor.fetchmany(64)
+                if not rows:
+                    break
+                for path, size in rows:
+                    victims.append((path, size))
+                    excess -= size
+                    if excess <= 0:
+                        break
+            cursor.close()
+            return self._evict(victims, "over budget")
+
+    def evict_older_than(self, max_age_hours: float) -> Tuple[int, int]:
+        """Removes unpinned entries not accessed within max_age_hours."""
+        cutoff = time.time() - max_age_hours * 3600
+        with self._lock:
+            victims = self._db.execute(
+                "SELECT path, size FROM entries WHERE pinned = 0 AND last_access < ?",
+                (cutoff,),
+            ).fetchall()
+            return self._evict(victims, f"not used for {max_age_hours:g}h")
+
+    def _evict(self, victims, reason: str) -> Tuple[int, int]:
+        removed, freed = 0, 0
+        with self._db:
+            for path, size in victims:
+                try:
+                    if os.path.exists(path):
+                        os.remove(path)
+                except OSError as e:
+                    # Still open somewhere (e.g. a layer on Windows); keep it
+                    QgsMessageLog.logMessage(
+                        f"Could not evict {path}: {e}", "AOICacheManager", Qgis.Warning
+                    )
+                    continue
+                self._forget(path, size)
+                removed += 1
+                freed += size
+            self._bump("evicted", removed)
+        if removed:
+            QgsMessageLog.logMessage(
+                f"Evicted {removed} cached files ({freed / (1024 * 1024):.1f} MB, "
+                f"{reason})",
+                "AOICacheManager",
+                Qgis.Info,
+            )
+        return removed, freed
+
+    # --- Maintenance ---
+
+    def import_untracked(self, is_canceled=lambda: False) -> int:
+        """
+        Adopts files written before the manifest existed. Runs only once per
+        manifest; later calls return immediately.
+        """
+        if self._counter("imported"):
+            return 0
+        count = 0
+        skip = {MANIFEST_NAME, f"{MANIFEST_NAME}-wal", f"{MANIFEST_NAME}-shm"}
+        for root, dirs, files in os.walk(self.cache_root):
+            if is_canceled():
+                return count
+            for name in files:
+                if name in skip or name.endswith(".tmp"):
+                    continue
+                path = os.path.normpath(os.path.join(root, name))
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                with self._lock, self._db:
+                    if self._db.execute(
+                        "SELECT 1 FROM entries WHERE path = ?", (path,)
+                    ).fetchone():
+                        continue
+                    self._db.execute(
+                        "INSERT INTO entries (path, key, size, last_access, pinned) "
+                        "VALUES (?, ?, ?, ?, 0)",
+                        (
+                            path,
+                            os.path.basename(os.path.dirname(path)),
+                            stat.st_size,
+                            stat.st_mtime,
+                        ),
+                    )
+                    self._bump("total_bytes", stat.st_size)
+                    self._bump("file_count", 1)
+                count += 1
+        with self._lock, self._db:
+            self._bump("imported", 1)
+        return count
+
+    def remove_empty_directories(self) -> None:
+        """Removes asset folders emptied by eviction (one level deep)."""
+        with self._lock:
+            keys = [
+                row[0] for row in self._db.execute("SELECT DISTINCT key FROM entries")
+            ]
+        live = set(keys)
+        try:
+            entries = list(os.scandir(self.cache_root))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir() and entry.name not in live:
+                try:
+                    os.rmdir(entry.path)
+                except OSError:
+                    pass  # not empty: files the manifest does not track
+
+    def vacuum(self) -> None:
+        with self._lock:
+            self._db.execute("VACUUM")
+
+    # --- Statistics ---
+
+    def statistics(self) -> Dict[str, float]:
+        """Cache usage and hit/miss statistics."""
+        with self._lock:
+            counters = dict(self._db.execute("SELECT name, value FROM counters"))
+            asset_count = self._db.execute(
+                "SELECT COUNT(DISTINCT key) FROM entries"
+            ).fetchone()[0]
+        total = counters.get("total_bytes", 0)
+        files = counters.get("file_count", 0)
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "total_size_mb": total / (1024 * 1024),
+            "file_count": files,
+            "asset_count": asset_count,
+            "avg_size_per_file_mb": (total / files / (1024 * 1024)) if files else 0,
+            "budget_mb": self.max_bytes / (1024 * 1024),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+            "evicted": counters.get("evicted", 0),
+        }
+
+    # --- Internals (callers hold self._lock and a transaction) ---
+
+    def _set_pinned(self, path: str, pinned: bool) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE entries SET pinned = ? WHERE path = ?",
+                (int(pinned), os.path.normpath(path)),
+            )
+
+    def _forget(self, path: str, size: int) -> None:
+        self._db.execute("DELETE FROM entries WHERE path = ?", (path,))
+        self._bump("total_bytes", -size)
+        self._bump("file_count", -1)
+
+    def _bump(self, name: str, delta: int) -> None:
+        if delta:
+            self._db.execute(
+                "UPDATE counters SET value = value + ? WHERE name = ?", (delta, name)
+            )
+
+    def _counter(self, name: str) -> int:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM counters WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else 0
+
+
+class CacheCompactionTask(QgsTask):
+    """
+    Background cache maintenance: adopts untracked files once, refreshes
+    pins, evicts stale and over-budget entries, drops emptied folders and
+    compacts the manifest.
+    """
+
+    compacted = pyqtSignal(dict)  # statistics after compaction
+
+    def __init__(
+        self,
+        cache_manager: CacheManager,
+        in_use_paths: Iterable[str] = (),
+        max_age_hours: Optional[float] = None,
+    ):
+        super().__init__("Compacting AOI cache", QgsTask.CanCancel)
+        self.cache_manager = cache_manager
+        self.in_use_paths = list(in_use_paths)
+        self.max_age_hours = max_age_hours
+        self.files_removed = 0
+        self.bytes_freed = 0
+        self.exception = None
+
+    def run(self):
+        try:
+            manager = self.cache_manager
+            manager.import_untracked(self.isCanceled)
+            if self.isCanceled():
+                return False
+            self.setProgress(30)
+            manager.sync_pins(self.in_use_paths)
+            if self.max_age_hours is not None:
+                removed, freed = manager.evict_older_than(self.max_age_hours)
+                self.files_removed += removed
+                self.bytes_freed += freed
+            removed, freed = manager.evict_to_budget()
+            self.files_removed += removed
+            self.bytes_freed += freed
+            self.setProgress(70)
+            if self.isCanceled():
+                return False
+            manager.remove_empty_directories()
+            if self.files_removed:
+                manager.vacuum()
+            self.setProgress(100)
+            return True
+        except Exception as e:
+            self.exception = e
+            return False
+
+    def finished(self, result):
+        if result:
+            stats = self.cache_manager.statistics()
+            stats["files_removed"] = self.files_removed
+            stats["space_freed_mb"] = self.bytes_freed / (1024 * 1024)
+            self.compacted.emit(stats)
+        elif self.exception:
+            QgsMessageLog.logMessage(
+                f"AOI cache compaction failed: {self.exception}",
+                "AOICacheManager",
+                Qgis.Warning,
+            )
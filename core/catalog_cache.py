@@ -0,0 +1,110 @@
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from qgis.core import Qgis, QgsApplication, QgsMessageLog
+from PyQt5.QtCore import QSettings
+
+from .asset_model import RasterAsset
+
+# Bump when the stored feature layout changes so stale caches are ignored
+CATALOG_CACHE_VERSION = 5
+
+
+@dataclass
+class CachedCatalog:
+    """A catalog response as stored on disk, with its HTTP validators."""
+
+    key: str  # CatalogQuery.cache_key(): the wilker, plus a digest of any filters
+    assets: List[RasterAsset]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = field(default_factory=time.time)
+
+
+class CatalogCache:
+    """
+    Persistent cache of parsed catalog responses, one entry per catalog query.
+
+    The assets are stored as JSON features together with the ETag and
+    Last-Modified headers, so reopening a catalog costs one conditional
+    request instead of a full download. Entries are plain data, never
+    pickles, and live in the user's QGIS settings directory by default
+    rather than the shared temp directory.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        if cache_dir is None:
+            settings = QSettings()
+            cache_base = settings.value(
+                "IDPMPlugin/cache_dir", QgsApplication.qgisSettingsDirPath()
+            )
+            cache_dir = os.path.join(cache_base, "idpm_catalog_cache")
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", str(key))
+        return os.path.join(self.cache_dir, f"{safe_name}.json")
+
+    def load(self, key: str) -> Optional[CachedCatalog]:
+        """
+        Returns the cached catalog for key, or None if missing, stale or
+        unreadable; any file that does not parse is a cache miss.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("version") != CATALOG_CACHE_VERSION or entry.get("key") != key:
+                return None
+            return CachedCatalog(
+                key=key,
+                assets=[RasterAsset(feature) for feature in entry["features"]],
+                etag=entry.get("etag"),
+                last_modified=entry.get("last_modified"),
+                fetched_at=float(entry.get("fetched_at", 0.0)),
+            )
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"Ignoring unreadable catalog cache {path}: {e}",
+                "IDPMPlugin",
+                Qgis.Warning,
+            )
+            return None
+
+    def store(self, catalog: CachedCatalog) -> None:
+        """Writes the catalog atomically, replacing any previous entry."""
+        path = self._path(catalog.key)
+        tmp_path = f"{path}.tmp"
+        try:
+            # Private to the user where the OS supports it
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            entry = {
+                "version": CATALOG_CACHE_VERSION,
+                "key": catalog.key,
+                "etag": catalog.etag,
+                "last_modified": catalog.last_modified,
+                "fetched_at": catalog.fetched_at,
+                "features": [asset.to_feature() for asset in catalog.assets],
+            }
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"Could not write catalog cache {path}: {e}",
+                "IDPMPlugin",
+                Qgis.Warning,
+            )
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def invalidate(self, key: str) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,374 @@
+import codecs
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from qgis.core import Qgis, QgsMessageLog
+from PyQt5.QtCore import QObject, QSettings, QUrl, QUrlQuery, pyqtSignal
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+from ..config import Config
+from .asset_model import RasterAsset
+
+_TOKEN_RE = re.compile(r'[{}\[\]"]')
+_STRING_END_RE = re.compile(r'["\\]')
+
+
+class StreamingFeatureParser:
+    """
+    Incremental parser for GeoJSON-like responses.
+
+    Bytes are fed as they arrive; every complete object in the `features`
+    array is decoded and returned right away. Everything outside that array
+    (statusCode, message, pagination metadata) is kept as an "envelope" and
+    decoded by finish().
+    """
+
+    def __init__(self, array_key: str = "features"):
+        self.array_key = array_key
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._text = ""
+        self._offset = 0  # absolute position of self._text[0]
+        self._index = 0  # absolute scan position
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._pending_key = False
+        self._array_depth: Optional[int] = None
+        self._object_start: Optional[int] = None
+        self._envelope_parts: List[str] = []
+        self._envelope_from: Optional[int] = 0
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """Consumes a chunk and returns the features completed by it."""
+        self._text += self._decoder.decode(data)
+        features = self._scan()
+        self._compact()
+        return features
+
+    def finish(self) -> Dict[str, Any]:
+        """Flushes the stream and returns the decoded envelope (without features)."""
+        self._text += self._decoder.decode(b"", final=True)
+        self._scan()
+        if self._envelope_from is not None:
+            self._envelope_parts.append(self._text[self._envelope_from - self._offset :])
+        envelope = "".join(self._envelope_parts)
+        try:
+            return json.loads(envelope) if envelope.strip() else {}
+        except json.JSONDecodeError as e:
+            QgsMessageLog.logMessage(
+                f"Could not decode catalog response envelope: {e}",
+                "IDPMPlugin",
+                Qgis.Warning,
+            )
+            return {}
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        features = []
+        text = self._text
+        end = self._offset + len(text)
+        i = self._index
+        while i < end:
+            if self._in_string:
+                m = _STRING_END_RE.search(text, i - self._offset)
+                if m is None:
+                    i = end
+                    break
+                j = m.start() + self._offset
+                if text[j - self._offset] == "\\":
+                    if j + 1 >= end:
+                        i = j  # escape split across chunks
+                        break
+                    i = j + 2
+                    continue
+                self._in_string = False
+                if self._array_depth is None:
+                    value = text[self._string_start - self._offset + 1 : j - self._offset]
+                    self._pending_key = value == self.array_key
+                i = j + 1
+                continue
+
+            m = _TOKEN_RE.search(text, i - self._offset)
+            if m is None:
+                i = end
+                break
+            j = m.start() + self._offset
+            c = m.group()
+            if c == '"':
+                self._in_string = True
+                self._string_start = j
+            elif c in "{[":
+                if c == "[" and self._pending_key and self._array_depth is None:
+                    # Entering the features array: close the envelope segment
+                    self._envelope_parts.append(
+                        text[self._envelope_from - self._offset : j - self._offset + 1]
+                    )
+                    self._envelope_from = None
+                    self._array_depth = self._depth + 1
+                elif (
+                    c == "{"
+                    and self._array_depth is not None
+                    and self._depth == self._array_depth
+                ):
+                    self._object_start = j
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if (
+                    c == "}"
+                    and self._object_start is not None
+                    and self._depth == self._array_depth
+                ):
+                    raw = text[self._object_start - self._offset : j - self._offset + 1]
+                    features.append(json.loads(raw))
+                    self._object_start = None
+                elif (
+                    c == "]"
+                    and self._array_depth is not None
+                    and self._depth == self._array_depth - 1
+                ):
+                    self._array_depth = None
+                    self._envelope_from = j
+            if c != '"':
+                self._pending_key = False
+            i = j + 1
+        self._index = i
+        return features
+
+    def _compact(self) -> None:
+        """Drops text that is no longer needed so memory stays bounded."""
+        keep_from = self._index
+        if self._object_start is not None:
+            keep_from = min(keep_from, self._object_start)
+        if self._in_string:
+            keep_from = min(keep_from, self._string_start)
+        if self._envelope_from is not None:
+            self._envelope_parts.append(
+                self._text[self._envelope_from - self._offset : keep_from - self._offset]
+            )
+            self._envelope_from = keep_from
+        self._text = self._text[keep_from - self._offset :]
+        self._offset = keep_from
+
+
+@dataclass
+class CatalogQuery:
+    """
+    Server-side filters for the catalog endpoint.
+
+    Sent as query parameters: page, limit, bbox (minx,miny,maxx,maxy in
+    EPSG:4326), cloud_min, cloud_max, date_from and date_to (ISO dates).
+    """
+
+    wilker: str
+    bbox: Optional[Tuple[float, float, float, float]] = None
+    cloud_min: Optional[float] = None
+    cloud_max: Optional[float] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    page_size: int = Config.CATALOG_PAGE_SIZE
+
+    def url(self, page: int) -> QUrl:
+        url = QUrl(f"{Config.FRONT_END_URL}/api/geoportal/sentinel/catalog/{self.wilker}")
+        query = QUrlQuery()
+        query.addQueryItem("page", str(page))
+        query.addQueryItem("limit", str(self.page_size))
+        for name, value in self._filter_params():
+            query.addQueryItem(name, value)
+        url.setQuery(query)
+        return url
+
+    def cache_key(self) -> str:
+        """Key for caching this query's result; plain wilker when unfiltered."""
+        params = self._filter_params()
+        if not params:
+            return self.wilker
+        digest = hashlib.sha1(repr(params).encode("utf-8")).hexdigest()[:12]
+        return f"{self.wilker}_{digest}"
+
+    def _filter_params(self) -> List[Tuple[str, str]]:
+        params = []
+        if self.bbox is not None:
+            params.append(("bbox", ",".join(f"{v:.6f}" for v in self.bbox)))
+        if self.cloud_min is not None:
+            params.append(("cloud_min", f"{self.cloud_min:g}"))
+        if self.cloud_max is not None:
+            params.append(("cloud_max", f"{self.cloud_max:g}"))
+        if self.date_from is not None:
+            params.append(("date_from", self.date_from.isoformat()))
+        if self.date_to is not None:
+            params.append(("date_to", self.date_to.isoformat()))
+        return params
+
+
+class CatalogClient(QObject):
+    """
+    Fetches a catalog query page by page, streaming features as they arrive.
+
+    The next page is requested while the server reports more results
+    (`meta.has_more`, `meta.page` < `meta.total_pages`, or a `meta.next`
+    link). Without that metadata, the next page is requested while pages
+    come back exactly full. Features already received are skipped, so a
+    server that ignores the paging parameters yields a single page. Base
+    URL comes from Config.FRONT_END_URL, so the client can be pointed at a
+    local mock server.
+    """
+
+    assetsReceived = pyqtSignal(list)  # RasterAssets parsed from the current chunk
+    notModified = pyqtSignal()
+    finished = pyqtSignal(list, str, str)  # all assets, etag, last_modified
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.network_manager = QNetworkAccessManager(self)
+        self._reply: Optional[QNetworkReply] = None
+        self._parser: Optional[StreamingFeatureParser] = None
+        self._query: Optional[CatalogQuery] = None
+        self._page = 1
+        self._assets: List[RasterAsset] = []
+        self._seen_ids: Set[str] = set()
+        self._page_features = 0  # features on the current page
+        self._page_new = 0  # of which not received on an earlier page
+        self._etag = ""
+        self._last_modified = ""
+
+    def fetch(
+        self,
+        query: CatalogQuery,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """
+        Starts the query. With etag/last_modified the first page is sent as a
+        conditional request and notModified is emitted on a 304.
+        """
+        self.cancel()
+        self._query = query
+        self._page = 1
+        self._assets = []
+        self._seen_ids = set()
+        self._etag = ""
+        self._last_modified = ""
+        self._request_page(etag, last_modified)
+
+    def cancel(self) -> None:
+        if self._reply is not None:
+            reply = self._reply
+            self._reply = None
+            reply.abort()
+            reply.deleteLater()
+
+    def is_running(self) -> bool:
+        return self._reply is not None
+
+    def _request_page(
+        self, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> None:
+        request = QNetworkRequest(self._query.url(self._page))
+        token = QSettings().value("IDPMPlugin/token", None)
+        if token:
+            request.setRawHeader(b"Authorization", f"Bearer {token}".encode())
+        if etag:
+            request.setRawHeader(b"If-None-Match", etag.encode())
+        if last_modified:
+            request.setRawHeader(b"If-Modified-Since", last_modified.encode())
+
+        self._parser = StreamingFeatureParser()
+        self._page_features = 0
+        self._page_new = 0
+        reply = self.network_manager.get(request)
+        reply.readyRead.connect(lambda r=reply: self._on_ready_read(r))
+        reply.finished.connect(lambda r=reply: self._on_page_finished(r))
+        self._reply = reply
+
+    def _on_ready_read(self, reply: QNetworkReply) -> None:
+        if reply is not self._reply:
+            return
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        if status is not None and status != 200:
+            return  # error bodies and 304s are handled on finish
+        features = self._parser.feed(bytes(reply.readAll()))
+        self._page_features += len(features)
+        assets = []
+        for feature in features:
+            asset = RasterAsset(feature)
+            if asset.stac_id not in self._seen_ids:
+                self._seen_ids.add(asset.stac_id)
+                assets.append(asset)
+        if assets:
+            self._page_new += len(assets)
+            self._assets.extend(assets)
+            self.assetsReceived.emit(assets)
+
+    def _on_page_finished(self, reply: QNetworkReply) -> None:
+        if reply is not self._reply:
+            return
+        self._reply = None
+        reply.deleteLater()
+
+        if reply.error() != QNetworkReply.NoError:
+            self.failed.emit(f"Failed to fetch catalog: {reply.errorString()}")
+            return
+
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        if status == 304 and self._page == 1:
+            self.notModified.emit()
+            return
+
+        self._on_ready_read_remaining(reply)
+        envelope = self._parser.finish()
+        if envelope.get("statusCode", 500) != 200:
+            self.failed.emit(envelope.get("message", "Unknown error occurred"))
+            return
+
+        if self._page == 1:
+            self._etag = bytes(reply.rawHeader(b"ETag")).decode()
+            self._last_modified = bytes(reply.rawHeader(b"Last-Modified")).decode()
+
+        if self._has_more(envelope):
+            self._page += 1
+            self._request_page()
+            return
+
+        QgsMessageLog.logMessage(
+            f"Catalog query for {self._query.wilker} returned {len(self._assets)} "
+            f"assets in {self._page} page(s)",
+            "IDPMPlugin",
+            Qgis.Info,
+        )
+        self.finished.emit(self._assets, self._etag, self._last_modified)
+
+    def _on_ready_read_remaining(self, reply: QNetworkReply) -> None:
+        if reply.bytesAvailable() > 0:
+            self._reply = reply
+            self._on_ready_read(reply)
+            self._reply = None
+
+    def _has_more(self, envelope: Dict[str, Any]) -> bool:
+        data = envelope.get("data") or {}
+        meta = data.get("meta") or envelope.get("meta") or {}
+        if "has_more" in meta:
+            return bool(meta["has_more"])
+        if meta.get("next"):
+            return True
+        if "total_pages" in meta:
+            try:
+                return int(meta.get("page", self._page)) < int(meta["total_pages"])
+            except (TypeError, ValueError):
+                pass
+
+        # No usable pagination metadata: a full page may have a successor.
+        # A page of only repeated features means paging is ignored.
+        full = self._page_features >= self._query.page_size and self._page_new > 0
+        QgsMessageLog.logMessage(
+            f"Catalog page {self._page} has no pagination metadata; "
+            f"{self._page_features} features, "
+            f"{'requesting the next page' if full else 'assuming it is the last'}",
+            "IDPMPlugin",
+            Qgis.Warning,
+        )
+        return full
@@ -0,0 +1,227 @@
+from datetime import date, datetime, time, timezone
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from qgis.core import (
+    Qgis,
+    QgsGeometry,
+    QgsMessageLog,
+    QgsPointXY,
+    QgsRectangle,
+    QgsSpatialIndex,
+)
+
+from .asset_model import RasterAsset
+
+
+def footprint_to_geometry(asset: RasterAsset) -> Optional[QgsGeometry]:
+    """
+    Converts an asset's packed footprint into a QgsGeometry without going
+    through GeoJSON or WKT.
+    """
+    parts = [
+        [[QgsPointXY(x, y) for x, y in ring] for ring in polygon]
+        for polygon in asset.footprint_polygons()
+    ]
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return QgsGeometry.fromPolygonXY(parts[0])
+    return QgsGeometry.fromMultiPolygonXY(parts)
+
+
+def _to_timestamp(value: Union[date, datetime, None]) -> Optional[float]:
+    """Converts a date/datetime to a POSIX timestamp; naive values are taken as UTC."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class CatalogIndex:
+    """
+    Query index over a catalog of RasterAssets, built once per catalog response.
+
+    Footprint bounding boxes go into a QgsSpatialIndex; exact geometries are
+    only built for assets whose box hits an AOI. Cloud cover and capture date
+    are kept as sorted arrays (dates built on first use, since parsing them is
+    deferred), so every filter is a bounding-box lookup plus two binary
+    searches instead of a scan.
+    """
+
+    def __init__(self, assets: Sequence[RasterAsset]):
+        self.assets: List[RasterAsset] = []
+        self.geometries: Dict[int, Optional[QgsGeometry]] = {}
+        self.spatial_index = QgsSpatialIndex()
+        self._footprint_count = 0
+        self._add_footprints(assets)
+        self._build_sorted_arrays()
+
+        QgsMessageLog.logMessage(
+            f"Catalog index built for {len(self.assets)} assets "
+            f"({self._footprint_count} with footprints)",
+            "IDPMPlugin",
+            Qgis.Info,
+        )
+
+    def add_assets(self, assets: Sequence[RasterAsset]) -> None:
+        """
+        Appends assets (e.g. the next catalog page). Footprints are added to
+        the spatial index incrementally; the sorted arrays are rebuilt.
+        """
+        if not assets:
+            return
+        self._add_footprints(assets)
+        self._build_sorted_arrays()
+
+    def _add_footprints(self, assets: Sequence[RasterAsset]) -> None:
+        for asset in assets:
+            i = len(self.assets)
+            self.assets.append(asset)
+            bounds = asset.footprint_bounds()
+            if bounds is None:
+                continue
+            self.spatial_index.addFeature(i, QgsRectangle(*bounds))
+            self._footprint_count += 1
+
+    def geometry(self, i: int) -> Optional[QgsGeometry]:
+        """The footprint geometry of asset i, built on first use."""
+        if i not in self.geometries:
+            geom = footprint_to_geometry(self.assets[i])
+            self.geometries[i] = geom if geom is not None and not geom.isEmpty() else None
+        return self.geometries[i]
+
+    def _build_sorted_arrays(self) -> None:
+        cloud = np.array([a.cloud_cover for a in self.assets], dtype=np.float64)
+        self._cloud_order = np.argsort(cloud, kind="stable")
+        self._cloud_sorted = cloud[self._cloud_order]
+
+        self._date_order: Optional[np.ndarray] = None
+        self._date_sorted: Optional[np.ndarray] = None
+        self._dated_count = 0
+
+        self._aoi_cache_key: Optional[str] = None
+        self._aoi_cache_mask: Optional[np.ndarray] = None
+
+    def _ensure_date_arrays(self) -> None:
+        if self._date_order is not None:
+            return
+        # Assets without a capture date sort last (NaN) and never match a date window
+        dates = np.array(
+            [
+                ts if (ts := _to_timestamp(a.capture_date)) is not None else np.nan
+                for a in self.assets
+            ],
+            dtype=np.float64,
+        )
+        self._date_order = np.argsort(dates, kind="stable")
+        self._date_sorted = dates[self._date_order]
+        self._dated_count = int(np.count_nonzero(~np.isnan(dates)))
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def aoi_mask(self, aoi_geom: QgsGeometry) -> np.ndarray:
+        """
+        Boolean mask of assets whose footprint intersects the AOI (in EPSG:4326).
+        The last result is memoized, since the AOI rarely changes between queries.
+        """
+        key = aoi_geom.asWkt()
+        if key == self._aoi_cache_key and self._aoi_cache_mask is not None:
+            return self._aoi_cache_mask
+
+        mask = np.zeros(len(self.assets), dtype=bool)
+        engine = QgsGeometry.createGeometryEngine(aoi_geom.constGet())
+        engine.prepareGeometry()
+        for i in self.spatial_index.intersects(aoi_geom.boundingBox()):
+            geom = self.geometry(i)
+            if geom is not None and engine.intersects(geom.constGet()):
+                mask[i] = True
+
+        self._aoi_cache_key = key
+        self._aoi_cache_mask = mask
+        return mask
+
+    def cloud_mask(
+        self,
+        cloud_min: Optional[float] = None,
+        cloud_max: Optional[float] = None,
+        min_inclusive: bool = True,
+        max_inclusive: bool = True,
+    ) -> np.ndarray:
+        """Boolean mask of assets whose cloud cover lies within [cloud_min, cloud_max]."""
+        lo = 0
+        hi = len(self._cloud_sorted)
+        if cloud_min is not None:
+            side = "left" if min_inclusive else "right"
+            lo = int(np.searchsorted(self._cloud_sorted, cloud_min, side=side))
+        if cloud_max is not None:
+            side = "right" if max_inclusive else "left"
+            hi = int(np.searchsorted(self._cloud_sorted, cloud_max, side=side))
+        mask = np.zeros(len(self.assets), dtype=bool)
+        if hi > lo:
+            mask[self._cloud_order[lo:hi]] = True
+        return mask
+
+    def date_mask(
+        self,
+        date_from: Union[date, datetime, None] = None,
+        date_to: Union[date, datetime, None] = None,
+    ) -> np.ndarray:
+        """
+        Boolean mask of assets captured within [date_from, date_to]. A plain
+        `date` as upper bound includes the whole day.
+        """
+        self._ensure_date_arrays()
+        lo = 0
+        hi = self._dated_count
+        if date_from is not None:
+            lo = int(
+                np.searchsorted(
+                    self._date_sorted[:hi], _to_timestamp(date_from), side="left"
+                )
+            )
+        if date_to is not None:
+            upper = _to_timestamp(date_to)
+            if not isinstance(date_to, datetime):
+                upper += 86400.0
+                side = "left"
+            else:
+                side = "right"
+            hi = int(np.searchsorted(self._date_sorted[:hi], upper, side=side))
+        mask = np.zeros(len(self.assets), dtype=bool)
+        if hi > lo:
+            mask[self._date_order[lo:hi]] = True
+        return mask
+
+    def query(
+        self,
+        aoi_geom: Optional[QgsGeometry] = None,
+        cloud_min: Optional[float] = None,
+        cloud_max: Optional[float] = None,
+        cloud_min_inclusive: bool = True,
+        date_from: Union[date, datetime, None] = None,
+        date_to: Union[date, datetime, None] = None,
+    ) -> List[RasterAsset]:
+        """
+        Returns the assets matching all given filters, in catalog order.
+
+        Args:
+            aoi_geom: AOI geometry in EPSG:4326; None disables the spatial filter
+            cloud_min: Lower cloud cover bound (percent)
+            cloud_max: Upper cloud cover bound (percent, inclusive)
+            cloud_min_inclusive: Whether cloud_min itself matches
+            date_from: Earliest capture date/time
+            date_to: Latest capture date/time
+        """
+        mask = np.ones(len(self.assets), dtype=bool)
+        if cloud_min is not None or cloud_max is not None:
+            mask &= self.cloud_mask(cloud_min, cloud_max, cloud_min_inclusive)
+        if date_from is not None or date_to is not None:
+            mask &= self.date_mask(date_from, date_to)
+        if aoi_geom is not None and not aoi_geom.isEmpty():
+            mask &= self.aoi_mask(aoi_geom)
+        return [self.assets[i] for i in np.flatnonzero(mask)]
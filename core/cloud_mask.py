@@ -0,0 +1,115 @@
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from qgis.core import Qgis, QgsMessageLog
+
+from ..config import Config
+
+# Sentinel-2 L2A Scene Classification (SCL) classes
+SCL_NO_DATA = 0
+SCL_SATURATED = 1
+SCL_DARK_AREA = 2
+SCL_CLOUD_SHADOW = 3
+SCL_VEGETATION = 4
+SCL_NOT_VEGETATED = 5
+SCL_WATER = 6
+SCL_UNCLASSIFIED = 7
+SCL_CLOUD_MEDIUM = 8
+SCL_CLOUD_HIGH = 9
+SCL_THIN_CIRRUS = 10
+SCL_SNOW = 11
+
+
+class SclCloudMask:
+    """
+    Per-pixel clear-sky mask for one scene, from its SCL band.
+
+    The SCL band (20 m) is read through the same windowed COG path as the
+    spectral bands, directly onto the pixel grid of the band being masked
+    (nearest neighbour), so the index kernels can drop cloudy pixels instead
+    of the whole scene. Masks are cached per grid, so bands sharing a grid
+    share one SCL read.
+    """
+
+    def __init__(
+        self,
+        scl_source: str,
+        cog_loader,
+        masked_classes: Sequence[int] = Config.CLOUD_MASK_SCL_CLASSES,
+        is_canceled: Optional[Callable[[], bool]] = None,
+    ):
+        """
+        Args:
+            scl_source: Path or URL of the scene's SCL band
+            cog_loader: CogAoiLoader used for the windowed read
+            masked_classes: SCL classes treated as not clear
+            is_canceled: Polled between chunks of the SCL read
+        """
+        self.scl_source = scl_source
+        self.cog_loader = cog_loader
+        self.masked_classes = np.asarray(masked_classes)
+        self.is_canceled = is_canceled
+        self._masks: Dict[Tuple, Optional[np.ndarray]] = {}
+
+    def clear(self, profile: dict) -> Optional[np.ndarray]:
+        """
+        Boolean array, True where the pixel is clear, on the grid described
+        by profile; None if the SCL band could not be read.
+        """
+        key = (tuple(profile["transform"]), profile["width"], profile["height"])
+        if key not in self._masks:
+            scl = self.cog_loader.read_matching_array(
+                self.scl_source, profile, self.is_canceled
+            )
+            if scl is None:
+                QgsMessageLog.logMessage(
+                    "SCL band unavailable; computing without the cloud mask",
+                    "COGProcessor",
+                    Qgis.Warning,
+                )
+                self._masks[key] = None
+            else:
+                clear = ~np.isin(scl[0], self.masked_classes)
+                QgsMessageLog.logMessage(
+                    f"Cloud mask: {100.0 * (1 - clear.mean()):.1f}% of pixels masked",
+                    "COGProcessor",
+                    Qgis.Info,
+                )
+                self._masks[key] = clear
+        return self._masks[key]
+
+    def mask_band(self, band: Tuple[np.ndarray, dict]) -> Tuple[np.ndarray, dict]:
+        """
+        Copy of an in-memory (data, profile) band with masked pixels set to
+        nodata (0, the Sentinel-2 L2A fill value, if the band has none).
+        """
+        data, profile = band
+        clear = self.clear(profile)
+        if clear is None:
+            return band
+        nodata = profile.get("nodata")
+        if nodata is None:
+            nodata = 0
+            profile = dict(profile, nodata=nodata)
+        data = data.copy()
+        data[:, ~clear] = nodata
+        return data, profile
+
+
+def scene_cloud_mask(
+    scl_url: Optional[str],
+    cog_loader,
+    local_scl_path: Optional[str] = None,
+    is_canceled: Optional[Callable[[], bool]] = None,
+) -> Optional[SclCloudMask]:
+    """
+    Cloud mask for a scene, preferring a downloaded SCL band over the remote
+    one; None if masking is disabled (Config.CLOUD_MASK_ENABLED) or the
+    scene has no SCL band.
+    """
+    if not Config.CLOUD_MASK_ENABLED:
+        return None
+    source = local_scl_path or scl_url
+    if not source:
+        return None
+    return SclCloudMask(source, cog_loader, is_canceled=is_canceled)
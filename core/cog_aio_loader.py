@@ -1,9 +1,13 @@
 # cog_aoi_loader.py - Complete COG AOI-Based Loading Implementation using Rasterio
+import hashlib
+import math
 import os
 import tempfile
+import uuid
 from PyQt5.QtCore import QEventLoop, QTimer
 import numpy as np
-from typing import Optional, Dict, Tuple, List, Union
+from typing import TYPE_CHECKING, Callable, Optional, Dict, Tuple, List, Union
+from osgeo import gdal, gdal_array
 from qgis.core import (
     QgsApplication,
     QgsRectangle,
@@ -15,8 +19,14 @@ from qgis.core import (
     Qgis,
 )
 
+from ..config import Config
+from .cache_manager import CacheManager
+from .cog_ingest import finalize_product
 from .raster_calculator_worker import RasterCalculatorTask
 
+if TYPE_CHECKING:
+    from .cloud_mask import SclCloudMask
+
 try:
     import rasterio
     from rasterio.windows import from_bounds, Window
@@ -30,6 +40,26 @@ except ImportError:
     RASTERIO_AVAILABLE = False
 
 
+# An AOI band held in memory: pixel data shaped (bands, rows, cols) and the
+# rasterio profile of the window it was read from
+AoiBand = Tuple[np.ndarray, dict]
+
+# Calculator band name of the clear-sky mask multiplied into custom indices
+CLEAR_MASK_BAND = "scl_clear"
+
+
+class CogReadCancelled(Exception):
+    """Raised between chunks of a windowed read once cancellation is requested."""
+
+
+class AoiTooLargeForMemory(Exception):
+    """Raised before any pixels are read when an AOI exceeds the in-memory budget."""
+
+
+class AoiFullyMasked(Exception):
+    """Raised when no pixel of an AOI is left after nodata and cloud masking."""
+
+
 class CogAoiLoader:
     """
     Handles loading COG rasters based on Area of Interest (AOI) selections using rasterio.
@@ -42,13 +72,18 @@ class CogAoiLoader:
                 "rasterio is required for COG processing. Install with: pip install rasterio"
             )
 
-        # Configure rasterio environment for optimal COG access
-        rasterio.Env(
+        # GDAL options for COG access, applied around every remote read.
+        # Adjacent tile ranges are merged into one request, and HTTP/2
+        # multiplexes the remaining requests over a single connection.
+        self.gdal_options = dict(
             GDAL_DISABLE_READDIR_ON_OPEN="EMPTY_DIR",
             CPL_VSIL_CURL_ALLOWED_EXTENSIONS=".tif,.tiff",
             GDAL_HTTP_CONNECTTIMEOUT="30",
             GDAL_HTTP_TIMEOUT="60",
             CPL_VSIL_CURL_CACHE_SIZE="200000000",  # 200MB cache
+            GDAL_HTTP_MERGE_CONSECUTIVE_RANGES="YES",
+            GDAL_HTTP_MULTIPLEX="YES",
+            GDAL_HTTP_VERSION="2",
         )
 
     def load_cog_with_aoi(
@@ -58,6 +93,8 @@ class CogAoiLoader:
         aoi_crs: QgsCoordinateReferenceSystem,
         target_resolution: Optional[float] = None,
         cache_dir: Optional[str] = None,
+        is_canceled: Optional[Callable[[], bool]] = None,
+        output_path: Optional[str] = None,
     ) -> Optional[str]:
         """
         Load a COG raster cropped to the specified AOI using rasterio.
@@ -68,39 +105,16 @@ class CogAoiLoader:
             aoi_crs: CRS of the AOI rectangle
             target_resolution: Target pixel resolution in target CRS units
             cache_dir: Directory to cache the cropped result
+            is_canceled: Polled between tile-aligned chunks of the read
+            output_path: Where to write the crop; overrides cache_dir
 
         Returns:
             Path to the cropped raster file, or None if failed
         """
         try:
-            with rasterio.open(cog_url) as src:
-                # Convert QGIS CRS to rasterio CRS
+            with rasterio.Env(**self.gdal_options), rasterio.open(cog_url) as src:
                 aoi_crs_rasterio = CRS.from_epsg(int(aoi_crs.authid().split(":")[1]))
-                src_crs = src.crs
-
-                # Transform AOI bounds to source CRS if needed
-                if aoi_crs_rasterio != src_crs:
-                    aoi_bounds_src = transform_bounds(
-                        aoi_crs_rasterio,
-                        src_crs,
-                        aoi_rect.xMinimum(),
-                        aoi_rect.yMinimum(),
-                        aoi_rect.xMaximum(),
-                        aoi_rect.yMaximum(),
-                    )
-                else:
-                    aoi_bounds_src = (
-                        aoi_rect.xMinimum(),
-                        aoi_rect.yMinimum(),
-                        aoi_rect.xMaximum(),
-                        aoi_rect.yMaximum(),
-                    )
-
-                # Create window from bounds
-                window = from_bounds(*aoi_bounds_src, src.transform)
-
-                # Ensure window is within raster bounds
-                window = window.intersection(Window(0, 0, src.width, src.height))
+                window = self._aoi_window(src, aoi_rect, aoi_crs)
 
                 if window.width <= 0 or window.height <= 0:
                     QgsMessageLog.logMessage(
@@ -109,7 +123,9 @@ class CogAoiLoader:
                     return None
 
                 # Determine output path
-                if cache_dir:
+                if output_path:
+                    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+                elif cache_dir:
                     os.makedirs(cache_dir, exist_ok=True)
                     output_path = os.path.join(
                         cache_dir, f"cropped_{os.path.basename(cog_url)}"
@@ -120,7 +136,7 @@ class CogAoiLoader:
                     ).name
 
                 # Read data for the window
-                data = src.read(window=window)
+                data = self._read_window(src, window, is_canceled)
 
                 # Calculate transform for the windowed data
                 window_transform = src.window_transform(window)
@@ -132,7 +148,7 @@ class CogAoiLoader:
                         "height": window.height,
                         "width": window.width,
                         "transform": window_transform,
-                        "compress": "lzw",
+                        "compress": self._crop_compression(src),
                         "tiled": True,
                     }
                 )
@@ -151,12 +167,275 @@ class CogAoiLoader:
 
                 return output_path
 
+        except CogReadCancelled:
+            QgsMessageLog.logMessage(
+                f"Cancelled AOI read of {os.path.basename(cog_url)}",
+                "COGLoader",
+                Qgis.Info,
+            )
+            return None
         except Exception as e:
             QgsMessageLog.logMessage(
                 f"Error loading COG with AOI: {str(e)}", "COGLoader", Qgis.Critical
             )
             return None
 
+    def read_aoi_array(
+        self,
+        source: str,
+        aoi_rect: QgsRectangle,
+        aoi_crs: QgsCoordinateReferenceSystem,
+        is_canceled: Optional[Callable[[], bool]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Optional[AoiBand]:
+        """
+        Read the AOI window of a local raster or remote COG into memory,
+        without writing a cropped copy to disk.
+
+        Args:
+            source: Path or URL of the raster
+            aoi_rect: Area of Interest rectangle
+            aoi_crs: CRS of the AOI rectangle
+            is_canceled: Polled between tile-aligned chunks of the read
+            max_bytes: Largest window to hold in memory; checked against the
+                header before any pixels are read
+
+        Returns:
+            (data, profile) for the window, or None if failed
+
+        Raises:
+            AoiTooLargeForMemory: if the window is larger than max_bytes
+        """
+        try:
+            with rasterio.Env(**self.gdal_options), rasterio.open(source) as src:
+                window = self._aoi_window(src, aoi_rect, aoi_crs)
+                if window.width <= 0 or window.height <= 0:
+                    QgsMessageLog.logMessage(
+                        "AOI doesn't intersect with raster", "COGLoader", Qgis.Warning
+                    )
+                    return None
+
+                nbytes = (
+                    int(window.width)
+                    * int(window.height)
+                    * src.count
+                    * np.dtype(src.dtypes[0]).itemsize
+                )
+                if max_bytes is not None and nbytes > max_bytes:
+                    raise AoiTooLargeForMemory(
+                        f"AOI window of {os.path.basename(source)} needs "
+                        f"{nbytes / (1024 * 1024):.1f} MB"
+                    )
+
+                data = self._read_window(src, window, is_canceled)
+                profile = src.profile.copy()
+                profile.update(
+                    {
+                        "height": int(window.height),
+                        "width": int(window.width),
+                        "transform": src.window_transform(window),
+                    }
+                )
+                return data, profile
+
+        except AoiTooLargeForMemory:
+            raise
+        except CogReadCancelled:
+            QgsMessageLog.logMessage(
+                f"Cancelled AOI read of {os.path.basename(source)}",
+                "COGLoader",
+                Qgis.Info,
+            )
+            return None
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"Error reading AOI into memory: {str(e)}", "COGLoader", Qgis.Critical
+            )
+            return None
+
+    def read_matching_array(
+        self,
+        source: str,
+        profile: dict,
+        is_canceled: Optional[Callable[[], bool]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Read a raster onto the pixel grid of an AOI band (nearest neighbour),
+        e.g. a 20 m SCL band under a 10 m NIR window.
+
+        The covering window is fetched at native resolution through the same
+        tile-aligned chunked read as AOI bands, then resampled in memory;
+        pixels outside the raster are 0.
+
+        Args:
+            source: Path or URL of the raster
+            profile: Profile of the AOI band whose grid to match
+            is_canceled: Polled between tile-aligned chunks of the read
+
+        Returns:
+            Array shaped (bands, profile height, profile width), or None if failed
+        """
+        try:
+            with rasterio.Env(**self.gdal_options), rasterio.open(source) as src:
+                west, south, east, north = rasterio.transform.array_bounds(
+                    profile["height"], profile["width"], profile["transform"]
+                )
+                if profile["crs"] != src.crs:
+                    west, south, east, north = transform_bounds(
+                        profile["crs"], src.crs, west, south, east, north
+                    )
+                window = from_bounds(west, south, east, north, src.transform)
+                window = window.intersection(Window(0, 0, src.width, src.height))
+                window = self._pixel_window(window, src)
+
+                out = np.zeros(
+                    (src.count, profile["height"], profile["width"]),
+                    dtype=src.dtypes[0],
+                )
+                if window.width <= 0 or window.height <= 0:
+                    return out
+                data = self._read_window(src, window, is_canceled)
+                reproject(
+                    data,
+                    out,
+                    src_transform=src.window_transform(window),
+                    src_crs=src.crs,
+                    dst_transform=profile["transform"],
+                    dst_crs=profile["crs"],
+                    resampling=Resampling.nearest,
+                )
+                return out
+
+        except CogReadCancelled:
+            return None
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"Error reading {os.path.basename(source)} onto AOI grid: {str(e)}",
+                "COGLoader",
+                Qgis.Warning,
+            )
+            return None
+
+    def _aoi_window(
+        self, src, aoi_rect: QgsRectangle, aoi_crs: QgsCoordinateReferenceSystem
+    ) -> "Window":
+        """Whole-pixel window of the AOI in src, clipped to the raster."""
+        # Convert QGIS CRS to rasterio CRS
+        aoi_crs_rasterio = CRS.from_epsg(int(aoi_crs.authid().split(":")[1]))
+        aoi_bounds = (
+            aoi_rect.xMinimum(),
+            aoi_rect.yMinimum(),
+            aoi_rect.xMaximum(),
+            aoi_rect.yMaximum(),
+        )
+
+        # Transform AOI bounds to source CRS if needed
+        if aoi_crs_rasterio != src.crs:
+            aoi_bounds = transform_bounds(aoi_crs_rasterio, src.crs, *aoi_bounds)
+
+        # Ensure window is within raster bounds
+        window = from_bounds(*aoi_bounds, src.transform)
+        window = window.intersection(Window(0, 0, src.width, src.height))
+        return self._pixel_window(window, src)
+
+    @staticmethod
+    def _pixel_window(window: "Window", src) -> "Window":
+        """Snaps a fractional window outwards to whole pixels inside the raster."""
+        col_start = max(0, int(math.floor(window.col_off)))
+        row_start = max(0, int(math.floor(window.row_off)))
+        col_stop = min(src.width, int(math.ceil(window.col_off + window.width)))
+        row_stop = min(src.height, int(math.ceil(window.row_off + window.height)))
+        return Window(
+            col_start,
+            row_start,
+            max(0, col_stop - col_start),
+            max(0, row_stop - row_start),
+        )
+
+    @staticmethod
+    def _crop_compression(src) -> str:
+        """
+        Compression of an AOI crop of src: LZW, except that JPEG sources such
+        as the visual TCI stay JPEG, which is several times smaller.
+        """
+        if str(src.profile.get("compress") or "").lower() == "jpeg":
+            return "jpeg"
+        return "lzw"
+
+    @staticmethod
+    def _tile_aligned_window(window: "Window", src) -> "Window":
+        """Grows a pixel window to the internal block grid, clamped to the raster."""
+        block_h, block_w = src.block_shapes[0] if src.block_shapes else (512, 512)
+        col_start = (int(window.col_off) // block_w) * block_w
+        row_start = (int(window.row_off) // block_h) * block_h
+        col_stop = min(
+            src.width, -(-int(window.col_off + window.width) // block_w) * block_w
+        )
+        row_stop = min(
+            src.height, -(-int(window.row_off + window.height) // block_h) * block_h
+        )
+        return Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+
+    def _read_window(
+        self,
+        src,
+        window: "Window",
+        is_canceled: Optional[Callable[[], bool]] = None,
+    ) -> np.ndarray:
+        """
+        Reads a pixel window through whole internal tiles and crops it in
+        memory.
+
+        The window is grown to the block grid so every request covers
+        complete tiles (never the same tile twice), then fetched in chunks of
+        Config.COG_READ_CHUNK_TILES blocks of 512x512 pixels, or fewer
+        blocks if the file's blocks are larger (one 1024x1024 block per
+        chunk by default); GDAL merges the tile ranges of each chunk into as
+        few HTTP requests as the file layout allows. is_canceled is polled
+        between chunks, so cancellation takes effect once the chunk in flight
+        (about 1 M pixels per band) has arrived.
+
+        Raises:
+            CogReadCancelled: if is_canceled() returns True
+        """
+        block_h, block_w = src.block_shapes[0] if src.block_shapes else (512, 512)
+        # Size chunks in pixels rather than blocks, so files with large
+        # blocks do not fetch several times as much between cancel checks
+        chunk_tiles = max(
+            1, Config.COG_READ_CHUNK_TILES * 512 * 512 // (block_h * block_w)
+        )
+        # Keep chunks roughly square so each one maps to a few adjacent tiles
+        tiles_per_side = max(1, int(math.sqrt(chunk_tiles)))
+        chunk_h = block_h * tiles_per_side
+        chunk_w = block_w * max(1, chunk_tiles // tiles_per_side)
+
+        outer = self._tile_aligned_window(window, src)
+        col_off, row_off = int(outer.col_off), int(outer.row_off)
+        width, height = int(outer.width), int(outer.height)
+        data = np.empty((src.count, height, width), dtype=src.dtypes[0])
+
+        row = row_off
+        while row < row_off + height:
+            row_stop = min(row + chunk_h, row_off + height)
+            col = col_off
+            while col < col_off + width:
+                if is_canceled is not None and is_canceled():
+                    raise CogReadCancelled()
+                col_stop = min(col + chunk_w, col_off + width)
+                chunk = Window(col, row, col_stop - col, row_stop - row)
+                rows = slice(row - row_off, row_stop - row_off)
+                cols = slice(col - col_off, col_stop - col_off)
+                data[:, rows, cols] = src.read(window=chunk)
+                col = col_stop
+            row = row_stop
+
+        # Crop the requested pixels out of the tile-aligned block
+        top = int(window.row_off) - row_off
+        left = int(window.col_off) - col_off
+        return data[
+            :, top : top + int(window.height), left : left + int(window.width)
+        ].copy()
+
     def _resample_data(
         self, data: np.ndarray, profile: dict, target_resolution: float, target_crs: CRS
     ) -> Tuple[np.ndarray, dict]:
@@ -211,6 +490,7 @@ class CogAoiLoader:
         aoi_rect: QgsRectangle,
         aoi_crs: QgsCoordinateReferenceSystem,
         output_path: str,
+        is_canceled: Optional[Callable[[], bool]] = None,
     ) -> bool:
         """
         Crop an already downloaded local raster file to AOI.
@@ -221,6 +501,7 @@ class CogAoiLoader:
             aoi_rect: Area of Interest rectangle
             aoi_crs: CRS of the AOI rectangle
             output_path: Where to save the cropped result
+            is_canceled: Polled between tile-aligned chunks of the read
 
         Returns:
             True if successful, False otherwise
@@ -230,33 +511,7 @@ class CogAoiLoader:
                 return False
 
             with rasterio.open(local_file_path) as src:
-                # Convert QGIS CRS to rasterio CRS
-                aoi_crs_rasterio = CRS.from_epsg(int(aoi_crs.authid().split(":")[1]))
-                src_crs = src.crs
-
-                # Transform AOI bounds to source CRS if needed
-                if aoi_crs_rasterio != src_crs:
-                    aoi_bounds_src = transform_bounds(
-                        aoi_crs_rasterio,
-                        src_crs,
-                        aoi_rect.xMinimum(),
-                        aoi_rect.yMinimum(),
-                        aoi_rect.xMaximum(),
-                        aoi_rect.yMaximum(),
-                    )
-                else:
-                    aoi_bounds_src = (
-                        aoi_rect.xMinimum(),
-                        aoi_rect.yMinimum(),
-                        aoi_rect.xMaximum(),
-                        aoi_rect.yMaximum(),
-                    )
-
-                # Create window from bounds
-                window = from_bounds(*aoi_bounds_src, src.transform)
-
-                # Ensure window is within raster bounds
-                window = window.intersection(Window(0, 0, src.width, src.height))
+                window = self._aoi_window(src, aoi_rect, aoi_crs)
 
                 if window.width <= 0 or window.height <= 0:
                     QgsMessageLog.logMessage(
@@ -267,7 +522,7 @@ class CogAoiLoader:
                     return False
 
                 # Read data for the window
-                data = src.read(window=window)
+                data = self._read_window(src, window, is_canceled)
 
                 # Calculate transform for the windowed data
                 window_transform = src.window_transform(window)
@@ -279,7 +534,7 @@ class CogAoiLoader:
                         "height": window.height,
                         "width": window.width,
                         "transform": window_transform,
-                        "compress": "lzw",
+                        "compress": self._crop_compression(src),
                         "tiled": True,
                     }
                 )
@@ -300,6 +555,13 @@ class CogAoiLoader:
                 )
                 return True
 
+        except CogReadCancelled:
+            QgsMessageLog.logMessage(
+                f"Cancelled AOI crop of {os.path.basename(local_file_path)}",
+                "COGLoader",
+                Qgis.Info,
+            )
+            return False
         except Exception as e:
             QgsMessageLog.logMessage(
                 f"Error cropping local file to AOI: {str(e)}",
@@ -309,6 +571,233 @@ class CogAoiLoader:
             return False
 
 
+class BandSourceResolver:
+    """
+    Picks the cheapest source for each band of an AOI run:
+
+    1. an AOI crop of the same band and AOI already in the cache directory,
+    2. the full band downloaded earlier, cropped locally (no network I/O),
+    3. the remote COG, read through a windowed HTTP request.
+
+    Crops are stored under a name derived from the AOI bounds and CRS, so a
+    later run over the same AOI reuses them, and are registered with the AOI
+    CacheManager so they count against its byte budget.
+    """
+
+    SOURCE_AOI_CACHE = "aoi_cache"
+    SOURCE_LOCAL = "local"
+    SOURCE_REMOTE = "remote"
+
+    def __init__(
+        self,
+        cog_loader: CogAoiLoader,
+        cache_dir: str,
+        local_band_paths: Optional[Dict[str, str]] = None,
+        cache_manager: Optional[CacheManager] = None,
+    ):
+        self.cog_loader = cog_loader
+        self.cache_dir = cache_dir
+        self.local_band_paths = local_band_paths or {}
+        self.cache_manager = cache_manager or CacheManager.for_aoi_cache()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def aoi_key(
+        aoi_rect: QgsRectangle,
+        aoi_crs: QgsCoordinateReferenceSystem,
+        target_resolution: Optional[float] = None,
+    ) -> str:
+        """Short digest identifying an AOI (and resolution) for cache names."""
+        parts = [
+            aoi_crs.authid(),
+            f"{aoi_rect.xMinimum():.6f}",
+            f"{aoi_rect.yMinimum():.6f}",
+            f"{aoi_rect.xMaximum():.6f}",
+            f"{aoi_rect.yMaximum():.6f}",
+            str(target_resolution or ""),
+        ]
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:12]
+
+    def cached_path(self, stac_id: str, band_name: str, aoi_key: str) -> str:
+        return os.path.join(self.cache_dir, f"{stac_id}_{band_name}_aoi_{aoi_key}.tif")
+
+    def local_path(self, band_name: str) -> Optional[str]:
+        path = self.local_band_paths.get(band_name)
+        if path and os.path.exists(path) and os.path.getsize(path) > 0:
+            return path
+        return None
+
+    def source_for(self, stac_id: str, band_name: str, aoi_key: str) -> str:
+        """Which source resolve() would use for this band, without reading it."""
+        cached = self.cached_path(stac_id, band_name, aoi_key)
+        if os.path.exists(cached) and os.path.getsize(cached) > 0:
+            return self.SOURCE_AOI_CACHE
+        if self.local_path(band_name):
+            return self.SOURCE_LOCAL
+        return self.SOURCE_REMOTE
+
+    def resolve(
+        self,
+        stac_id: str,
+        band_name: str,
+        band_url: str,
+        aoi_rect: QgsRectangle,
+        aoi_crs: QgsCoordinateReferenceSystem,
+        target_resolution: Optional[float] = None,
+        is_canceled: Optional[Callable[[], bool]] = None,
+    ) -> Optional[str]:
+        """
+        Returns the path of the band cropped to the AOI, producing it from the
+        cheapest available source.
+
+        Args:
+            stac_id: Identifier for the asset
+            band_name: Band name, as used in local_band_paths
+            band_url: URL of the remote COG, used only as a last resort
+            aoi_rect: Area of Interest rectangle
+            aoi_crs: CRS of the AOI rectangle
+            target_resolution: Target resolution for resampling
+            is_canceled: Polled while reading; a cancelled read returns None
+
+        Returns:
+            Path to the cropped band, or None if no source could provide it
+        """
+        key = self.aoi_key(aoi_rect, aoi_crs, target_resolution)
+        cache_path = self.cached_path(stac_id, band_name, key)
+
+        if self.cache_manager.lookup(cache_path):
+            QgsMessageLog.logMessage(
+                f"Reusing cached AOI crop for {band_name}", "COGProcessor", Qgis.Info
+            )
+            return cache_path
+
+        # Written under a unique name, so concurrent tasks resolving the
+        # same band and AOI never write to the same file
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f"{os.path.basename(cache_path)}.",
+            suffix=".tmp",
+            dir=self.cache_dir,
+        )
+        os.close(fd)
+        try:
+            local_path = self.local_path(band_name)
+            if local_path:
+                QgsMessageLog.logMessage(
+                    f"Cropping local {band_name} file to AOI: {os.path.basename(local_path)}",
+                    "COGProcessor",
+                    Qgis.Info,
+                )
+                if target_resolution is None:
+                    cropped = self.cog_loader.crop_local_file_to_aoi(
+                        local_path, aoi_rect, aoi_crs, tmp_path, is_canceled
+                    )
+                else:
+                    cropped = self.cog_loader.load_cog_with_aoi(
+                        local_path,
+                        aoi_rect,
+                        aoi_crs,
+                        target_resolution,
+                        is_canceled=is_canceled,
+                        output_path=tmp_path,
+                    )
+                if cropped:
+                    return self._store(tmp_path, cache_path, stac_id)
+                if is_canceled is not None and is_canceled():
+                    return None
+                QgsMessageLog.logMessage(
+                    f"Could not crop local {band_name} file, reading the remote COG",
+                    "COGProcessor",
+                    Qgis.Warning,
+                )
+
+            if not band_url:
+                return None
+            QgsMessageLog.logMessage(
+                f"Downloading {band_name} from URL for AOI: {band_url}",
+                "COGProcessor",
+                Qgis.Info,
+            )
+            if not self.cog_loader.load_cog_with_aoi(
+                band_url,
+                aoi_rect,
+                aoi_crs,
+                target_resolution,
+                is_canceled=is_canceled,
+                output_path=tmp_path,
+            ):
+                return None
+            return self._store(tmp_path, cache_path, stac_id)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _store(self, tmp_path: str, cache_path: str, stac_id: str) -> str:
+        """
+        Moves a finished crop into the cache. If a concurrent task stored the
+        same crop first, its entry is a cache hit and this crop is dropped.
+        """
+        if not os.path.exists(cache_path):
+            try:
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                # e.g. on Windows, the winner's crop is already open as a layer
+                if not os.path.exists(cache_path):
+                    raise
+            else:
+                self.cache_manager.register(cache_path, key=stac_id)
+                return cache_path
+        QgsMessageLog.logMessage(
+            f"Reusing AOI crop stored concurrently: {os.path.basename(cache_path)}",
+            "COGProcessor",
+            Qgis.Info,
+        )
+        return cache_path
+
+    def resolve_array(
+        self,
+        stac_id: str,
+        band_name: str,
+        band_url: str,
+        aoi_rect: QgsRectangle,
+        aoi_crs: QgsCoordinateReferenceSystem,
+        is_canceled: Optional[Callable[[], bool]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Optional[AoiBand]:
+        """
+        Like resolve(), but reads the band's AOI window into memory and never
+        writes a crop: the cheapest source is read directly.
+
+        Raises:
+            AoiTooLargeForMemory: if the window is larger than max_bytes
+        """
+        key = self.aoi_key(aoi_rect, aoi_crs)
+        cache_path = self.cached_path(stac_id, band_name, key)
+
+        sources = []
+        if self.cache_manager.lookup(cache_path):
+            sources.append((self.SOURCE_AOI_CACHE, cache_path))
+        local_path = self.local_path(band_name)
+        if local_path:
+            sources.append((self.SOURCE_LOCAL, local_path))
+        if band_url:
+            sources.append((self.SOURCE_REMOTE, band_url))
+
+        for source, path in sources:
+            QgsMessageLog.logMessage(
+                f"Reading {band_name} into memory from {source} source",
+                "COGProcessor",
+                Qgis.Info,
+            )
+            band = self.cog_loader.read_aoi_array(
+                path, aoi_rect, aoi_crs, is_canceled, max_bytes
+            )
+            if band is not None:
+                return band
+            if is_canceled is not None and is_canceled():
+                return None
+        return None
+
+
 class CogBandProcessor:
     """
     Processes multiple COG bands for NDVI, False Color, and custom calculations
@@ -326,26 +815,29 @@ class CogBandProcessor:
         aoi_rect: QgsRectangle,
         aoi_crs: QgsCoordinateReferenceSystem,
         stac_id: str,
-        local_band_paths: Optional[
-            Dict[str, str]
-        ] = None,  # IGNORED - kept for compatibility
+        local_band_paths: Optional[Dict[str, str]] = None,
         target_resolution: Optional[float] = None,
+        is_canceled: Optional[Callable[[], bool]] = None,
     ) -> Dict[str, str]:
         """
-        Download and process multiple bands for a given AOI using rasterio.
-        ALWAYS downloads from URLs - ignores local files completely.
+        Crop multiple bands to a given AOI using rasterio.
+
+        Each band comes from the cheapest source (see BandSourceResolver), so
+        bands that are already downloaded or cached cost no network I/O.
 
         Args:
             band_urls: Dictionary mapping band names to URLs
             aoi_rect: Area of Interest rectangle
             aoi_crs: CRS of the AOI
             stac_id: Identifier for the asset
-            local_band_paths: IGNORED - kept for backward compatibility only
+            local_band_paths: Dictionary mapping band names to downloaded full bands
             target_resolution: Target resolution for resampling
+            is_canceled: Stops the run between bands and between read chunks
 
         Returns:
             Dictionary mapping band names to local file paths
         """
+        resolver = BandSourceResolver(self.cog_loader, self.cache_dir, local_band_paths)
         downloaded_bands = {}
 
         QgsMessageLog.logMessage(
@@ -355,68 +847,170 @@ class CogBandProcessor:
         )
 
         for band_name, band_url in band_urls.items():
+            if is_canceled is not None and is_canceled():
+                break
             try:
-                # Create cache filename
-                cache_filename = f"{stac_id}_{band_name}_aoi.tif"
-                cache_path = os.path.join(self.cache_dir, cache_filename)
-
-                QgsMessageLog.logMessage(
-                    f"Downloading {band_name} from URL for AOI: {band_url}",
-                    "COGProcessor",
-                    Qgis.Info,
-                )
-
-                # ALWAYS download from URL - no cache checking, no local file usage
-                result_path = self.cog_loader.load_cog_with_aoi(
-                    band_url, aoi_rect, aoi_crs, target_resolution, self.cache_dir
+                result_path = resolver.resolve(
+                    stac_id,
+                    band_name,
+                    band_url,
+                    aoi_rect,
+                    aoi_crs,
+                    target_resolution,
+                    is_canceled,
                 )
 
                 if result_path:
-                    # Rename to consistent filename if needed
-                    if result_path != cache_path:
-                        # Remove existing cache if it exists
-                        if os.path.exists(cache_path):
-                            os.remove(cache_path)
-                            QgsMessageLog.logMessage(
-                                f"Removed existing cache for {band_name}",
-                                "COGProcessor",
-                                Qgis.Info,
-                            )
-
-                        # Rename new download to cache path
-                        os.rename(result_path, cache_path)
-
-                    downloaded_bands[band_name] = cache_path
+                    downloaded_bands[band_name] = result_path
 
                     # Log success with file size
-                    file_size_mb = os.path.getsize(cache_path) / (1024 * 1024)
+                    file_size_mb = os.path.getsize(result_path) / (1024 * 1024)
                     QgsMessageLog.logMessage(
-                        f"Successfully downloaded {band_name} for AOI ({file_size_mb:.2f} MB)",
+                        f"Prepared {band_name} for AOI ({file_size_mb:.2f} MB)",
                         "COGProcessor",
                         Qgis.Info,
                     )
                 else:
                     QgsMessageLog.logMessage(
-                        f"Failed to download {band_name} for AOI from URL",
+                        f"Failed to prepare {band_name} for AOI",
                         "COGProcessor",
                         Qgis.Warning,
                     )
 
             except Exception as e:
                 QgsMessageLog.logMessage(
-                    f"Error downloading band {band_name} from URL: {str(e)}",
+                    f"Error preparing band {band_name} for AOI: {str(e)}",
                     "COGProcessor",
                     Qgis.Critical,
                 )
 
         QgsMessageLog.logMessage(
-            f"AOI band processing completed. Downloaded {len(downloaded_bands)}/{len(band_urls)} bands",
+            f"AOI band processing completed. Prepared {len(downloaded_bands)}/{len(band_urls)} bands",
             "COGProcessor",
             Qgis.Info,
         )
 
         return downloaded_bands
 
+    def read_bands_for_aoi(
+        self,
+        band_urls: Dict[str, str],
+        aoi_rect: QgsRectangle,
+        aoi_crs: QgsCoordinateReferenceSystem,
+        stac_id: str,
+        local_band_paths: Optional[Dict[str, str]] = None,
+        is_canceled: Optional[Callable[[], bool]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Dict[str, AoiBand]:
+        """
+        Read multiple bands for a given AOI into memory.
+
+        Nothing is written to disk; the arrays go straight to the
+        calculate_* methods, which also accept them in place of paths.
+
+        Args:
+            band_urls: Dictionary mapping band names to URLs
+            aoi_rect: Area of Interest rectangle
+            aoi_crs: CRS of the AOI
+            stac_id: Identifier for the asset
+            local_band_paths: Dictionary mapping band names to downloaded full bands
+            is_canceled: Stops the run between bands and between read chunks
+            max_bytes: Budget for all bands together
+
+        Returns:
+            Dictionary mapping band names to (data, profile)
+
+        Raises:
+            AoiTooLargeForMemory: if the bands do not fit in max_bytes
+        """
+        resolver = BandSourceResolver(self.cog_loader, self.cache_dir, local_band_paths)
+        bands = {}
+        remaining = max_bytes
+
+        for band_name, band_url in band_urls.items():
+            if is_canceled is not None and is_canceled():
+                break
+            band = resolver.resolve_array(
+                stac_id,
+                band_name,
+                band_url,
+                aoi_rect,
+                aoi_crs,
+                is_canceled,
+                remaining,
+            )
+            if band is None:
+                QgsMessageLog.logMessage(
+                    f"Failed to read {band_name} for AOI",
+                    "COGProcessor",
+                    Qgis.Warning,
+                )
+                continue
+            bands[band_name] = band
+            if remaining is not None:
+                remaining -= band[0].nbytes
+
+        return bands
+
+    @staticmethod
+    def _load_band(band: Union[str, AoiBand]) -> AoiBand:
+        """A cropped file or an in-memory AOI band as (data, profile)."""
+        if isinstance(band, str):
+            with rasterio.open(band) as src:
+                return src.read(), src.profile.copy()
+        return band
+
+    @classmethod
+    def _read_band(cls, band: Union[str, AoiBand]) -> Tuple[np.ndarray, dict]:
+        """First band and profile of a cropped file or an in-memory AOI band."""
+        data, profile = cls._load_band(band)
+        return data[0], profile
+
+    @staticmethod
+    def _clear_mask_band(
+        cloud_mask: "SclCloudMask", band_paths: Dict[str, Union[str, AoiBand]]
+    ) -> Optional[AoiBand]:
+        """
+        Clear-sky mask on the grid of the finest band as a uint8 band: 1
+        where clear, nodata (0) where cloudy; None if the SCL band could not
+        be read. Only the profiles of file bands are opened.
+        """
+        profiles = []
+        for band in band_paths.values():
+            if isinstance(band, str):
+                with rasterio.open(band) as src:
+                    profiles.append(src.profile.copy())
+            else:
+                profiles.append(band[1])
+        profile = min(profiles, key=lambda p: abs(p["transform"].a))
+        clear = cloud_mask.clear(profile)
+        if clear is None:
+            return None
+        profile = dict(profile, count=1, dtype="uint8", nodata=0)
+        return clear.astype(np.uint8)[np.newaxis], profile
+
+    @staticmethod
+    def _write_vsimem(band_name: str, band: AoiBand, folder: str) -> str:
+        """Exposes an in-memory AOI band to GDAL readers as a /vsimem GeoTIFF."""
+        data, profile = band
+        path = f"{folder}/{band_name}.tif"
+        ds = gdal.GetDriverByName("GTiff").Create(
+            path,
+            data.shape[2],
+            data.shape[1],
+            data.shape[0],
+            gdal_array.NumericTypeCodeToGDALTypeCode(data.dtype),
+        )
+        ds.SetGeoTransform(profile["transform"].to_gdal())
+        ds.SetProjection(profile["crs"].to_wkt())
+        for i in range(data.shape[0]):
+            out_band = ds.GetRasterBand(i + 1)
+            out_band.WriteArray(data[i])
+            if profile.get("nodata") is not None:
+                out_band.SetNoDataValue(profile["nodata"])
+        ds = None
+        return path
+
     def _is_valid_raster(self, file_path: str) -> bool:
         """Check if a raster file is valid and readable using rasterio."""
         try:
@@ -426,70 +1020,95 @@ class CogBandProcessor:
             return False
 
     def calculate_ndvi_from_aoi_bands(
-        self, nir_path: str, red_path: str, output_path: str
+        self,
+        nir_path: Union[str, AoiBand],
+        red_path: Union[str, AoiBand],
+        output_path: str,
+        cloud_mask: Optional["SclCloudMask"] = None,
     ) -> bool:
-        """Calculate NDVI from AOI-cropped NIR and Red bands using rasterio."""
-        try:
-            with rasterio.open(nir_path) as nir_src, rasterio.open(red_path) as red_src:
-                # Read data
-                nir_data = nir_src.read(1).astype(np.float32)
-                red_data = red_src.read(1).astype(np.float32)
-
-                # Get nodata values
-                nir_nodata = nir_src.nodata
-                red_nodata = red_src.nodata
-
-                # Create masks for nodata values
-                nir_mask = (
-                    (nir_data == nir_nodata)
-                    if nir_nodata is not None
-                    else np.zeros_like(nir_data, dtype=bool)
-                )
-                red_mask = (
-                    (red_data == red_nodata)
-                    if red_nodata is not None
-                    else np.zeros_like(red_data, dtype=bool)
-                )
+        """
+        Calculate NDVI from AOI-cropped NIR and Red bands using rasterio.
 
-                # Combined mask for any nodata pixels
-                nodata_mask = nir_mask | red_mask | (nir_data + red_data == 0)
+        Bands are cropped files or in-memory (data, profile) pairs. With a
+        cloud_mask, cloudy pixels become nodata instead of NDVI values.
 
-                # Calculate NDVI: (NIR - Red) / (NIR + Red)
-                # Add small epsilon to avoid division by zero
-                epsilon = 1e-10
-                denominator = nir_data + red_data + epsilon
-                ndvi_data = (nir_data - red_data) / denominator
+        Raises:
+            AoiFullyMasked: if no pixel is left after nodata and cloud masking
+        """
+        try:
+            # Read data
+            nir_data, nir_profile = self._read_band(nir_path)
+            red_data, red_profile = self._read_band(red_path)
+            nir_data = nir_data.astype(np.float32)
+            red_data = red_data.astype(np.float32)
+
+            # Get nodata values
+            nir_nodata = nir_profile.get("nodata")
+            red_nodata = red_profile.get("nodata")
+
+            # Create masks for nodata values
+            nir_mask = (
+                (nir_data == nir_nodata)
+                if nir_nodata is not None
+                else np.zeros_like(nir_data, dtype=bool)
+            )
+            red_mask = (
+                (red_data == red_nodata)
+                if red_nodata is not None
+                else np.zeros_like(red_data, dtype=bool)
+            )
 
-                # Set nodata pixels to -9999
-                ndvi_data[nodata_mask] = -9999
+            # Combined mask for any nodata pixels
+            nodata_mask = nir_mask | red_mask | (nir_data + red_data == 0)
+            if cloud_mask is not None:
+                clear = cloud_mask.clear(nir_profile)
+                if clear is not None:
+                    nodata_mask |= ~clear
+
+            # Calculate NDVI: (NIR - Red) / (NIR + Red)
+            # Add small epsilon to avoid division by zero
+            epsilon = 1e-10
+            denominator = nir_data + red_data + epsilon
+            ndvi_data = (nir_data - red_data) / denominator
+
+            # Clip NDVI values to valid range [-1, 1], then mark nodata so
+            # masked pixels stay -9999 instead of being clipped to -1
+            ndvi_data = np.clip(ndvi_data, -1, 1)
+            ndvi_data[nodata_mask] = -9999
+
+            if not (~nodata_mask).any():
+                raise AoiFullyMasked(
+                    "AOI fully masked: no clear pixels left after nodata and "
+                    "cloud masking"
+                )
 
-                # Clip NDVI values to valid range [-1, 1]
-                ndvi_data = np.clip(ndvi_data, -1, 1)
+            # Create output profile
+            profile = nir_profile.copy()
+            profile.update(
+                {
+                    "dtype": rasterio.float32,
+                    "nodata": -9999,
+                    "compress": "lzw",
+                    "tiled": True,
+                }
+            )
 
-                # Create output profile
-                profile = nir_src.profile.copy()
-                profile.update(
-                    {
-                        "dtype": rasterio.float32,
-                        "nodata": -9999,
-                        "compress": "lzw",
-                        "tiled": True,
-                    }
+            # Write NDVI data
+            with rasterio.open(output_path, "w", **profile) as dst:
+                dst.write(ndvi_data, 1)
+                dst.set_band_description(1, "NDVI")
+                dst.update_tags(
+                    1, STATISTICS_MINIMUM=str(np.min(ndvi_data[~nodata_mask]))
+                )
+                dst.update_tags(
+                    1, STATISTICS_MAXIMUM=str(np.max(ndvi_data[~nodata_mask]))
                 )
 
-                # Write NDVI data
-                with rasterio.open(output_path, "w", **profile) as dst:
-                    dst.write(ndvi_data, 1)
-                    dst.set_band_description(1, "NDVI")
-                    dst.update_tags(
-                        1, STATISTICS_MINIMUM=str(np.min(ndvi_data[~nodata_mask]))
-                    )
-                    dst.update_tags(
-                        1, STATISTICS_MAXIMUM=str(np.max(ndvi_data[~nodata_mask]))
-                    )
-
+            finalize_product(output_path)
             return True
 
+        except AoiFullyMasked:
+            raise
         except Exception as e:
             QgsMessageLog.logMessage(
                 f"Error calculating NDVI: {str(e)}", "COGProcessor", Qgis.Critical
@@ -497,69 +1116,82 @@ class CogBandProcessor:
             return False
 
     def calculate_false_color_composite(
-        self, nir_path: str, red_path: str, green_path: str, output_path: str
+        self,
+        nir_path: Union[str, AoiBand],
+        red_path: Union[str, AoiBand],
+        green_path: Union[str, AoiBand],
+        output_path: str,
+        cloud_mask: Optional["SclCloudMask"] = None,
     ) -> bool:
-        """Create False Color composite (NIR-Red-Green) from individual bands using rasterio."""
+        """
+        Create False Color composite (NIR-Red-Green) from individual bands using rasterio.
+
+        Bands are cropped files or in-memory (data, profile) pairs. With a
+        cloud_mask, cloudy pixels are left black and marked as nodata.
+        """
         try:
-            # Open all bands
-            with rasterio.open(nir_path) as nir_src, rasterio.open(
-                red_path
-            ) as red_src, rasterio.open(green_path) as green_src:
-
-                # Read arrays
-                nir_data = nir_src.read(1)
-                red_data = red_src.read(1)
-                green_data = green_src.read(1)
-
-                # Normalize and stretch to 0-255 range
-                def normalize_band(data):
-                    # Convert to float and handle nodata
-                    data = data.astype(np.float32)
-
-                    # Get percentiles for contrast stretching (2% and 98%)
-                    valid_data = data[data > 0]
-                    if len(valid_data) == 0:
-                        return np.zeros_like(data, dtype=np.uint8)
-
-                    p2, p98 = np.percentile(valid_data, [2, 98])
-
-                    # Stretch to 0-255
-                    if p98 > p2:
-                        stretched = np.clip((data - p2) / (p98 - p2) * 255, 0, 255)
-                    else:
-                        stretched = np.clip(data, 0, 255)
-
-                    return stretched.astype(np.uint8)
-
-                # Normalize bands (False Color: NIR=Red, Red=Green, Green=Blue)
-                band1 = normalize_band(nir_data)  # Red channel = NIR
-                band2 = normalize_band(red_data)  # Green channel = Red
-                band3 = normalize_band(green_data)  # Blue channel = Green
-
-                # Create output profile for RGB
-                profile = nir_src.profile.copy()
-                profile.update(
-                    {
-                        "dtype": rasterio.uint8,
-                        "count": 3,
-                        "nodata": None,
-                        "compress": "lzw",
-                        "tiled": True,
-                        "photometric": "RGB",
-                    }
-                )
+            # Read arrays
+            nir_data, nir_profile = self._read_band(nir_path)
+            red_data, _ = self._read_band(red_path)
+            green_data, _ = self._read_band(green_path)
+
+            clear = cloud_mask.clear(nir_profile) if cloud_mask is not None else None
+            if clear is not None:
+                # Zero is ignored by the stretch below and written as nodata
+                nir_data = np.where(clear, nir_data, 0)
+                red_data = np.where(clear, red_data, 0)
+                green_data = np.where(clear, green_data, 0)
+
+            # Normalize and stretch to 0-255 range
+            def normalize_band(data):
+                # Convert to float and handle nodata
+                data = data.astype(np.float32)
+
+                # Get percentiles for contrast stretching (2% and 98%)
+                valid_data = data[data > 0]
+                if len(valid_data) == 0:
+                    return np.zeros_like(data, dtype=np.uint8)
+
+                p2, p98 = np.percentile(valid_data, [2, 98])
+
+                # Stretch to 0-255
+                if p98 > p2:
+                    stretched = np.clip((data - p2) / (p98 - p2) * 255, 0, 255)
+                else:
+                    stretched = np.clip(data, 0, 255)
+
+                return stretched.astype(np.uint8)
+
+            # Normalize bands (False Color: NIR=Red, Red=Green, Green=Blue)
+            band1 = normalize_band(nir_data)  # Red channel = NIR
+            band2 = normalize_band(red_data)  # Green channel = Red
+            band3 = normalize_band(green_data)  # Blue channel = Green
+
+            # Create output profile for RGB
+            profile = nir_profile.copy()
+            profile.update(
+                {
+                    "dtype": rasterio.uint8,
+                    "count": 3,
+                    "nodata": 0 if clear is not None else None,
+                    "compress": "lzw",
+                    "tiled": True,
+                    "photometric": "RGB",
+                }
+            )
 
-                # Write False Color composite
-                with rasterio.open(output_path, "w", **profile) as dst:
-                    dst.write(band1, 1)  # Red = NIR
-                    dst.write(band2, 2)  # Green = Red
-                    dst.write(band3, 3)  # Blue = Green
+            # Write False Color composite
+            with rasterio.open(output_path, "w", **profile) as dst:
+                dst.write(band1, 1)  # Red = NIR
+                dst.write(band2, 2)  # Green = Red
+                dst.write(band3, 3)  # Blue = Green
 
-                    # Set band descriptions
-                    dst.set_band_description(1, "NIR")
-                    dst.set_band_description(2, "Red")
-                    dst.set_band_description(3, "Green")
+                # Set band descriptions
+                dst.set_band_description(1, "NIR")
+                dst.set_band_description(2, "Red")
+                dst.set_band_description(3, "Green")
 
+            finalize_product(output_path)
             return True
 
         except Exception as e:
@@ -572,28 +1204,55 @@ class CogBandProcessor:
 
     def calculate_custom_index(
         self,
-        band_paths: Dict[str, str],
+        band_paths: Dict[str, Union[str, AoiBand]],
         formula: str,
         output_path: str,
         coefficients: Optional[Dict] = None,
         timeout_seconds: int = 300,
+        cloud_mask: Optional["SclCloudMask"] = None,
     ) -> bool:
         """
         Calculate custom vegetation index using QGIS RasterCalculator instead of eval.
 
+        In-memory bands are handed to the calculator as /vsimem datasets,
+        which are freed once it finishes. With a cloud_mask, the SCL clear
+        mask joins the calculation as one more /vsimem band (nodata where
+        cloudy) multiplied into the formula, so cloudy pixels come out as
+        nodata while file bands are still read by the calculator block by
+        block rather than loaded into memory.
+
         Args:
-            band_paths: Dictionary mapping band names to file paths
+            band_paths: Dictionary mapping band names to file paths or
+                in-memory (data, profile) pairs
             formula: Mathematical formula (e.g., "(nir - red) / (nir + red)")
             output_path: Output file path
             coefficients: Optional coefficients for the formula
             timeout_seconds: Maximum time to wait for calculation completion
+            cloud_mask: Optional per-pixel cloud mask of the scene
 
         Returns:
             True if calculation successful
         """
+        vsimem_dir = f"/vsimem/idpm_aoi_{uuid.uuid4().hex}"
+        vsimem_paths = []
         try:
+            band_paths = dict(band_paths)
+            if cloud_mask is not None:
+                clear_band = self._clear_mask_band(cloud_mask, band_paths)
+                if clear_band is not None:
+                    band_paths[CLEAR_MASK_BAND] = clear_band
+                    formula = f"{CLEAR_MASK_BAND} * ({formula})"
+            for band_name, band in band_paths.items():
+                if not isinstance(band, str):
+                    band_paths[band_name] = self._write_vsimem(
+                        band_name, band, vsimem_dir
+                    )
+                    vsimem_paths.append(band_paths[band_name])
+
             # Validate that all band files exist and are readable
             for band_name, path in band_paths.items():
+                if path in vsimem_paths:
+                    continue
                 if not os.path.exists(path):
                     QgsMessageLog.logMessage(
                         f"Band file does not exist: {band_name} -> {path}",
@@ -615,8 +1274,6 @@ class CogBandProcessor:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
             # Generate a unique STAC ID for this calculation
-            import hashlib
-
             stac_id = hashlib.md5(
                 (formula + str(sorted(band_paths.items()))).encode()
             ).hexdigest()[:8]
@@ -708,6 +1365,9 @@ class CogBandProcessor:
                 Qgis.Critical,
             )
             return False
+        finally:
+            for path in vsimem_paths:
+                gdal.Unlink(path)
 
     def _wait_for_task_completion(
         self,
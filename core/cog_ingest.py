@@ -0,0 +1,245 @@
+import os
+
+from osgeo import gdal
+from qgis.core import Qgis, QgsMessageLog, QgsTask
+from PyQt5.QtCore import pyqtSignal
+
+from ..config import Config
+
+COG_COMPRESSION = "DEFLATE"
+
+
+def is_cloud_optimized(path: str, block_size: int = Config.COG_BLOCK_SIZE) -> bool:
+    """
+    True if the GeoTIFF at path is already tiled with square blocks of any
+    size (Sentinel-2 COGs use 1024) and has internal overviews, i.e. needs
+    no ingest. Rasters no larger than block_size need no overviews.
+    """
+    ds = gdal.Open(path)
+    if ds is None:
+        return False
+    try:
+        band = ds.GetRasterBand(1)
+        block_x, block_y = band.GetBlockSize()
+        small = min(ds.RasterXSize, ds.RasterYSize) <= block_size
+        tiled = block_x == block_y
+        has_overviews = band.GetOverviewCount() > 0 or small
+        return (tiled or small) and has_overviews
+    finally:
+        ds = None
+
+
+def _jpeg_band_count(path: str) -> int:
+    """
+    Band count of the GeoTIFF at path if it is JPEG-compressed (e.g. a
+    Sentinel-2 TCI), else 0.
+    """
+    ds = gdal.Open(path)
+    if ds is None:
+        return 0
+    try:
+        compression = ds.GetMetadataItem("COMPRESSION", "IMAGE_STRUCTURE") or ""
+        return ds.RasterCount if "JPEG" in compression.upper() else 0
+    finally:
+        ds = None
+
+
+def translate_to_cog(
+    src_path: str,
+    dst_path: str,
+    block_size: int = Config.COG_BLOCK_SIZE,
+    resampling: str = Config.OVERVIEW_RESAMPLING,
+    callback=None,
+) -> None:
+    """
+    Writes src_path to dst_path as a cloud-optimized GeoTIFF: square tiles of
+    block_size, lossless compression and internal overviews. JPEG sources
+    stay JPEG, since a lossless copy of them is several times larger.
+
+    GDAL's COG driver is used when available (GDAL >= 3.1); older versions
+    get a tiled GTiff with overviews copied in via COPY_SRC_OVERVIEWS.
+
+    Args:
+        callback: GDAL progress callback; returning 0 aborts
+
+    Raises:
+        RuntimeError: if GDAL fails or the callback aborts
+    """
+    jpeg_bands = _jpeg_band_count(src_path)
+    if gdal.GetDriverByName("COG") is not None:
+        # The COG driver stores 3-band JPEG as YCbCr
+        compression = (
+            ["COMPRESS=JPEG"]
+            if jpeg_bands
+            else [f"COMPRESS={COG_COMPRESSION}", "PREDICTOR=YES"]
+        )
+        options = gdal.TranslateOptions(
+            format="COG",
+            creationOptions=[
+                f"BLOCKSIZE={block_size}",
+                *compression,
+                "OVERVIEWS=AUTO",
+                f"RESAMPLING={resampling}",
+                "BIGTIFF=IF_SAFER",
+                "NUM_THREADS=ALL_CPUS",
+            ],
+            callback=callback,
+        )
+        out = gdal.Translate(dst_path, src_path, options=options)
+        if out is None:
+            raise RuntimeError(gdal.GetLastErrorMsg() or "COG conversion failed")
+        out = None
+        return
+
+    tiled_path = f"{dst_path}.tiled"
+    tile_options = [
+        "TILED=YES",
+        f"BLOCKXSIZE={block_size}",
+        f"BLOCKYSIZE={block_size}",
+        "BIGTIFF=IF_SAFER",
+    ]
+    if jpeg_bands:
+        tile_options.append("COMPRESS=JPEG")
+        if jpeg_bands == 3:
+            tile_options.append("PHOTOMETRIC=YCBCR")
+    else:
+        tile_options.append(f"COMPRESS={COG_COMPRESSION}")
+    try:
+        tiled = gdal.Translate(
+            tiled_path, src_path, format="GTiff", creationOptions=tile_options
+        )
+        if tiled is None:
+            raise RuntimeError(gdal.GetLastErrorMsg() or "Tiling failed")
+        levels = []
+        factor = 2
+        while min(tiled.RasterXSize, tiled.RasterYSize) // factor >= block_size // 2:
+            levels.append(factor)
+            factor *= 2
+        if levels and tiled.BuildOverviews(resampling, levels, callback=callback) != 0:
+            raise RuntimeError(gdal.GetLastErrorMsg() or "Building overviews failed")
+        tiled = None
+        out = gdal.Translate(
+            dst_path,
+            tiled_path,
+            format="GTiff",
+            creationOptions=tile_options + ["COPY_SRC_OVERVIEWS=YES"],
+        )
+        if out is None:
+            raise RuntimeError(gdal.GetLastErrorMsg() or "COG layout copy failed")
+        out = None
+    finally:
+        tiled = None
+        if os.path.exists(tiled_path):
+            os.remove(tiled_path)
+
+
+def finalize_product(
+    path: str, resampling: str = Config.OVERVIEW_RESAMPLING, callback=None
+) -> bool:
+    """
+    Rewrites a product GeoTIFF the plugin has just written (NDVI, false
+    color, custom index, AOI crop) in place as a COG with internal overviews,
+    so QGIS renders it from the matching overview at every scale instead of
+    decimating full-resolution pixels. Meant to run at the end of the
+    writer's background task.
+
+    Products that already have that layout, or fit in a single block, are
+    left as they are. Disabled with Config.PRODUCT_OVERVIEWS_ENABLED.
+
+    Args:
+        path: GeoTIFF to convert
+        resampling: Overview resampling, e.g. "AVERAGE" or "NEAREST"
+        callback: GDAL progress callback; returning 0 aborts
+
+    Returns:
+        True if the file was converted; on failure the product is kept
+        unchanged, without overviews
+    """
+    if not Config.PRODUCT_OVERVIEWS_ENABLED or is_cloud_optimized(path):
+        return False
+
+    tmp_path = f"{path}.cog"
+    try:
+        translate_to_cog(path, tmp_path, resampling=resampling, callback=callback)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        QgsMessageLog.logMessage(
+            f"Could not build overviews for {os.path.basename(path)}: {e}",
+            "IDPMPlugin",
+            Qgis.Warning,
+        )
+        return False
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class CogIngestTask(QgsTask):
+    """
+    A QGIS task that rewrites a downloaded GeoTIFF in place as a local
+    cloud-optimized GeoTIFF (see translate_to_cog).
+
+    Files that already have that layout are left untouched.
+    """
+
+    ingestFinished = pyqtSignal(str)
+    errorOccurred = pyqtSignal(str)
+
+    def __init__(
+        self,
+        path: str,
+        block_size: int = Config.COG_BLOCK_SIZE,
+        resampling: str = Config.OVERVIEW_RESAMPLING,
+    ):
+        super().__init__(f"Optimize {os.path.basename(path)}", QgsTask.CanCancel)
+        self.path = path
+        self.block_size = block_size
+        self.resampling = resampling
+        self.converted = False
+        self.exception = None
+
+    def _progress(self, complete, message, data):
+        self.setProgress(complete * 100)
+        return 0 if self.isCanceled() else 1
+
+    def run(self):
+        tmp_path = f"{self.path}.cog.tmp"
+        try:
+            if is_cloud_optimized(self.path, self.block_size):
+                return True
+
+            translate_to_cog(
+                self.path,
+                tmp_path,
+                self.block_size,
+                self.resampling,
+                callback=self._progress,
+            )
+
+            if self.isCanceled():
+                return False
+            os.replace(tmp_path, self.path)
+            self.converted = True
+            return True
+        except Exception as e:
+            self.exception = e
+            return False
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def finished(self, result):
+        if result:
+            if self.converted:
+                QgsMessageLog.logMessage(
+                    f"Converted {os.path.basename(self.path)} to a tiled COG "
+                    f"({self.block_size}px blocks, internal overviews)",
+                    "IDPMPlugin",
+                    Qgis.Info,
+                )
+            self.ingestFinished.emit(self.path)
+        else:
+            self.errorOccurred.emit(
+                str(self.exception) if self.exception else "COG ingest cancelled"
+            )
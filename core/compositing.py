@@ -0,0 +1,387 @@
+import math
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsMessageLog,
+    QgsProject,
+    QgsRectangle,
+    QgsTask,
+)
+from PyQt5.QtCore import pyqtSignal
+
+from ..config import Config
+from .asset_model import RasterAsset
+from .band_alignment import TargetGrid
+from .cog_ingest import translate_to_cog
+
+try:
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.vrt import WarpedVRT
+    from rasterio.windows import Window
+
+    RASTERIO_AVAILABLE = True
+except ImportError:
+    RASTERIO_AVAILABLE = False
+
+COMPOSITE_METHODS = ("median", "max_ndvi")
+
+# Output bands of a composite, in order
+COMPOSITE_BANDS = ("nir", "red", "green", "ndvi")
+
+# Spectral bands read from each scene
+_SCENE_BANDS = ("nir", "red", "green")
+
+# Float32 arrays held per scene for a block: the three band stacks, NDVI and
+# the read buffer
+_ARRAYS_PER_SCENE = 5
+
+
+def composite_memory_bytes(
+    scene_count: int,
+    block_size: int = Config.COMPOSITE_BLOCK_SIZE,
+    workers: int = Config.COMPOSITE_WORKERS,
+) -> int:
+    """Estimated peak block memory of a composite (2 x workers blocks in flight)."""
+    per_scene = block_size * block_size * 4 * _ARRAYS_PER_SCENE
+    return per_scene * scene_count * 2 * max(1, workers)
+
+
+def max_composite_scenes(
+    block_size: int = Config.COMPOSITE_BLOCK_SIZE,
+    workers: int = Config.COMPOSITE_WORKERS,
+) -> int:
+    """
+    Most scenes one composite may use: Config.COMPOSITE_MAX_SCENES, or fewer
+    if their blocks would not fit Config.COMPOSITE_MAX_MEMORY_BYTES.
+    """
+    fits = Config.COMPOSITE_MAX_MEMORY_BYTES // composite_memory_bytes(
+        1, block_size, workers
+    )
+    return int(min(Config.COMPOSITE_MAX_SCENES, fits))
+
+
+def least_cloudy(assets: Sequence[RasterAsset], count: int) -> List[RasterAsset]:
+    """The count scenes with the lowest cloud cover, in their original order."""
+    ranked = sorted(range(len(assets)), key=lambda i: assets[i].cloud_cover)
+    return [assets[i] for i in sorted(ranked[:count])]
+
+
+def composite_grid(
+    aoi_rect: QgsRectangle,
+    aoi_crs: QgsCoordinateReferenceSystem,
+    crs_wkt: str,
+    resolution: float = 10.0,
+) -> TargetGrid:
+    """
+    Output grid of a composite: the AOI in the given (projected) CRS, snapped
+    outwards to whole multiples of the resolution so that the grid lines up
+    with the Sentinel-2 10 m pixel grid.
+    """
+    target_crs = QgsCoordinateReferenceSystem.fromWkt(crs_wkt)
+    rect = QgsRectangle(aoi_rect)
+    if aoi_crs != target_crs:
+        transform = QgsCoordinateTransform(aoi_crs, target_crs, QgsProject.instance())
+        rect = transform.transformBoundingBox(rect)
+    return TargetGrid(
+        xmin=math.floor(rect.xMinimum() / resolution) * resolution,
+        ymin=math.floor(rect.yMinimum() / resolution) * resolution,
+        xmax=math.ceil(rect.xMaximum() / resolution) * resolution,
+        ymax=math.ceil(rect.yMaximum() / resolution) * resolution,
+        res_x=resolution,
+        res_y=resolution,
+        crs_wkt=crs_wkt,
+    )
+
+
+def _blocks(grid: TargetGrid, block_size: int) -> Iterator["Window"]:
+    for row in range(0, grid.height, block_size):
+        for col in range(0, grid.width, block_size):
+            yield Window(
+                col,
+                row,
+                min(block_size, grid.width - col),
+                min(block_size, grid.height - row),
+            )
+
+
+def composite_block(stacks: Dict[str, np.ndarray], method: str) -> np.ndarray:
+    """
+    Per-pixel composite of one block.
+
+    Args:
+        stacks: Band name -> (scenes, rows, cols) float32 array with NaN for
+            masked or missing pixels
+        method: "median" (per band) or "max_ndvi" (all bands from the scene
+            with the highest NDVI at that pixel)
+
+    Returns:
+        (len(COMPOSITE_BANDS), rows, cols) float32 array, NaN where no scene
+        had a clear pixel
+    """
+    nir, red = stacks["nir"], stacks["red"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ndvi = (nir - red) / (nir + red)
+    stacks = dict(stacks, ndvi=ndvi)
+
+    rows, cols = nir.shape[1:]
+    out = np.full((len(COMPOSITE_BANDS), rows, cols), np.nan, dtype=np.float32)
+    any_clear = ~np.all(np.isnan(ndvi), axis=0)
+    if not any_clear.any():
+        return out
+
+    if method == "median":
+        with warnings.catch_warnings():
+            # All-NaN pixels are expected where every scene is cloudy
+            warnings.simplefilter("ignore", RuntimeWarning)
+            for i, band in enumerate(COMPOSITE_BANDS):
+                out[i] = np.nanmedian(stacks[band], axis=0)
+    else:
+        best = np.where(np.isnan(ndvi), -np.inf, ndvi).argmax(axis=0)
+        for i, band in enumerate(COMPOSITE_BANDS):
+            picked = np.take_along_axis(stacks[band], best[np.newaxis], axis=0)[0]
+            out[i] = np.where(any_clear, picked, np.nan)
+    return out
+
+
+class TemporalCompositeTask(QgsTask):
+    """
+    A QGIS task that combines several scenes of the same area into one
+    cloud-free composite (e.g. a seasonal mangrove base map) and writes it as
+    a tiled COG.
+
+    Each scene's bands are warped on the fly onto one output grid (GDAL
+    warped VRTs over the remote COGs, so only the tiles under the AOI are
+    fetched), block by block. Cloudy pixels are dropped with the scene's SCL
+    band, then every block is reduced to a per-pixel median or max-NDVI
+    composite. Blocks are processed by a thread pool (GDAL reads and the
+    NumPy reductions release the GIL) with at most 2 x workers blocks in
+    flight, so memory stays around
+    block_size^2 x scenes x 5 arrays x 4 bytes x 2 x workers,
+    independent of the AOI size. Runs whose estimate exceeds
+    Config.COMPOSITE_MAX_MEMORY_BYTES are refused before any read; pick the
+    scenes with least_cloudy and max_composite_scenes.
+    """
+
+    compositeFinished = pyqtSignal(str)  # output_path
+    errorOccurred = pyqtSignal(str)
+
+    def __init__(
+        self,
+        assets: Sequence[RasterAsset],
+        aoi_rect: QgsRectangle,
+        aoi_crs: QgsCoordinateReferenceSystem,
+        output_path: str,
+        method: str = "median",
+        resolution: float = 10.0,
+        block_size: int = Config.COMPOSITE_BLOCK_SIZE,
+        max_workers: int = Config.COMPOSITE_WORKERS,
+    ):
+        super().__init__(
+            f"{method} composite of {len(assets)} scenes", QgsTask.CanCancel
+        )
+        self.assets = [asset for asset in assets if asset.nir_url and asset.red_url]
+        self.aoi_rect = aoi_rect
+        self.aoi_crs = aoi_crs
+        self.output_path = output_path
+        self.method = method
+        self.resolution = resolution
+        self.block_size = block_size
+        self.max_workers = max(1, max_workers)
+        self.exception = None
+
+        self._local = threading.local()
+        self._opened: List = []
+        self._opened_lock = threading.Lock()
+
+    def _scene_readers(self, grid: TargetGrid) -> List[Dict[str, "WarpedVRT"]]:
+        """
+        Per-thread warped views of every scene on the output grid; rasterio
+        datasets must not be shared across threads.
+        """
+        readers = getattr(self._local, "readers", None)
+        if readers is not None:
+            return readers
+
+        transform = rasterio.Affine(
+            grid.res_x, 0.0, grid.xmin, 0.0, -grid.res_y, grid.ymax
+        )
+        readers = []
+        for asset in self.assets:
+            urls = {band: getattr(asset, f"{band}_url") for band in _SCENE_BANDS}
+            # Always masked: dropping cloudy pixels is the point of a
+            # composite, whatever Config.CLOUD_MASK_ENABLED says
+            if asset.scl_url:
+                urls["scl"] = asset.scl_url
+            scene = {}
+            for band, url in urls.items():
+                if not url:
+                    continue
+                src = rasterio.open(url)
+                vrt = WarpedVRT(
+                    src,
+                    crs=grid.crs_wkt,
+                    transform=transform,
+                    width=grid.width,
+                    height=grid.height,
+                    resampling=Resampling.nearest
+                    if band == "scl"
+                    else Resampling.bilinear,
+                )
+                with self._opened_lock:
+                    self._opened.extend([vrt, src])
+                scene[band] = vrt
+            readers.append(scene)
+        self._local.readers = readers
+        return readers
+
+    def _process_block(
+        self, grid: TargetGrid, window: "Window", gdal_options: dict
+    ) -> np.ndarray:
+        with rasterio.Env(**gdal_options):
+            readers = self._scene_readers(grid)
+            shape = (len(readers), int(window.height), int(window.width))
+            stacks = {
+                band: np.full(shape, np.nan, dtype=np.float32) for band in _SCENE_BANDS
+            }
+            for i, scene in enumerate(readers):
+                if self.isCanceled():
+                    break
+                if "scl" in scene:
+                    scl = scene["scl"].read(1, window=window)
+                    clear = ~np.isin(scl, Config.CLOUD_MASK_SCL_CLASSES)
+                else:
+                    clear = np.ones(shape[1:], dtype=bool)
+                for band in _SCENE_BANDS:
+                    if band not in scene:
+                        continue
+                    data = scene[band].read(1, window=window).astype(np.float32)
+                    # 0 is the Sentinel-2 L2A fill value and the warp's nodata
+                    stacks[band][i] = np.where(clear & (data != 0), data, np.nan)
+            return composite_block(stacks, self.method)
+
+    def run(self):
+        """
+        Builds the composite in a background thread.
+        """
+        tmp_path = f"{self.output_path}.tmp"
+        try:
+            if not RASTERIO_AVAILABLE:
+                raise ImportError("rasterio is required for compositing")
+            if self.method not in COMPOSITE_METHODS:
+                raise ValueError(f"Unknown composite method: {self.method}")
+            if not self.assets:
+                raise ValueError("No scenes with NIR and Red bands to composite")
+            needed = composite_memory_bytes(
+                len(self.assets), self.block_size, self.max_workers
+            )
+            if needed > Config.COMPOSITE_MAX_MEMORY_BYTES:
+                raise ValueError(
+                    f"A composite of {len(self.assets)} scenes needs about "
+                    f"{needed / (1024 * 1024):.0f} MB, more than the "
+                    f"{Config.COMPOSITE_MAX_MEMORY_BYTES / (1024 * 1024):.0f} MB "
+                    "limit (COMPOSITE_MAX_MEMORY_MB); use fewer scenes"
+                )
+
+            from .cog_aio_loader import CogAoiLoader
+
+            gdal_options = CogAoiLoader().gdal_options
+            with rasterio.Env(**gdal_options), rasterio.open(
+                self.assets[0].nir_url
+            ) as ref:
+                crs_wkt = ref.crs.to_wkt()
+            grid = composite_grid(self.aoi_rect, self.aoi_crs, crs_wkt, self.resolution)
+            blocks = list(_blocks(grid, self.block_size))
+            started = time.monotonic()
+
+            os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+            profile = {
+                "driver": "GTiff",
+                "dtype": "float32",
+                "count": len(COMPOSITE_BANDS),
+                "width": grid.width,
+                "height": grid.height,
+                "crs": crs_wkt,
+                "transform": rasterio.Affine(
+                    grid.res_x, 0.0, grid.xmin, 0.0, -grid.res_y, grid.ymax
+                ),
+                "nodata": float("nan"),
+                "tiled": True,
+                "blockxsize": self.block_size,
+                "blockysize": self.block_size,
+                "bigtiff": "IF_SAFER",
+            }
+            with rasterio.open(tmp_path, "w", **profile) as dst, ThreadPoolExecutor(
+                max_workers=self.max_workers
+            ) as executor:
+                for i, band in enumerate(COMPOSITE_BANDS, start=1):
+                    dst.set_band_description(i, band.upper())
+
+                queued = iter(blocks)
+                pending = {}
+                done_blocks = 0
+                while True:
+                    # Bounded queue: memory is per block in flight, not per AOI
+                    while len(pending) < 2 * self.max_workers:
+                        window = next(queued, None)
+                        if window is None:
+                            break
+                        future = executor.submit(
+                            self._process_block, grid, window, gdal_options
+                        )
+                        pending[future] = window
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        window = pending.pop(future)
+                        dst.write(future.result(), window=window)
+                        done_blocks += 1
+                        self.setProgress(85 * done_blocks / len(blocks))
+                    if self.isCanceled():
+                        for future in pending:
+                            future.cancel()
+                        return False
+
+            QgsMessageLog.logMessage(
+                f"Composite of {len(self.assets)} scenes, {len(blocks)} blocks "
+                f"in {time.monotonic() - started:.1f} s",
+                "IDPMPlugin",
+                Qgis.Info,
+            )
+
+            translate_to_cog(tmp_path, self.output_path)
+            return True
+
+        except Exception as e:
+            self.exception = e
+            return False
+        finally:
+            with self._opened_lock:
+                for dataset in self._opened:
+                    dataset.close()
+                self._opened.clear()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.setProgress(100)
+
+    def finished(self, result):
+        """
+        Called on the main thread when the task is finished.
+        """
+        if result:
+            self.compositeFinished.emit(self.output_path)
+        else:
+            if self.exception:
+                self.errorOccurred.emit(str(self.exception))
+            else:
+                self.errorOccurred.emit("Composite task was canceled or failed.")
@@ -4,10 +4,7 @@ from qgis.core import (
     Qgis,
     QgsMessageLog,
     QgsVectorLayer,
-    QgsField,
-    QgsProject,
 )
-from PyQt5.QtCore import QVariant
 from ..config import Config
 
 
@@ -80,6 +77,8 @@ def check_changes(
 ):
     """
     Checks the '_qc' table for changes and highlights them on the provided Type Data layer.
+    Only QC rows newer than the last seen ogc_fid/timestamp are fetched; see
+    `core.qc_sync` for the in-memory status index.
 
     Args:
         wilker_name: The wilker name
@@ -88,146 +87,8 @@ def check_changes(
         year: The year
         add_qc_layer_to_map: Whether to add the QC layer to the map for visualization
     """
-    if not layer.isValid() or layer is None:
-        return
+    from .qc_sync import sync_qc_changes
 
-    qc_table_name = get_qc_table_name(type_data, year)
-
-    uri_logger = create_db_uri(wilker_name, qc_table_name, "geometry", "ogc_fid")
-    if not uri_logger:
-        return
-
-    layer_logger = QgsVectorLayer(
-        uri_logger.uri(False), f"QC Log - {wilker_name} {year}", "postgres"
-    )
-
-    if not layer_logger.isValid():
-        QgsMessageLog.logMessage(
-            f"Failed to load QC table '{qc_table_name}' for wilker '{wilker_name}'!",
-            "IDPMPlugin",
-            Qgis.Warning,
-        )
-        return
-
-    # Debug information about the loaded layer
-    QgsMessageLog.logMessage(
-        f"QC Layer loaded successfully: '{layer_logger.name()}' "
-        f"Features: {layer_logger.featureCount()}, "
-        f"CRS: {layer_logger.crs().authid()}, "
-        f"Extent: {layer_logger.extent().toString()}",
-        "IDPMPlugin",
-        Qgis.Info,
+    return sync_qc_changes(
+        wilker_name, layer, type_data, year, add_qc_layer_to_map=add_qc_layer_to_map
     )
-
-    # Optionally add the QC layer to the map for visualization
-    if add_qc_layer_to_map and layer_logger.featureCount() > 0:
-        # Check if layer is already in project
-        existing_layers = [
-            layer.name() for layer in QgsProject.instance().mapLayers().values()
-        ]
-        if layer_logger.name() not in existing_layers:
-            QgsProject.instance().addMapLayer(layer_logger)
-            QgsMessageLog.logMessage(
-                f"Added QC layer '{layer_logger.name()}' to map",
-                "IDPMPlugin",
-                Qgis.Info,
-            )
-        else:
-            QgsMessageLog.logMessage(
-                f"QC layer '{layer_logger.name()}' already exists in map",
-                "IDPMPlugin",
-                Qgis.Info,
-            )
-
-    if layer_logger.featureCount() > 0:
-        # Create a dictionary to store QC status for each feature
-        qc_data = {}
-        for qc_feature in layer_logger.getFeatures():
-            ogc_fid = qc_feature["ogc_fid"]
-            qc_status_raw = (
-                qc_feature.attribute("qcstatus")
-                if qc_feature.fields().indexOf("qcstatus") != -1
-                else None
-            )
-
-            # Parse QC status from JSON format - just use the raw data
-            qc_status_display = "Unknown"
-            if qc_status_raw:
-                # Just convert to string representation
-                qc_status_display = str(qc_status_raw)
-
-            qc_data[ogc_fid] = qc_status_display
-
-        # Highlight the features with QC changes
-        feature_ids = list(qc_data.keys())
-        expression = f'"ogc_fid" IN ({",".join(map(str, feature_ids))})'
-
-        # Debug information about the selection
-        QgsMessageLog.logMessage(
-            f"Attempting to select features with expression: {expression}",
-            "IDPMPlugin",
-            Qgis.Info,
-        )
-
-        # Check if the main layer has the ogc_fid field
-        main_layer_fields = [field.name() for field in layer.fields()]
-        QgsMessageLog.logMessage(
-            f"Main layer '{layer.name()}' fields: {', '.join(main_layer_fields)}",
-            "IDPMPlugin",
-            Qgis.Info,
-        )
-
-        layer.selectByExpression(expression, QgsVectorLayer.SetSelection)
-
-        # Check how many features were actually selected
-        selected_count = layer.selectedFeatureCount()
-        QgsMessageLog.logMessage(
-            f"Selected {selected_count} features out of {len(feature_ids)} QC records",
-            "IDPMPlugin",
-            Qgis.Info,
-        )
-
-        # Add QC status information to the main layer as a virtual field
-        qc_field_name = "qc_status"
-
-        # Remove existing QC field if it exists
-        field_index = layer.fields().indexOf(qc_field_name)
-        if field_index != -1:
-            layer.dataProvider().deleteAttributes([field_index])
-            layer.updateFields()
-
-        # Create a CASE expression to map ogc_fid to QC status (failed criteria)
-        case_conditions = []
-
-        # Use the already parsed qc_data which contains the failed criteria
-        for fid, status in qc_data.items():
-            # Escape single quotes in the status text for SQL
-            escaped_status = status.replace("'", "''")
-            case_conditions.append(f"WHEN \"ogc_fid\" = {fid} THEN '{escaped_status}'")
-
-        if case_conditions:
-            # Add QC status field showing failed criteria directly
-            case_expression = f"CASE {' '.join(case_conditions)} ELSE 'No QC' END"
-            layer.addExpressionField(
-                case_expression, QgsField(qc_field_name, QVariant.String)
-            )
-
-            QgsMessageLog.logMessage(
-                f"Added QC status field '{qc_field_name}' to layer '{layer.name()}'",
-                "IDPMPlugin",
-                Qgis.Info,
-            )
-
-        # Get unique QC statuses safely
-        unique_statuses = list(set(qc_data.values()))
-        QgsMessageLog.logMessage(
-            f"Highlighted {len(feature_ids)} QC changes on layer '{layer.name()}'.",
-            "IDPMPlugin",
-            Qgis.Info,
-        )
-    else:
-        QgsMessageLog.logMessage(
-            f"No changes found in '{qc_table_name}' for wilker '{wilker_name}'.",
-            "IDPMPlugin",
-            Qgis.Info,
-        )
@@ -0,0 +1,835 @@
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from qgis.core import Qgis, QgsApplication, QgsMessageLog, QgsTask
+from PyQt5.QtCore import QObject, QTimer, QUrl, pyqtSignal
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+from ..config import Config
+
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".part.json"
+
+# Scheduling priorities, lower runs first
+PRIORITY_VISIBLE = 0  # asset currently shown in the list
+PRIORITY_NORMAL = 1
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+\d+-\d+/(\d+)")
+
+# Response headers carrying a base64 digest of the whole object. ETags are
+# not used: SSE-KMS, copied or proxied objects have MD5-like ETags that are
+# not the content MD5
+_CHECKSUM_HEADERS = (
+    (b"x-amz-checksum-sha256", "sha256", 32),
+    (b"Content-MD5", "md5", 16),
+)
+
+# Errors worth retrying: connection/proxy level failures and 5xx responses
+_TRANSIENT_ERRORS = {
+    QNetworkReply.ConnectionRefusedError,
+    QNetworkReply.RemoteHostClosedError,
+    QNetworkReply.HostNotFoundError,
+    QNetworkReply.TimeoutError,
+    QNetworkReply.TemporaryNetworkFailureError,
+    QNetworkReply.NetworkSessionFailedError,
+    QNetworkReply.UnknownNetworkError,
+    QNetworkReply.ProxyConnectionClosedError,
+    QNetworkReply.ProxyTimeoutError,
+    QNetworkReply.InternalServerError,
+    QNetworkReply.ServiceUnavailableError,
+    QNetworkReply.UnknownServerError,
+}
+
+
+class ChecksumTask(QgsTask):
+    """Hashes a finished download in the background."""
+
+    checksumComputed = pyqtSignal(str)
+
+    def __init__(self, file_path: str, algorithm: str):
+        super().__init__(f"Verifying {os.path.basename(file_path)}", QgsTask.CanCancel)
+        self.file_path = file_path
+        self.algorithm = algorithm
+        self.digest = ""
+
+    def run(self) -> bool:
+        hasher = hashlib.new(self.algorithm)
+        size = max(1, os.path.getsize(self.file_path))
+        read = 0
+        with open(self.file_path, "rb") as f:
+            while chunk := f.read(4 * 1024 * 1024):
+                if self.isCanceled():
+                    return False
+                hasher.update(chunk)
+                read += len(chunk)
+                self.setProgress(read * 100 / size)
+        self.digest = hasher.hexdigest()
+        return True
+
+    def finished(self, result: bool):
+        if result:
+            self.checksumComputed.emit(self.digest)
+
+
+class _Segment:
+    """A byte range [start, end] of a download; `done` bytes are on disk."""
+
+    __slots__ = ("start", "end", "done", "attempts")
+
+    def __init__(self, start: int, end: Optional[int], done: int = 0):
+        self.start = start
+        self.end = end  # inclusive; None when the size is unknown
+        self.done = done
+        self.attempts = 0
+
+    @property
+    def length(self) -> Optional[int]:
+        return None if self.end is None else self.end - self.start + 1
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None and self.done >= self.length
+
+
+class DownloadJob(QObject):
+    """
+    A single file download driven by DownloadManager.
+
+    Data is written to `<save_path>.part`, with per-segment progress kept in
+    `<save_path>.part.json` so an interrupted or cancelled download resumes
+    where it stopped. The file is moved to save_path only after its size
+    (and checksum, when one is known) has been verified.
+
+    Exposes isRunning()/abort() like QNetworkReply, so callers can keep
+    treating it as a reply. A paused job still counts as running.
+    """
+
+    progress = pyqtSignal(int, int)  # bytes received, bytes total
+    finished = pyqtSignal(str)  # save_path
+    failed = pyqtSignal(str)  # error message
+    cancelled = pyqtSignal()
+
+    def __init__(
+        self,
+        manager: "DownloadManager",
+        url: str,
+        save_path: str,
+        expected_sha256: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL,
+        group: Optional[str] = None,
+    ):
+        super().__init__(manager)
+        self.manager = manager
+        self.url = url
+        self.host = QUrl(url).host()
+        self.priority = priority
+        self.group = group or save_path
+        self.paused = False
+        self._parked: List["_Segment"] = []
+        self.save_path = save_path
+        self.part_path = save_path + PART_SUFFIX
+        self.state_path = save_path + STATE_SUFFIX
+        self.expected_sha256 = expected_sha256
+        self.size: Optional[int] = None
+        self.etag = ""
+        self.checksum: Optional[Tuple[str, str]] = None  # (algorithm, hex digest)
+        self.partial_kept = True  # False once unverifiable data was discarded
+        self.supports_ranges = False
+        self.segments: List[_Segment] = []
+        self._running = False
+        self._file = None
+        self._last_state_save = 0.0
+        self._checksum_task: Optional[ChecksumTask] = None
+
+    # --- QNetworkReply-like API ---
+
+    def isRunning(self) -> bool:
+        return self._running
+
+    def abort(self) -> None:
+        """Cancels the download, keeping the .part file for a later resume."""
+        if not self._running:
+            return
+        self._running = False
+        self.manager._cancel_job(self)
+        if self._checksum_task is not None:
+            self._checksum_task.cancel()
+        self._save_state(force=True)
+        self._close_file()
+        self.manager._job_done(self)
+        QgsMessageLog.logMessage(
+            f"Download of {os.path.basename(self.save_path)} paused at "
+            f"{self.bytes_received()} bytes",
+            "IDPMPlugin",
+            Qgis.Info,
+        )
+        self.cancelled.emit()
+
+    def pause(self) -> None:
+        self.manager.pause_job(self)
+
+    def resume(self) -> None:
+        self.manager.resume_job(self)
+
+    # --- Progress ---
+
+    def bytes_received(self) -> int:
+        return sum(seg.done for seg in self.segments)
+
+    def _emit_progress(self) -> None:
+        self.progress.emit(self.bytes_received(), self.size or -1)
+
+    # --- Lifecycle, driven by the manager ---
+
+    def _start(self) -> None:
+        self._running = True
+        os.makedirs(os.path.dirname(self.save_path), exist_ok=True)
+
+    def _on_probed(
+        self,
+        size: Optional[int],
+        supports_ranges: bool,
+        etag: str,
+        checksum: Optional[Tuple[str, str]] = None,
+    ) -> None:
+        self.size = size
+        self.supports_ranges = supports_ranges and bool(size)
+        self.etag = etag
+        self.checksum = checksum
+        self.segments = self._load_state() or self._plan_segments()
+        try:
+            self._open_file()
+        except OSError as e:
+            self._fail(f"Cannot write {self.part_path}: {e}")
+            return
+        self._save_state(force=True)
+        self._emit_progress()
+        pending = [seg for seg in self.segments if not seg.complete]
+        if not pending:
+            self._verify()
+            return
+        for seg in pending:
+            self.manager._queue_segment(self, seg)
+
+    def _plan_segments(self) -> List[_Segment]:
+        if not self.supports_ranges:
+            return [_Segment(0, None if self.size is None else self.size - 1)]
+        count = max(
+            1,
+            min(
+                self.manager.segments_per_file,
+                self.size // max(1, self.manager.min_segment_size),
+            ),
+        )
+        step = -(-self.size // count)
+        return [
+            _Segment(start, min(start + step, self.size) - 1)
+            for start in range(0, self.size, step)
+        ]
+
+    def _load_state(self) -> Optional[List[_Segment]]:
+        """Restores segment progress if the .part file belongs to the same remote file."""
+        if not self.supports_ranges or not os.path.exists(self.part_path):
+            return None
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            state.get("url") != self.url
+            or state.get("size") != self.size
+            or state.get("etag", "") != self.etag
+        ):
+            return None
+        segments = [_Segment(*seg) for seg in state.get("segments", [])]
+        if segments:
+            QgsMessageLog.logMessage(
+                f"Resuming {os.path.basename(self.save_path)} from "
+                f"{sum(s.done for s in segments)} of {self.size} bytes",
+                "IDPMPlugin",
+                Qgis.Info,
+            )
+        return segments or None
+
+    def _save_state(self, force: bool = False) -> None:
+        if not self.supports_ranges or not self.segments:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_state_save < 1.0:
+            return
+        self._last_state_save = now
+        if self._file is not None:
+            self._file.flush()
+        state = {
+            "url": self.url,
+            "size": self.size,
+            "etag": self.etag,
+            "segments": [[s.start, s.end, s.done] for s in self.segments],
+        }
+        try:
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+        except OSError:
+            pass
+
+    def _open_file(self) -> None:
+        resuming = self.supports_ranges and os.path.exists(self.part_path)
+        self._file = open(self.part_path, "r+b" if resuming else "wb")
+        if self.size is not None and self.supports_ranges:
+            self._file.truncate(self.size)
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, seg: _Segment, data: bytes) -> None:
+        self._file.seek(seg.start + seg.done)
+        self._file.write(data)
+        seg.done += len(data)
+        self._save_state()
+        self._emit_progress()
+
+    def _restart_without_ranges(self) -> None:
+        """The server ignored a Range request: fall back to one plain stream."""
+        self.manager._cancel_job(self)
+        self._close_file()
+        self.supports_ranges = False
+        for path in (self.part_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.segments = self._plan_segments()
+        self._open_file()
+        self.manager._queue_segment(self, self.segments[0])
+
+    def _segment_finished(self, seg: _Segment) -> None:
+        if seg.end is None:
+            # Unknown size: the stream ending cleanly defines the size
+            seg.end = seg.start + seg.done - 1
+            self.size = seg.done
+        if all(s.complete for s in self.segments):
+            self._save_state(force=True)
+            self._verify()
+
+    def _verify(self) -> None:
+        self._close_file()
+        actual_size = os.path.getsize(self.part_path)
+        if self.size is not None and actual_size != self.size:
+            self._discard_partial()
+            self._fail(f"Size mismatch: expected {self.size} bytes, got {actual_size}")
+            return
+
+        algorithm, expected = None, None
+        if self.expected_sha256:
+            algorithm, expected = "sha256", self.expected_sha256.lower()
+        elif self.checksum is not None:
+            algorithm, expected = self.checksum
+
+        if algorithm is None:
+            self._complete()
+            return
+
+        task = ChecksumTask(self.part_path, algorithm)
+        task.checksumComputed.connect(
+            lambda digest: self._on_checksum(digest, expected, algorithm)
+        )
+        task.taskTerminated.connect(
+            lambda: self._running and self._fail("Checksum verification failed")
+        )
+        self._checksum_task = task
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_checksum(self, digest: str, expected: str, algorithm: str) -> None:
+        self._checksum_task = None
+        if not self._running:
+            return
+        if digest != expected:
+            self._discard_partial()
+            self._fail(f"{algorithm.upper()} checksum mismatch for {self.url}")
+            return
+        self._complete()
+
+    def _complete(self) -> None:
+        os.replace(self.part_path, self.save_path)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        self._running = False
+        self.manager._job_done(self)
+        self.finished.emit(self.save_path)
+
+    def _discard_partial(self) -> None:
+        self._close_file()
+        self.partial_kept = False
+        for path in (self.part_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _fail(self, message: str) -> None:
+        if not self._running:
+            return
+        self._running = False
+        self.manager._cancel_job(self)
+        self._save_state(force=True)
+        self._close_file()
+        self.manager._job_done(self)
+        QgsMessageLog.logMessage(message, "IDPMPlugin", Qgis.Warning)
+        self.failed.emit(message)
+
+
+class DownloadManager(QObject):
+    """
+    Segmented, resumable HTTP downloads with a global scheduler.
+
+    Each file is probed with a one-byte Range request; if the server supports
+    ranges, the file is split into up to `segments_per_file` ranges fetched
+    over parallel connections. All segments of all jobs share one pool of
+    `max_connections` connections, at most `max_per_host` per host, and an
+    optional bandwidth cap enforced with a token bucket (replies get a
+    bounded read buffer, so throttling propagates back to TCP).
+
+    Queued segments are started by priority, then by the fewest active
+    connections of their group (one group per operation, so concurrent
+    operations share the pool fairly), then in arrival order. Jobs can be
+    paused individually or all at once; ranged segments resume from the
+    bytes already written.
+    """
+
+    READ_BUFFER_SIZE = 256 * 1024
+    THROTTLE_INTERVAL_MS = 100
+    METRICS_INTERVAL_MS = 1000
+
+    # bytes_per_sec, active_connections, queued_segments, jobs, paused
+    metricsUpdated = pyqtSignal(dict)
+
+    def __init__(
+        self,
+        max_connections: int = Config.DOWNLOAD_MAX_CONNECTIONS,
+        segments_per_file: int = Config.DOWNLOAD_SEGMENTS,
+        max_bytes_per_sec: int = Config.DOWNLOAD_MAX_BYTES_PER_SEC,
+        max_retries: int = Config.DOWNLOAD_MAX_RETRIES,
+        min_segment_size: int = Config.DOWNLOAD_MIN_SEGMENT_SIZE,
+        max_per_host: int = Config.DOWNLOAD_MAX_PER_HOST,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self.max_connections = max(1, max_connections)
+        self.segments_per_file = max(1, segments_per_file)
+        self.max_bytes_per_sec = max(0, max_bytes_per_sec)
+        self.max_retries = max(0, max_retries)
+        self.min_segment_size = max(1, min_segment_size)
+        self.max_per_host = max(1, max_per_host)
+        self.network_manager = QNetworkAccessManager(self)
+
+        self._jobs: List[DownloadJob] = []
+        self._pending: List[Tuple[int, DownloadJob, _Segment]] = []
+        self._sequence = 0
+        self._paused = False
+        self._active: Dict[QNetworkReply, Tuple[DownloadJob, _Segment]] = {}
+        self._probes: Dict[QNetworkReply, DownloadJob] = {}
+        self._finishing: set = set()
+
+        self._tokens = float(self.max_bytes_per_sec)
+        self._throttle_timer = QTimer(self)
+        self._throttle_timer.setInterval(self.THROTTLE_INTERVAL_MS)
+        self._throttle_timer.timeout.connect(self._refill_tokens)
+
+        self._bytes_total = 0
+        self._bytes_at_last_sample = 0
+        self._last_sample_time = time.monotonic()
+        self._rate = 0.0
+        self._metrics_timer = QTimer(self)
+        self._metrics_timer.setInterval(self.METRICS_INTERVAL_MS)
+        self._metrics_timer.timeout.connect(self._sample_metrics)
+
+    def download(
+        self,
+        url: str,
+        save_path: str,
+        expected_sha256: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL,
+        group: Optional[str] = None,
+    ) -> DownloadJob:
+        """
+        Starts (or resumes) downloading url to save_path.
+
+        Args:
+            url: Remote file URL
+            save_path: Final local path; data goes to save_path + ".part" until verified
+            expected_sha256: Optional SHA-256 hex digest to verify against
+            priority: PRIORITY_VISIBLE or PRIORITY_NORMAL
+            group: Jobs sharing a group (e.g. one operation's bands) are
+                scheduled fairly against other groups
+
+        Returns:
+            The DownloadJob; connect to its progress/finished/failed/cancelled signals.
+        """
+        job = DownloadJob(self, url, save_path, expected_sha256, priority, group)
+        self._jobs.append(job)
+        job._start()
+        self._probe(job)
+        if not self._metrics_timer.isActive():
+            self._last_sample_time = time.monotonic()
+            self._bytes_at_last_sample = self._bytes_total
+            self._metrics_timer.start()
+        return job
+
+    def active_jobs(self) -> List[DownloadJob]:
+        return [job for job in self._jobs if job.isRunning()]
+
+    def is_paused(self) -> bool:
+        return self._paused
+
+    def set_group_priority(self, group: str, priority: int) -> None:
+        """Re-prioritizes the queued segments of a group (running ones are not preempted)."""
+        for job in self._jobs:
+            if job.group == group:
+                job.priority = priority
+        self._pump()
+
+    def pause_all(self) -> None:
+        """Stops all transfers; ranged segments keep their progress."""
+        if self._paused:
+            return
+        self._paused = True
+        for reply, (job, seg) in list(self._active.items()):
+            self._detach_reply(reply)
+            self._reset_unranged(job, seg)
+            self._pending.append((self._next_sequence(), job, seg))
+        self._sample_metrics()
+
+    def resume_all(self) -> None:
+        if not self._paused:
+            return
+        self._paused = False
+        self._pump()
+        self._sample_metrics()
+
+    def pause_job(self, job: DownloadJob) -> None:
+        if job.paused or not job.isRunning():
+            return
+        job.paused = True
+        job._parked.extend(seg for _seq, j, seg in self._pending if j is job)
+        self._pending = [entry for entry in self._pending if entry[1] is not job]
+        for reply, (active_job, seg) in list(self._active.items()):
+            if active_job is job:
+                self._detach_reply(reply)
+                self._reset_unranged(job, seg)
+                job._parked.append(seg)
+        job._save_state(force=True)
+        self._pump()
+
+    def resume_job(self, job: DownloadJob) -> None:
+        if not job.paused:
+            return
+        job.paused = False
+        parked, job._parked = job._parked, []
+        for seg in parked:
+            self._queue_segment(job, seg)
+
+    def _detach_reply(self, reply: QNetworkReply) -> None:
+        self._active.pop(reply, None)
+        self._finishing.discard(reply)
+        reply.abort()
+        reply.deleteLater()
+
+    @staticmethod
+    def _reset_unranged(job: DownloadJob, seg: _Segment) -> None:
+        """A stream without range support can only restart from byte zero."""
+        if job.supports_ranges or seg.done == 0:
+            return
+        seg.done = 0
+        if job._file is not None:
+            job._file.seek(0)
+            job._file.truncate(0)
+        job._emit_progress()
+
+    # --- Probing ---
+
+    def _make_request(self, url: str) -> QNetworkRequest:
+        request = QNetworkRequest(QUrl(url))
+        request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+        return request
+
+    def _probe(self, job: DownloadJob) -> None:
+        request = self._make_request(job.url)
+        request.setRawHeader(b"Range", b"bytes=0-0")
+        # Asks S3 for the object's stored checksum; other servers ignore it
+        request.setRawHeader(b"x-amz-checksum-mode", b"ENABLED")
+        reply = self.network_manager.get(request)
+        self._probes[reply] = job
+        reply.metaDataChanged.connect(lambda r=reply: self._on_probe_headers(r))
+        reply.finished.connect(lambda r=reply: self._on_probe_finished(r))
+
+    def _on_probe_headers(self, reply: QNetworkReply) -> None:
+        job = self._probes.pop(reply, None)
+        if job is None:
+            return
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        if status is None or (status >= 300 and status < 400):
+            self._probes[reply] = job  # wait for the redirect target
+            return
+        etag = bytes(reply.rawHeader(b"ETag")).decode("utf-8", "ignore")
+        checksum = self._object_checksum(reply, full_body=status == 200)
+        size = None
+        supports_ranges = False
+        if status == 206:
+            content_range = bytes(reply.rawHeader(b"Content-Range")).decode()
+            match = _CONTENT_RANGE_RE.search(content_range)
+            if match:
+                size = int(match.group(1))
+                supports_ranges = True
+        elif status == 200:
+            length = reply.header(QNetworkRequest.ContentLengthHeader)
+            size = int(length) if length is not None else None
+        else:
+            reply.abort()
+            job._fail(f"Download failed for {job.url}: HTTP {status}")
+            return
+        reply.abort()
+        if job.isRunning():
+            job._on_probed(size, supports_ranges, etag, checksum)
+
+    @staticmethod
+    def _object_checksum(
+        reply: QNetworkReply, full_body: bool
+    ) -> Optional[Tuple[str, str]]:
+        """
+        (algorithm, hex digest) of the whole object from an explicit checksum
+        header, or None. Content-MD5 describes the response body, so it is
+        only used when the body is the whole object.
+        """
+        for header, algorithm, digest_size in _CHECKSUM_HEADERS:
+            if algorithm == "md5" and not full_body:
+                continue
+            value = bytes(reply.rawHeader(header)).decode("ascii", "ignore").strip()
+            if not value:
+                continue
+            try:
+                digest = base64.b64decode(value, validate=True)
+            except (binascii.Error, ValueError):
+                continue  # e.g. multipart composite checksums ("...-3")
+            if len(digest) == digest_size:
+                return algorithm, digest.hex()
+        return None
+
+    def _on_probe_finished(self, reply: QNetworkReply) -> None:
+        job = self._probes.pop(reply, None)
+        reply.deleteLater()
+        if job is None:
+            return  # headers were already handled
+        job._fail(f"Download failed for {job.url}: {reply.errorString()}")
+
+    # --- Segment scheduling ---
+
+    def _next_sequence(self) -> int:
+        self._sequence += 1
+        return self._sequence
+
+    def _queue_segment(self, job: DownloadJob, seg: _Segment) -> None:
+        if not job.isRunning():
+            return
+        if job.paused:
+            job._parked.append(seg)
+            return
+        self._pending.append((self._next_sequence(), job, seg))
+        self._pump()
+
+    def _pump(self) -> None:
+        if self._paused:
+            return
+        while self._pending and len(self._active) < self.max_connections:
+            entry = self._next_entry()
+            if entry is None:
+                return  # every queued segment waits on a busy host
+            self._pending.remove(entry)
+            _seq, job, seg = entry
+            if job.isRunning() and not job.paused and not seg.complete:
+                self._start_segment(job, seg)
+
+    def _next_entry(self) -> Optional[Tuple[int, DownloadJob, _Segment]]:
+        host_load = Counter(job.host for job, _seg in self._active.values())
+        group_load = Counter(job.group for job, _seg in self._active.values())
+        best = None
+        best_key = None
+        for entry in self._pending:
+            seq, job, _seg = entry
+            if host_load[job.host] >= self.max_per_host:
+                continue
+            key = (job.priority, group_load[job.group], seq)
+            if best_key is None or key < best_key:
+                best, best_key = entry, key
+        return best
+
+    def _start_segment(self, job: DownloadJob, seg: _Segment) -> None:
+        request = self._make_request(job.url)
+        if job.supports_ranges:
+            range_header = f"bytes={seg.start + seg.done}-{seg.end}"
+            request.setRawHeader(b"Range", range_header.encode())
+        reply = self.network_manager.get(request)
+        if self.max_bytes_per_sec > 0:
+            reply.setReadBufferSize(self.READ_BUFFER_SIZE)
+            if not self._throttle_timer.isActive():
+                self._throttle_timer.start()
+        self._active[reply] = (job, seg)
+        reply.metaDataChanged.connect(lambda r=reply: self._on_segment_headers(r))
+        reply.readyRead.connect(lambda r=reply: self._read(r))
+        reply.finished.connect(lambda r=reply: self._on_segment_finished(r))
+
+    def _on_segment_headers(self, reply: QNetworkReply) -> None:
+        entry = self._active.get(reply)
+        if entry is None:
+            return
+        job, seg = entry
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        if job.supports_ranges and status == 200:
+            QgsMessageLog.logMessage(
+                f"Server ignored Range request for {job.url}; downloading in one stream",
+                "IDPMPlugin",
+                Qgis.Warning,
+            )
+            job._restart_without_ranges()
+
+    def _read(self, reply: QNetworkReply) -> None:
+        entry = self._active.get(reply)
+        if entry is None:
+            return
+        job, seg = entry
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        if status is not None and status >= 300:
+            return  # redirect or error body
+        available = reply.bytesAvailable()
+        if self.max_bytes_per_sec > 0:
+            available = min(available, int(self._tokens))
+            if available <= 0:
+                return
+            self._tokens -= available
+        if seg.length is not None:
+            available = min(available, seg.length - seg.done)
+        data = bytes(reply.read(available))
+        if data:
+            self._bytes_total += len(data)
+            job._write(seg, data)
+        if seg.length is not None and seg.complete and reply.bytesAvailable() > 0:
+            # The server sent more than the requested range. The segment is
+            # full, so drop the excess instead of waiting to read it
+            excess = len(bytes(reply.readAll()))
+            QgsMessageLog.logMessage(
+                f"Discarded {excess} bytes beyond the requested range of {job.url}",
+                "IDPMPlugin",
+                Qgis.Warning,
+            )
+        if reply in self._finishing and reply.bytesAvailable() == 0:
+            self._finishing.discard(reply)
+            self._complete_segment(reply)
+
+    def _refill_tokens(self) -> None:
+        rate = self.max_bytes_per_sec
+        self._tokens = min(
+            float(rate), self._tokens + rate * self.THROTTLE_INTERVAL_MS / 1000.0
+        )
+        for reply in list(self._active):
+            if reply.bytesAvailable() > 0:
+                self._read(reply)
+        if not self._active:
+            self._throttle_timer.stop()
+
+    def _on_segment_finished(self, reply: QNetworkReply) -> None:
+        if reply not in self._active:
+            reply.deleteLater()
+            return
+        if reply.error() == QNetworkReply.NoError and reply.bytesAvailable() > 0:
+            self._read(reply)
+            if reply.bytesAvailable() > 0:
+                # Throttled: drained by the token timer, then completed
+                self._finishing.add(reply)
+                return
+        self._complete_segment(reply)
+
+    def _complete_segment(self, reply: QNetworkReply) -> None:
+        job, seg = self._active.pop(reply)
+        error = reply.error()
+        error_string = reply.errorString()
+        reply.deleteLater()
+
+        if error == QNetworkReply.OperationCanceledError or not job.isRunning():
+            self._pump()
+            return
+
+        truncated = (
+            error == QNetworkReply.NoError
+            and seg.length is not None
+            and not seg.complete
+        )
+        if error == QNetworkReply.NoError and not truncated:
+            job._segment_finished(seg)
+        elif (truncated or error in _TRANSIENT_ERRORS) and job.supports_ranges and (
+            seg.attempts < self.max_retries
+        ):
+            seg.attempts += 1
+            delay_ms = 1000 * (2 ** (seg.attempts - 1))
+            QgsMessageLog.logMessage(
+                f"Retrying {os.path.basename(job.save_path)} bytes "
+                f"{seg.start + seg.done}-{seg.end} in {delay_ms} ms "
+                f"(attempt {seg.attempts}/{self.max_retries}): "
+                f"{'connection closed early' if truncated else error_string}",
+                "IDPMPlugin",
+                Qgis.Info,
+            )
+            QTimer.singleShot(delay_ms, lambda: self._queue_segment(job, seg))
+        else:
+            job._fail(f"Download failed for {job.url}: {error_string}")
+        self._pump()
+
+    # --- Job bookkeeping ---
+
+    def _cancel_job(self, job: DownloadJob) -> None:
+        job._parked = []
+        self._pending = [entry for entry in self._pending if entry[1] is not job]
+        for reply, probe_job in list(self._probes.items()):
+            if probe_job is job:
+                del self._probes[reply]
+                reply.abort()
+        for reply, (active_job, _seg) in list(self._active.items()):
+            if active_job is job:
+                self._active.pop(reply)
+                self._finishing.discard(reply)
+                reply.abort()
+                reply.deleteLater()
+        self._pump()
+
+    def _job_done(self, job: DownloadJob) -> None:
+        if job in self._jobs:
+            self._jobs.remove(job)
+
+    # --- Metrics ---
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "bytes_per_sec": self._rate,
+            "active_connections": len(self._active),
+            "queued_segments": len(self._pending)
+            + sum(len(job._parked) for job in self._jobs),
+            "jobs": len(self._jobs),
+            "paused": self._paused,
+        }
+
+    def _sample_metrics(self) -> None:
+        now = time.monotonic()
+        elapsed = max(1e-3, now - self._last_sample_time)
+        instant = (self._bytes_total - self._bytes_at_last_sample) / elapsed
+        # Exponential smoothing keeps the displayed rate from jumping around
+        self._rate = instant if self._rate == 0 else 0.5 * self._rate + 0.5 * instant
+        self._bytes_at_last_sample = self._bytes_total
+        self._last_sample_time = now
+        if not self._jobs:
+            self._rate = 0.0
+            self._metrics_timer.stop()
+        self.metricsUpdated.emit(self.stats())
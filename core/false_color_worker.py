@@ -4,6 +4,8 @@ from osgeo import gdal
 from qgis.core import Qgis, QgsMessageLog, QgsTask
 from PyQt5.QtCore import pyqtSignal
 
+from .cog_ingest import finalize_product
+
 
 class FalseColorTask(QgsTask):
     """
@@ -83,6 +85,9 @@ class FalseColorTask(QgsTask):
             fc_ds.SetGeoTransform(red_ds.GetGeoTransform())
             fc_ds.FlushCache()
             fc_ds = None
+            self.setProgress(80)
+
+            finalize_product(self.false_color_path)
             self.setProgress(90)
 
             return True
@@ -20,6 +20,7 @@ from .database import (
     get_qc_table_name,
     check_changes,
 )
+from .qc_sync import QcSyncController
 from ..core.util import get_or_create_plugin_layer_group
 
 
@@ -46,6 +47,7 @@ class LayerLoaderTask(QgsTask):
         self.year = year
         self.exception = None
         self.layer = None
+        self.qc_sync = None
 
     def _fetch_province(self) -> tuple[str, int]:
         """
@@ -462,11 +464,14 @@ class LayerLoaderTask(QgsTask):
             if plugin_group:
                 plugin_group.insertLayer(0, self.layer)
 
-            self.layer.afterCommitChanges.connect(
-                lambda: check_changes(
-                    self.wilker_name, self.layer, self.layer_type, self.year
-                )
+            # Keep QC highlighting current: after local commits, on PostgreSQL
+            # NOTIFY and (optionally) on a polling interval.
+            self.qc_sync = QcSyncController(
+                self.wilker_name, self.layer, self.layer_type, self.year
             )
+            self.layer.afterCommitChanges.connect(self.qc_sync.sync)
+            self.qc_sync.listen()
+            self.qc_sync.start_polling(Config.QC_SYNC_INTERVAL_MS)
             self.layerLoaded.emit(self.layer)
         else:
             if self.exception:
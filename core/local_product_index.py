@@ -0,0 +1,173 @@
+import os
+from typing import Dict, Optional, Set
+
+from qgis.core import Qgis, QgsMessageLog
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+# Directory change notifications are coalesced, since a download in progress
+# touches its folder many times per second.
+RESCAN_DELAY_MS = 250
+
+# In-progress downloads and conversions; they are not products and would
+# otherwise change the listing on every write.
+TRANSIENT_SUFFIXES = (".part", ".part.json", ".tmp", ".tiled")
+
+
+class LocalProductIndex(QObject):
+    """
+    In-memory index of the files in the product and AOI cache folders.
+
+    Each folder is listed once with os.scandir and then kept current by a
+    QFileSystemWatcher and by notify_written()/notify_removed() calls from
+    the download and processing pipeline. Lookups never touch the disk, so
+    refreshing the image list costs no filesystem syscalls. A folder that is
+    missing from its already-listed parent is known to be empty without
+    being probed.
+    """
+
+    # Basename of the changed folder, i.e. the stac_id for per-asset folders
+    productsChanged = pyqtSignal(str)
+
+    _instance: Optional["LocalProductIndex"] = None
+
+    @classmethod
+    def instance(cls) -> "LocalProductIndex":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._files: Dict[str, Dict[str, int]] = {}  # folder -> {name: size}
+        self._subdirs: Dict[str, Set[str]] = {}
+        self._scanned: Set[str] = set()  # folders that were actually listed
+        self._pending: Set[str] = set()
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(RESCAN_DELAY_MS)
+        self._rescan_timer.timeout.connect(self._rescan_pending)
+
+    def file_size(self, path: str) -> int:
+        """Size of the file at path as last seen, or 0 if it does not exist."""
+        if not path:
+            return 0
+        folder, name = os.path.split(os.path.normpath(path))
+        return self._entries(folder).get(name, 0)
+
+    def exists(self, path: str) -> bool:
+        """True if a non-empty file exists at path."""
+        return self.file_size(path) > 0
+
+    def files(self, folder: str) -> Dict[str, int]:
+        """Non-empty files directly in folder, by name."""
+        return {
+            name: size for name, size in self._entries(folder).items() if size > 0
+        }
+
+    def notify_written(self, path: str) -> None:
+        """Records a file the pipeline has just finished writing."""
+        folder, name = os.path.split(os.path.normpath(path))
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        entries = self._entries(folder)
+        if entries.get(name) != size:
+            entries[name] = size
+            self.productsChanged.emit(os.path.basename(folder))
+
+    def notify_removed(self, path: str) -> None:
+        """Records a file the pipeline has deleted."""
+        folder, name = os.path.split(os.path.normpath(path))
+        entries = self._files.get(folder)
+        if entries is not None and entries.pop(name, None) is not None:
+            self.productsChanged.emit(os.path.basename(folder))
+
+    def refresh(self, folder: str) -> None:
+        """Lists folder again, e.g. after a bulk cleanup."""
+        folder = os.path.normpath(folder)
+        if folder in self._files:
+            self._rescan(folder)
+
+    def invalidate(self) -> None:
+        """Forgets everything; folders are listed again on next access."""
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._files.clear()
+        self._subdirs.clear()
+        self._scanned.clear()
+        self._pending.clear()
+
+    def _entries(self, folder: str) -> Dict[str, int]:
+        folder = os.path.normpath(folder)
+        entries = self._files.get(folder)
+        if entries is not None:
+            return entries
+        parent, name = os.path.split(folder)
+        if parent and parent != folder:
+            if parent not in self._files:
+                self._scan(parent)
+            if parent in self._scanned and name not in self._subdirs.get(parent, ()):
+                # Not created yet; the parent's watcher reports when it is
+                self._files[folder] = {}
+                return self._files[folder]
+        self._scan(folder)
+        return self._files[folder]
+
+    def _scan(self, folder: str) -> None:
+        files: Dict[str, int] = {}
+        subdirs: Set[str] = set()
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            subdirs.add(entry.name)
+                        elif entry.is_file() and not entry.name.endswith(
+                            TRANSIENT_SUFFIXES
+                        ):
+                            files[entry.name] = entry.stat().st_size
+                    except OSError:
+                        continue
+        except FileNotFoundError:
+            self._scanned.discard(folder)
+        except OSError as e:
+            self._scanned.discard(folder)
+            QgsMessageLog.logMessage(
+                f"Could not list {folder}: {e}", "IDPMPlugin", Qgis.Warning
+            )
+        else:
+            self._scanned.add(folder)
+            if folder not in self._watcher.directories():
+                self._watcher.addPath(folder)
+        self._files[folder] = files
+        self._subdirs[folder] = subdirs
+
+    def _on_directory_changed(self, folder: str) -> None:
+        self._pending.add(os.path.normpath(folder))
+        self._rescan_timer.start()
+
+    def _rescan_pending(self) -> None:
+        pending, self._pending = self._pending, set()
+        for folder in pending:
+            self._rescan(folder)
+
+    def _rescan(self, folder: str) -> None:
+        old_files = self._files.get(folder, {})
+        old_subdirs = self._subdirs.get(folder, set())
+        self._scan(folder)
+        if self._files[folder] != old_files:
+            self.productsChanged.emit(os.path.basename(folder))
+        for name in self._subdirs[folder] ^ old_subdirs:
+            # Folders created or removed since the last listing
+            child = os.path.join(folder, name)
+            if child in self._files:
+                if child in self._scanned:
+                    self._rescan(child)
+                else:
+                    self._files.pop(child, None)
+                    self.productsChanged.emit(name)
@@ -87,7 +87,14 @@ class IDPMPlugin:
         self.action.triggered.connect(self.run)
         self.iface.addToolBarIcon(self.action)
 
+        from .qc_sync import register_qc_expression_function
+
+        register_qc_expression_function()
+
     def unload(self) -> None:
+        from .qc_sync import unregister_qc_expression_function
+
+        unregister_qc_expression_function()
         self.iface.removeToolBarIcon(self.action)
         del self.action
         if self._menu_dialog_instance and self._menu_dialog_instance.isVisible():
@@ -0,0 +1,290 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsGeometry,
+    QgsMessageLog,
+    QgsProject,
+    QgsRectangle,
+)
+
+from ..config import Config
+from .asset_model import RasterAsset
+from .band_alignment import TargetGrid
+from .catalog_index import CatalogIndex, footprint_to_geometry
+from .cog_aio_loader import AoiBand, AoiTooLargeForMemory, CogReadCancelled
+
+try:
+    import rasterio
+    from rasterio.crs import CRS
+    from rasterio.enums import Resampling
+    from rasterio.vrt import WarpedVRT
+
+    RASTERIO_AVAILABLE = True
+except ImportError:
+    RASTERIO_AVAILABLE = False
+
+
+def tile_band_urls(asset: RasterAsset, band_names: Sequence[str]) -> Dict[str, str]:
+    """Band name -> COG URL of an asset, for bands such as "nir" or "scl"."""
+    urls = {}
+    for band in band_names:
+        url = getattr(asset, f"{band}_url", None)
+        if url:
+            urls[band] = url
+    return urls
+
+
+def select_mosaic_tiles(
+    catalog_index: CatalogIndex,
+    asset: RasterAsset,
+    aoi_rect: QgsRectangle,
+    aoi_crs: QgsCoordinateReferenceSystem,
+) -> List[RasterAsset]:
+    """
+    Tiles needed to cover an AOI: the given asset plus the other assets of
+    the catalog captured the same day (the same satellite pass over the
+    neighbouring MGRS tiles) whose footprint intersects the AOI.
+
+    Returns:
+        The asset first, then the other tiles by increasing cloud cover;
+        just [asset] if its footprint already contains the AOI
+    """
+    aoi_geom = QgsGeometry.fromRect(aoi_rect)
+    wgs84 = QgsCoordinateReferenceSystem("EPSG:4326")
+    if aoi_crs.isValid() and aoi_crs != wgs84:
+        aoi_geom.transform(QgsCoordinateTransform(aoi_crs, wgs84, QgsProject.instance()))
+
+    footprint = footprint_to_geometry(asset)
+    if asset.capture_date is None or (
+        footprint is not None and footprint.contains(aoi_geom)
+    ):
+        return [asset]
+
+    capture_day = asset.capture_date.date()
+    neighbours = [
+        other
+        for other in catalog_index.query(
+            aoi_geom=aoi_geom, date_from=capture_day, date_to=capture_day
+        )
+        if other.stac_id != asset.stac_id
+    ]
+    neighbours.sort(key=lambda other: other.cloud_cover)
+    return [asset] + neighbours
+
+
+class MosaicReader:
+    """
+    Reads an AOI that spans several tiles into one in-memory mosaic per band.
+
+    All tiles are warped onto a single grid: the first tile's CRS and pixel
+    grid, extended over the whole AOI. Every tile is read in parallel through
+    a GDAL warped VRT over its COG, so only the blocks under the AOI are
+    fetched, and tiles in another UTM zone are reprojected on the fly. Tiles
+    are blended in priority order: each pixel comes from the first tile that
+    has data for every band and, when the tile has an SCL band and
+    Config.CLOUD_MASK_ENABLED is set, is not cloudy there. Pixels cloudy in
+    every tile are left as nodata, so the mosaic is already cloud-masked.
+    """
+
+    def __init__(self, cog_loader, max_workers: int = Config.MOSAIC_WORKERS):
+        """
+        Args:
+            cog_loader: CogAoiLoader whose GDAL options apply to the reads
+            max_workers: Tiles read concurrently
+        """
+        if not RASTERIO_AVAILABLE:
+            raise ImportError("rasterio is required for mosaicking")
+        self.cog_loader = cog_loader
+        self.max_workers = max(1, max_workers)
+
+    def _grid(
+        self,
+        reference_url: str,
+        aoi_rect: QgsRectangle,
+        aoi_crs: QgsCoordinateReferenceSystem,
+    ) -> TargetGrid:
+        """The reference band's pixel grid, snapped outwards over the AOI."""
+        with rasterio.Env(**self.cog_loader.gdal_options), rasterio.open(
+            reference_url
+        ) as src:
+            crs_wkt = src.crs.to_wkt()
+            x0, y0 = src.transform.c, src.transform.f
+            res_x, res_y = abs(src.transform.a), abs(src.transform.e)
+
+        rect = QgsRectangle(aoi_rect)
+        target_crs = QgsCoordinateReferenceSystem.fromWkt(crs_wkt)
+        if aoi_crs != target_crs:
+            transform = QgsCoordinateTransform(aoi_crs, target_crs, QgsProject.instance())
+            rect = transform.transformBoundingBox(rect)
+
+        return TargetGrid(
+            xmin=x0 + math.floor((rect.xMinimum() - x0) / res_x) * res_x,
+            xmax=x0 + math.ceil((rect.xMaximum() - x0) / res_x) * res_x,
+            ymax=y0 - math.floor((y0 - rect.yMaximum()) / res_y) * res_y,
+            ymin=y0 - math.ceil((y0 - rect.yMinimum()) / res_y) * res_y,
+            res_x=res_x,
+            res_y=res_y,
+            crs_wkt=crs_wkt,
+        )
+
+    def _read_tile(
+        self,
+        band_urls: Dict[str, str],
+        band_names: Sequence[str],
+        grid: TargetGrid,
+        is_canceled: Optional[Callable[[], bool]],
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        One tile's bands (and SCL, if any) on the mosaic grid; None if the
+        tile cannot be read. Runs on a worker thread with its own datasets.
+        """
+        transform = rasterio.Affine(
+            grid.res_x, 0.0, grid.xmin, 0.0, -grid.res_y, grid.ymax
+        )
+        bands = {}
+        try:
+            with rasterio.Env(**self.cog_loader.gdal_options):
+                for band in band_names:
+                    if is_canceled is not None and is_canceled():
+                        raise CogReadCancelled()
+                    with rasterio.open(band_urls[band]) as src:
+                        same_crs = src.crs.to_wkt() == grid.crs_wkt
+                        with WarpedVRT(
+                            src,
+                            crs=grid.crs_wkt,
+                            transform=transform,
+                            width=grid.width,
+                            height=grid.height,
+                            nodata=src.nodata if src.nodata is not None else 0,
+                            resampling=Resampling.nearest
+                            if band == "scl" or same_crs
+                            else Resampling[Config.BAND_RESAMPLING],
+                        ) as vrt:
+                            bands[band] = vrt.read(1)
+                            bands[f"{band}_nodata"] = vrt.nodata
+            return bands
+
+        except CogReadCancelled:
+            return None
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"Mosaic: skipped tile {band_urls.get(band_names[0])}: {str(e)}",
+                "COGLoader",
+                Qgis.Warning,
+            )
+            return None
+
+    def read_bands(
+        self,
+        tiles: Sequence[Dict[str, str]],
+        band_names: Sequence[str],
+        aoi_rect: QgsRectangle,
+        aoi_crs: QgsCoordinateReferenceSystem,
+        is_canceled: Optional[Callable[[], bool]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Dict[str, AoiBand]:
+        """
+        Mosaic of the AOI for each band.
+
+        Args:
+            tiles: Band name -> URL or path, one dict per tile, in priority
+                order; an "scl" entry enables cloud-aware blending
+            band_names: Bands to mosaic, e.g. ("nir", "red")
+            aoi_rect: Area of Interest rectangle
+            aoi_crs: CRS of the AOI rectangle
+            is_canceled: Polled between band reads
+            max_bytes: Largest total of tile arrays to hold in memory
+
+        Returns:
+            Band name -> (data, profile) on the common grid; empty if no tile
+            could be read or the read was cancelled
+
+        Raises:
+            AoiTooLargeForMemory: if the tiles would not fit in max_bytes
+        """
+        tiles = [urls for urls in tiles if all(band in urls for band in band_names)]
+        if not tiles:
+            return {}
+
+        grid = self._grid(tiles[0][band_names[0]], aoi_rect, aoi_crs)
+        use_scl = Config.CLOUD_MASK_ENABLED
+        read_names = [
+            tuple(band_names) + (("scl",) if use_scl and urls.get("scl") else ())
+            for urls in tiles
+        ]
+
+        # Sentinel-2 L2A bands are 16-bit; budget as float32 to stay safe
+        nbytes = grid.width * grid.height * 4 * sum(len(names) for names in read_names)
+        if max_bytes is not None and nbytes > max_bytes:
+            raise AoiTooLargeForMemory(
+                f"Mosaic of {len(tiles)} tiles needs {nbytes / (1024 * 1024):.1f} MB"
+            )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            tile_arrays = list(
+                executor.map(
+                    lambda args: self._read_tile(*args, grid, is_canceled),
+                    zip(tiles, read_names),
+                )
+            )
+        if is_canceled is not None and is_canceled():
+            return {}
+
+        mosaic: Dict[str, np.ndarray] = {}
+        nodata: Dict[str, float] = {}
+        filled = np.zeros((grid.height, grid.width), dtype=bool)
+        used_tiles = 0
+        for arrays in tile_arrays:
+            if arrays is None:
+                continue
+            if not mosaic:
+                for band in band_names:
+                    nodata[band] = arrays[f"{band}_nodata"]
+                    mosaic[band] = np.full_like(arrays[band], nodata[band])
+
+            valid = ~filled
+            for band in band_names:
+                valid &= arrays[band] != arrays[f"{band}_nodata"]
+            if "scl" in arrays:
+                valid &= ~np.isin(arrays["scl"], Config.CLOUD_MASK_SCL_CLASSES)
+            if not valid.any():
+                continue
+
+            for band in band_names:
+                mosaic[band][valid] = arrays[band][valid]
+            filled |= valid
+            used_tiles += 1
+
+        if not mosaic:
+            return {}
+
+        QgsMessageLog.logMessage(
+            f"Mosaic of {used_tiles}/{len(tiles)} tiles, "
+            f"{grid.width}x{grid.height} px, {100.0 * filled.mean():.1f}% filled",
+            "COGLoader",
+            Qgis.Info,
+        )
+
+        profile = {
+            "driver": "GTiff",
+            "count": 1,
+            "width": grid.width,
+            "height": grid.height,
+            "crs": CRS.from_wkt(grid.crs_wkt),
+            "transform": rasterio.Affine(
+                grid.res_x, 0.0, grid.xmin, 0.0, -grid.res_y, grid.ymax
+            ),
+        }
+        return {
+            band: (
+                data[np.newaxis],
+                dict(profile, dtype=str(data.dtype), nodata=nodata[band]),
+            )
+            for band, data in mosaic.items()
+        }
@@ -4,6 +4,8 @@ from osgeo import gdal
 from qgis.core import Qgis, QgsMessageLog, QgsTask
 from PyQt5.QtCore import pyqtSignal
 
+from .cog_ingest import finalize_product
+
 
 class NdviTask(QgsTask):
     """
@@ -59,6 +61,10 @@ class NdviTask(QgsTask):
             ndvi_ds.SetProjection(red_ds.GetProjection())
             ndvi_ds.SetGeoTransform(red_ds.GetGeoTransform())
             ndvi_ds.FlushCache()
+            ndvi_ds = None
+            self.setProgress(80)
+
+            finalize_product(self.ndvi_path)
             self.setProgress(90)
 
             return True
@@ -0,0 +1,516 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from qgis.core import (
+    Qgis,
+    QgsApplication,
+    QgsExpression,
+    QgsFeatureRequest,
+    QgsField,
+    QgsFields,
+    QgsMessageLog,
+    QgsProject,
+    QgsTask,
+    QgsVectorLayer,
+    qgsfunction,
+)
+from PyQt5.QtCore import QObject, QTimer, QVariant, pyqtSignal
+
+from .database import create_db_uri, get_qc_table_name
+
+QC_STATUS_FIELD = "qc_status"
+QC_NO_STATUS = "No QC"
+QC_EXPRESSION_FUNCTION = "idpm_qc_status"
+
+# Columns checked (in order) for a change timestamp on the QC tables.
+# Tables without any of them are synced on ogc_fid alone.
+QC_TIMESTAMP_FIELDS = ("updated_at", "modified_at", "created_at", "qc_date")
+
+
+class QcStatusIndex:
+    """
+    In-memory QC status of every feature in one `{type}_{year}_qc` table,
+    together with the high-water marks (ogc_fid / timestamp) of the last sync.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.statuses: Dict[int, str] = {}
+        self.last_fid: Optional[int] = None
+        self.last_timestamp: Optional[str] = None
+        self.timestamp_field: Optional[str] = None
+        # True once a sync completed, even if the QC table was empty
+        self.synced = False
+        # Bumped by reset(), so rows fetched before a reset can be discarded
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def merge(self, rows: List[Tuple[int, str, Optional[str]]]) -> List[int]:
+        """
+        Merges fetched QC rows into the index.
+
+        Args:
+            rows: (ogc_fid, status, timestamp) tuples
+
+        Returns:
+            The ogc_fids whose status is new or changed.
+        """
+        changed = []
+        with self._lock:
+            for fid, status, timestamp in rows:
+                if self.statuses.get(fid) != status:
+                    changed.append(fid)
+                self.statuses[fid] = status
+                if self.last_fid is None or fid > self.last_fid:
+                    self.last_fid = fid
+                if timestamp and (
+                    self.last_timestamp is None or timestamp > self.last_timestamp
+                ):
+                    self.last_timestamp = timestamp
+        return changed
+
+    def status(self, fid: int) -> str:
+        return self.statuses.get(fid, QC_NO_STATUS)
+
+    def reset(self) -> None:
+        """Forgets all statuses and high-water marks, forcing a full reload."""
+        with self._lock:
+            self.statuses.clear()
+            self.last_fid = None
+            self.last_timestamp = None
+            self.synced = False
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+
+_QC_INDEXES: Dict[str, QcStatusIndex] = {}
+
+
+def get_qc_index(wilker_name: str, type_data: str, year: int) -> QcStatusIndex:
+    """Returns the session-wide QC index for a wilker's QC table, creating it if needed."""
+    key = f"{wilker_name.lower().replace(' ', '')}.{get_qc_table_name(type_data, year)}"
+    if key not in _QC_INDEXES:
+        _QC_INDEXES[key] = QcStatusIndex(key)
+    return _QC_INDEXES[key]
+
+
+@qgsfunction(args="auto", group="IDPM", register=False)
+def idpm_qc_status(index_key, fid, feature, parent):
+    """
+    Returns the QC status recorded for a feature.
+    <h4>Syntax</h4>
+    <p>idpm_qc_status(index_key, ogc_fid)</p>
+    """
+    index = _QC_INDEXES.get(index_key)
+    if index is None or fid is None:
+        return QC_NO_STATUS
+    try:
+        return index.status(int(fid))
+    except (TypeError, ValueError):
+        return QC_NO_STATUS
+
+
+def register_qc_expression_function() -> None:
+    """Registers the expression function used by the `qc_status` virtual field."""
+    if not QgsExpression.isFunctionName(QC_EXPRESSION_FUNCTION):
+        QgsExpression.registerFunction(idpm_qc_status)
+
+
+def unregister_qc_expression_function() -> None:
+    if QgsExpression.isFunctionName(QC_EXPRESSION_FUNCTION):
+        QgsExpression.unregisterFunction(QC_EXPRESSION_FUNCTION)
+
+
+def _timestamp_to_str(value) -> Optional[str]:
+    if value is None or not value:
+        return None
+    if hasattr(value, "toString"):
+        return value.toString("yyyy-MM-ddTHH:mm:ss.zzz")
+    return str(value)
+
+
+def fetch_qc_rows(
+    wilker_name: str, type_data: str, year: int, index: QcStatusIndex
+) -> Tuple[Optional[QgsVectorLayer], List[Tuple[int, str, Optional[str]]]]:
+    """
+    Fetches only the QC rows newer than the index's high-water marks.
+    Geometry is skipped and only the needed columns are requested, so the
+    filter runs server-side and the transfer is proportional to the change.
+
+    Returns:
+        The QC layer (or None if it could not be opened) and the fetched rows.
+    """
+    qc_table_name = get_qc_table_name(type_data, year)
+    uri_logger = create_db_uri(wilker_name, qc_table_name, "geometry", "ogc_fid")
+    if not uri_logger:
+        return None, []
+
+    layer_logger = QgsVectorLayer(
+        uri_logger.uri(False), f"QC Log - {wilker_name} {year}", "postgres"
+    )
+    if not layer_logger.isValid():
+        QgsMessageLog.logMessage(
+            f"Failed to load QC table '{qc_table_name}' for wilker '{wilker_name}'!",
+            "IDPMPlugin",
+            Qgis.Warning,
+        )
+        return None, []
+
+    fields = layer_logger.fields()
+    if index.timestamp_field is None:
+        index.timestamp_field = next(
+            (name for name in QC_TIMESTAMP_FIELDS if fields.indexOf(name) != -1), ""
+        )
+    has_status = fields.indexOf("qcstatus") != -1
+
+    attributes = ["ogc_fid"]
+    if has_status:
+        attributes.append("qcstatus")
+    if index.timestamp_field:
+        attributes.append(index.timestamp_field)
+
+    request = QgsFeatureRequest()
+    request.setFlags(QgsFeatureRequest.NoGeometry)
+    request.setSubsetOfAttributes(attributes, fields)
+
+    clauses = []
+    if index.last_fid is not None:
+        clauses.append(f'"ogc_fid" > {index.last_fid}')
+    if index.timestamp_field and index.last_timestamp:
+        clauses.append(
+            f'"{index.timestamp_field}" > '
+            f"{QgsExpression.quotedString(index.last_timestamp)}"
+        )
+    if clauses:
+        request.setFilterExpression(" OR ".join(clauses))
+
+    rows = []
+    for qc_feature in layer_logger.getFeatures(request):
+        qc_status_raw = qc_feature.attribute("qcstatus") if has_status else None
+        qc_status_display = str(qc_status_raw) if qc_status_raw else "Unknown"
+        timestamp = (
+            _timestamp_to_str(qc_feature.attribute(index.timestamp_field))
+            if index.timestamp_field
+            else None
+        )
+        rows.append((int(qc_feature["ogc_fid"]), qc_status_display, timestamp))
+
+    return layer_logger, rows
+
+
+def apply_qc_index_to_layer(
+    layer: QgsVectorLayer,
+    index: QcStatusIndex,
+    changed_fids: List[int],
+    full: bool = False,
+) -> None:
+    """
+    Highlights QC features on the main layer and makes sure the `qc_status`
+    virtual field is bound to the index. The virtual field looks statuses up
+    through `idpm_qc_status`, so it never has to be rebuilt when rows change.
+
+    Args:
+        layer: The main Existing/Potensi layer
+        index: The QC index for the layer's QC table
+        changed_fids: ogc_fids that are new or changed since the last sync
+        full: Replace the whole selection instead of extending it
+    """
+    register_qc_expression_function()
+
+    expression = f"{QC_EXPRESSION_FUNCTION}('{index.key}', \"ogc_fid\")"
+    field_index = layer.fields().indexOf(QC_STATUS_FIELD)
+    if field_index == -1:
+        layer.addExpressionField(expression, QgsField(QC_STATUS_FIELD, QVariant.String))
+        full = True
+        QgsMessageLog.logMessage(
+            f"Added QC status field '{QC_STATUS_FIELD}' to layer '{layer.name()}'",
+            "IDPMPlugin",
+            Qgis.Info,
+        )
+    elif layer.fields().fieldOrigin(field_index) == QgsFields.OriginExpression:
+        if layer.expressionField(field_index) != expression:
+            layer.updateExpressionField(field_index, expression)
+            full = True
+    else:
+        QgsMessageLog.logMessage(
+            f"Layer '{layer.name()}' already has a '{QC_STATUS_FIELD}' column; "
+            "QC status virtual field not added.",
+            "IDPMPlugin",
+            Qgis.Warning,
+        )
+
+    fids = list(index.statuses.keys()) if full else changed_fids
+    if fids:
+        selection_expression = f'"ogc_fid" IN ({",".join(map(str, fids))})'
+        behavior = (
+            QgsVectorLayer.SetSelection if full else QgsVectorLayer.AddToSelection
+        )
+        layer.selectByExpression(selection_expression, behavior)
+        QgsMessageLog.logMessage(
+            f"Selected {layer.selectedFeatureCount()} features out of {len(index)} QC records",
+            "IDPMPlugin",
+            Qgis.Info,
+        )
+    elif full:
+        layer.removeSelection()
+
+    layer.triggerRepaint()
+
+
+def sync_qc_changes(
+    wilker_name: str,
+    layer: QgsVectorLayer,
+    type_data: str,
+    year: int,
+    add_qc_layer_to_map: bool = False,
+    full: bool = False,
+) -> int:
+    """
+    Incrementally syncs the '_qc' table into the in-memory index and
+    highlights the changed features on the provided layer.
+
+    Args:
+        wilker_name: The wilker name
+        layer: The main layer to highlight features on
+        type_data: The type of data (existing/potensi)
+        year: The year
+        add_qc_layer_to_map: Whether to add the QC layer to the map for visualization
+        full: Discard the index and reload the whole QC table
+
+    Returns:
+        The number of QC rows that were new or changed.
+    """
+    if layer is None or not layer.isValid():
+        return 0
+
+    index = get_qc_index(wilker_name, type_data, year)
+    if full:
+        index.reset()
+
+    layer_logger, rows = fetch_qc_rows(wilker_name, type_data, year, index)
+    if layer_logger is None:
+        return 0
+
+    if add_qc_layer_to_map and len(index) + len(rows) > 0:
+        existing_layers = [
+            map_layer.name()
+            for map_layer in QgsProject.instance().mapLayers().values()
+        ]
+        if layer_logger.name() not in existing_layers:
+            QgsProject.instance().addMapLayer(layer_logger)
+            QgsMessageLog.logMessage(
+                f"Added QC layer '{layer_logger.name()}' to map",
+                "IDPMPlugin",
+                Qgis.Info,
+            )
+
+    return apply_qc_rows(wilker_name, layer, type_data, year, index, rows)
+
+
+def apply_qc_rows(
+    wilker_name: str,
+    layer: QgsVectorLayer,
+    type_data: str,
+    year: int,
+    index: QcStatusIndex,
+    rows: List[Tuple[int, str, Optional[str]]],
+) -> int:
+    """
+    Merges rows fetched by fetch_qc_rows into the index and highlights the
+    changed features. The first sync, even of an empty QC table, replaces
+    the selection; later ones extend it.
+
+    Returns:
+        The number of QC rows that were new or changed.
+    """
+    first_sync = not index.synced
+    changed = index.merge(rows)
+    index.synced = True
+    apply_qc_index_to_layer(layer, index, changed, full=first_sync)
+
+    if changed:
+        QgsMessageLog.logMessage(
+            f"Highlighted {len(changed)} new QC changes on layer '{layer.name()}' "
+            f"({len(index)} total).",
+            "IDPMPlugin",
+            Qgis.Info,
+        )
+    elif first_sync:
+        QgsMessageLog.logMessage(
+            f"No changes found in '{get_qc_table_name(type_data, year)}' "
+            f"for wilker '{wilker_name}'.",
+            "IDPMPlugin",
+            Qgis.Info,
+        )
+    return len(changed)
+
+
+class LocalQcNotifier(QObject):
+    """
+    Local stand-in for a PostgreSQL LISTEN connection. It exposes the same
+    `notify(str)` signal as a QGIS data provider, so QC syncs can be
+    triggered without a database server.
+    """
+
+    notify = pyqtSignal(str)
+
+    def send(self, message: str = "") -> None:
+        self.notify.emit(message)
+
+
+class QcFetchTask(QgsTask):
+    """
+    A QGIS task that runs fetch_qc_rows, so the PostgreSQL connection and
+    query of a QC sync never block the main thread.
+    """
+
+    rowsFetched = pyqtSignal(list)  # (ogc_fid, status, timestamp) tuples
+    errorOccurred = pyqtSignal(str)
+
+    def __init__(self, wilker_name: str, type_data: str, year: int):
+        super().__init__(
+            f"QC sync {get_qc_table_name(type_data, year)}", QgsTask.CanCancel
+        )
+        self.wilker_name = wilker_name
+        self.type_data = type_data
+        self.year = year
+        self.index = get_qc_index(wilker_name, type_data, year)
+        self.generation = self.index.generation
+        self.rows: List[Tuple[int, str, Optional[str]]] = []
+        self.exception = None
+
+    def run(self):
+        try:
+            layer_logger, self.rows = fetch_qc_rows(
+                self.wilker_name, self.type_data, self.year, self.index
+            )
+            if layer_logger is None:
+                raise RuntimeError(
+                    f"QC table '{get_qc_table_name(self.type_data, self.year)}' "
+                    "could not be opened"
+                )
+            return not self.isCanceled()
+        except Exception as e:
+            self.exception = e
+            return False
+
+    def finished(self, result):
+        """
+        Called on the main thread when the task is finished. Rows fetched
+        before the index was reset are dropped.
+        """
+        if result:
+            if self.index.generation == self.generation:
+                self.rowsFetched.emit(self.rows)
+        elif self.exception:
+            self.errorOccurred.emit(str(self.exception))
+
+
+class QcSyncController(QObject):
+    """
+    Keeps a layer's QC highlighting current, either by polling on a timer or
+    by reacting to PostgreSQL NOTIFY messages. The QC table is queried in a
+    QcFetchTask; syncs requested while one is running are coalesced into a
+    single follow-up sync.
+    """
+
+    qcUpdated = pyqtSignal(int)  # number of new/changed QC rows
+
+    def __init__(
+        self,
+        wilker_name: str,
+        layer: QgsVectorLayer,
+        type_data: str,
+        year: int,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent if parent is not None else layer)
+        self.wilker_name = wilker_name
+        self.layer = layer
+        self.type_data = type_data
+        self.year = year
+        self.qc_table_name = get_qc_table_name(type_data, year)
+        self._task: Optional[QcFetchTask] = None
+        self._sync_pending = False
+        self._notifiers = []
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.sync)
+
+    def start_polling(self, interval_ms: int) -> None:
+        if interval_ms > 0:
+            self._timer.start(interval_ms)
+
+    def stop_polling(self) -> None:
+        self._timer.stop()
+
+    def listen(self, notifier: Optional[QObject] = None) -> bool:
+        """
+        Syncs whenever `notifier` emits `notify(str)`. Without a notifier the
+        layer's PostgreSQL provider is put into LISTEN mode, so a trigger
+        doing `NOTIFY qgis, '<qc table>'` refreshes the highlighting.
+
+        Returns:
+            True if a notification source was connected.
+        """
+        if notifier is None:
+            notifier = self.layer.dataProvider()
+            if notifier is None or not hasattr(notifier, "setListening"):
+                return False
+            notifier.setListening(True)
+        notifier.notify.connect(self._on_notify)
+        self._notifiers.append(notifier)
+        return True
+
+    def _on_notify(self, message: str) -> None:
+        # Ignore notifications that explicitly name another QC table.
+        if message and message.endswith("_qc") and message != self.qc_table_name:
+            return
+        self.sync()
+
+    def sync(self) -> None:
+        """Starts a background sync; qcUpdated is emitted if rows changed."""
+        if self._task is not None:
+            self._sync_pending = True
+            return
+        task = QcFetchTask(self.wilker_name, self.type_data, self.year)
+        task.rowsFetched.connect(self._on_rows_fetched)
+        task.errorOccurred.connect(self._on_fetch_error)
+        task.taskCompleted.connect(self._on_task_done)
+        task.taskTerminated.connect(self._on_task_done)
+        self._task = task
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_rows_fetched(self, rows: list) -> None:
+        if self.layer is None or not self.layer.isValid():
+            return
+        try:
+            index = get_qc_index(self.wilker_name, self.type_data, self.year)
+            changed = apply_qc_rows(
+                self.wilker_name, self.layer, self.type_data, self.year, index, rows
+            )
+        except Exception as e:
+            self._on_fetch_error(str(e))
+            return
+        if changed:
+            self.qcUpdated.emit(changed)
+
+    def _on_fetch_error(self, error: str) -> None:
+        QgsMessageLog.logMessage(
+            f"QC sync failed for '{self.qc_table_name}': {error}",
+            "IDPMPlugin",
+            Qgis.Warning,
+        )
+
+    def _on_task_done(self) -> None:
+        self._task = None
+        if self._sync_pending:
+            self._sync_pending = False
+            self.sync()
+
+    def resync(self) -> None:
+        """Reloads the whole QC table, e.g. to pick up deleted QC rows."""
+        index = get_qc_index(self.wilker_name, self.type_data, self.year)
+        index.reset()
+        self.sync()
@@ -7,10 +7,18 @@ from qgis.core import (
 )
 from PyQt5.QtCore import pyqtSignal
 
+from ..config import Config
+from .band_alignment import BandAligner
+from .cog_ingest import finalize_product
+
 
 class RasterCalculatorTask(QgsTask):
     """
     A QGIS task to perform a custom raster calculation in the background.
+
+    Bands with different resolutions or extents (e.g. 20 m SWIR with 10 m
+    NIR/Red) are aligned on the fly to one target grid: the finest input
+    resolution over the common extent, resampled with the given kernel.
     """
 
     calculationFinished = pyqtSignal(str, str, str)  # path, name, stac_id
@@ -23,6 +31,7 @@ class RasterCalculatorTask(QgsTask):
         coefficients: dict,
         output_path: str,
         stac_id: str,
+        resampling: str = Config.BAND_RESAMPLING,
     ):
         task_name = f"Calculating '{os.path.basename(output_path)}'"
         super().__init__(task_name, QgsTask.CanCancel)
@@ -31,23 +40,31 @@ class RasterCalculatorTask(QgsTask):
         self.coefficients = coefficients
         self.output_path = output_path
         self.stac_id = stac_id
+        self.resampling = resampling
         self.exception = None
 
     def run(self):
         """
         Executes the raster calculation. This method runs on a background thread.
         """
+        aligner = None
         try:
             self.setProgress(10)
             if self.isCanceled():
                 return False
 
+            # One grid for all bands; off-grid bands are read through
+            # in-memory warped VRTs instead of resampled copies on disk
+            aligner = BandAligner(self.band_paths, self.resampling)
+            grid = aligner.grid
+            aligned_paths = aligner.aligned_paths()
+
             entries = []
             ref_layer = None
             layers_to_keep_alive = []
 
-            total_bands = len(self.band_paths)
-            for i, (band_name, path) in enumerate(self.band_paths.items()):
+            total_bands = len(aligned_paths)
+            for i, (band_name, path) in enumerate(aligned_paths.items()):
                 if self.isCanceled():
                     return False
 
@@ -90,9 +107,9 @@ class RasterCalculatorTask(QgsTask):
                 calc_formula,
                 self.output_path,
                 "GTiff",
-                ref_layer.extent(),
-                ref_layer.width(),
-                ref_layer.height(),
+                grid.extent(),
+                grid.width,
+                grid.height,
                 entries,
             )
 
@@ -105,12 +122,15 @@ class RasterCalculatorTask(QgsTask):
                 )
                 return False
 
+            finalize_product(self.output_path)
             return True
 
         except Exception as e:
             self.exception = e
             return False
         finally:
+            if aligner is not None:
+                aligner.release()
             self.setProgress(100)
 
     def finished(self, result):
@@ -0,0 +1,242 @@
+import hashlib
+import os
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Optional, Set
+
+from qgis.core import Qgis, QgsMessageLog
+from PyQt5.QtCore import QObject, QUrl, pyqtSignal
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+from ..config import Config
+from .cache_manager import CacheManager
+
+
+class ThumbnailLoader(QObject):
+    """
+    Shared thumbnail service for the image list.
+
+    Requests go through a single QNetworkAccessManager with a bounded number
+    of replies in flight. Decoded pixmaps are kept in an in-memory LRU and the
+    raw bytes on disk, keyed by URL + ETag. A disk hit is shown immediately and
+    revalidated once per session with If-None-Match. The disk cache has its
+    own CacheManager, which keeps it within Config.THUMBNAIL_DISK_CACHE_MAX_BYTES.
+    """
+
+    thumbnailReady = pyqtSignal(str, QPixmap)  # url, pixmap
+
+    _instance: Optional["ThumbnailLoader"] = None
+
+    @classmethod
+    def instance(cls) -> "ThumbnailLoader":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(
+        self,
+        max_concurrent: int = Config.THUMBNAIL_MAX_CONCURRENT,
+        memory_cache_size: int = Config.THUMBNAIL_MEMORY_CACHE_SIZE,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self.max_concurrent = max(1, max_concurrent)
+        self.memory_cache_size = max(1, memory_cache_size)
+        self.network_manager = QNetworkAccessManager(self)
+        self.network_manager.finished.connect(self._on_reply_finished)
+
+        self._memory: "OrderedDict[str, QPixmap]" = OrderedDict()
+        self._queue: deque = deque()  # visible rows, served first
+        self._prefetch_queue: deque = deque()
+        self._in_flight: Dict[str, QNetworkReply] = {}
+        self._waiters: Dict[str, int] = {}
+        self._revalidated: Set[str] = set()
+        self._cache_manager: Optional[CacheManager] = None
+
+    # --- Public API ---
+
+    def request(self, url: str) -> Optional[QPixmap]:
+        """
+        Asks for the thumbnail at url on behalf of a visible widget.
+
+        Returns:
+            The pixmap if it is already cached, otherwise None; in that case
+            thumbnailReady is emitted once it has been fetched.
+        """
+        if not url:
+            return None
+        pixmap = self._memory_get(url)
+        if pixmap is None:
+            pixmap = self._disk_get(url)
+            if pixmap is not None:
+                self._memory_put(url, pixmap)
+        if pixmap is not None:
+            if url not in self._revalidated:
+                self._revalidated.add(url)
+                self._enqueue(self._prefetch_queue, url)
+            return pixmap
+
+        self._waiters[url] = self._waiters.get(url, 0) + 1
+        if url in self._prefetch_queue:
+            self._prefetch_queue.remove(url)
+        self._enqueue(self._queue, url)
+        return None
+
+    def prefetch(self, urls: Iterable[str]) -> None:
+        """Queues thumbnails that are likely to scroll into view next."""
+        for url in urls:
+            if url and url not in self._memory and not self._has_disk_entry(url):
+                self._enqueue(self._prefetch_queue, url)
+        self._pump()
+
+    def cancel(self, url: str) -> None:
+        """Drops a widget's interest in url, aborting the fetch if nobody else waits."""
+        count = self._waiters.get(url, 0) - 1
+        if count > 0:
+            self._waiters[url] = count
+            return
+        self._waiters.pop(url, None)
+        if url in self._queue:
+            self._queue.remove(url)
+        reply = self._in_flight.get(url)
+        if reply is not None:
+            reply.abort()
+
+    def clear_memory_cache(self) -> None:
+        self._memory.clear()
+
+    # --- Queue handling ---
+
+    def _enqueue(self, queue: deque, url: str) -> None:
+        if url not in self._in_flight and url not in queue:
+            queue.append(url)
+        self._pump()
+
+    def _pump(self) -> None:
+        while len(self._in_flight) < self.max_concurrent:
+            if self._queue:
+                url = self._queue.popleft()
+            elif self._prefetch_queue:
+                url = self._prefetch_queue.popleft()
+            else:
+                return
+            if url in self._in_flight:
+                continue
+            request = QNetworkRequest(QUrl(url))
+            etag = self._read_etag(url)
+            if etag and self._has_disk_entry(url):
+                request.setRawHeader(b"If-None-Match", etag.encode("utf-8"))
+            reply = self.network_manager.get(request)
+            reply.setProperty("thumbnail_url", url)
+            self._in_flight[url] = reply
+
+    def _on_reply_finished(self, reply: QNetworkReply) -> None:
+        """
+        Caches and announces a fetched thumbnail. Whatever the outcome, the
+        waiters for the URL are settled: a failed fetch is not retried until
+        a widget asks for it again.
+        """
+        url = reply.property("thumbnail_url")
+        self._in_flight.pop(url, None)
+        try:
+            if reply.error() == QNetworkReply.OperationCanceledError:
+                return
+            if reply.error() != QNetworkReply.NoError:
+                QgsMessageLog.logMessage(
+                    f"Thumbnail fetch failed for {url}: {reply.errorString()}",
+                    "IDPMPlugin",
+                    Qgis.Warning,
+                )
+                return
+            status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+            if status == 304:
+                return
+
+            data = bytes(reply.readAll())
+            pixmap = QPixmap()
+            if not pixmap.loadFromData(data):
+                return
+            etag = bytes(reply.rawHeader(b"ETag")).decode("utf-8", "ignore")
+            self._disk_put(url, etag, data)
+            self._memory_put(url, pixmap)
+            self.thumbnailReady.emit(url, pixmap)
+        finally:
+            self._waiters.pop(url, None)
+            reply.deleteLater()
+            self._pump()
+
+    # --- Memory LRU ---
+
+    def _memory_get(self, url: str) -> Optional[QPixmap]:
+        pixmap = self._memory.get(url)
+        if pixmap is not None:
+            self._memory.move_to_end(url)
+        return pixmap
+
+    def _memory_put(self, url: str, pixmap: QPixmap) -> None:
+        self._memory[url] = pixmap
+        self._memory.move_to_end(url)
+        while len(self._memory) > self.memory_cache_size:
+            self._memory.popitem(last=False)
+
+    # --- Disk cache ---
+
+    def _get_cache_manager(self) -> CacheManager:
+        if self._cache_manager is None:
+            self._cache_manager = CacheManager.for_thumbnail_cache()
+            # Thumbnails cached before the cache had a budget
+            if self._cache_manager.import_untracked():
+                self._cache_manager.evict_to_budget()
+        return self._cache_manager
+
+    def _get_cache_dir(self) -> str:
+        return self._get_cache_manager().cache_root
+
+    @staticmethod
+    def _digest(*parts: str) -> str:
+        return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _etag_path(self, url: str) -> str:
+        return os.path.join(self._get_cache_dir(), f"{self._digest(url)}.etag")
+
+    def _data_path(self, url: str, etag: str) -> str:
+        return os.path.join(self._get_cache_dir(), f"{self._digest(url, etag)}.img")
+
+    def _read_etag(self, url: str) -> Optional[str]:
+        try:
+            with open(self._etag_path(url), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _has_disk_entry(self, url: str) -> bool:
+        etag = self._read_etag(url)
+        return etag is not None and os.path.exists(self._data_path(url, etag))
+
+    def _disk_get(self, url: str) -> Optional[QPixmap]:
+        etag = self._read_etag(url)
+        if etag is None:
+            return None
+        path = self._data_path(url, etag)
+        pixmap = QPixmap()
+        if pixmap.load(path):
+            self._get_cache_manager().touch(path)
+            return pixmap
+        return None
+
+    def _disk_put(self, url: str, etag: str, data: bytes) -> None:
+        try:
+            manager = self._get_cache_manager()
+            old_etag = self._read_etag(url)
+            data_path = self._data_path(url, etag)
+            with open(data_path, "wb") as f:
+                f.write(data)
+            with open(self._etag_path(url), "w", encoding="utf-8") as f:
+                f.write(etag)
+            if old_etag is not None and old_etag != etag:
+                manager.remove(self._data_path(url, old_etag))
+            manager.register(data_path)
+        except OSError as e:
+            QgsMessageLog.logMessage(
+                f"Could not cache thumbnail {url}: {e}", "IDPMPlugin", Qgis.Warning
+            )
@@ -0,0 +1,272 @@
+import csv
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsGeometry,
+    QgsMessageLog,
+    QgsProject,
+    QgsTask,
+)
+from PyQt5.QtCore import pyqtSignal
+
+from ..config import Config
+from .asset_model import RasterAsset
+from .catalog_index import CatalogIndex
+from .cog_aio_loader import CogAoiLoader
+from .zonal_statistics import (
+    DEFAULT_PERCENTILES,
+    INDEX_FUNCTIONS,
+    ZonalStatisticsCancelled,
+    compute_remote_zonal_statistics,
+)
+
+# Band name used by INDEX_FUNCTIONS -> RasterAsset attribute holding its URL
+_BAND_URL_ATTRIBUTES = {
+    "nir": "nir_url",
+    "red": "red_url",
+    "green": "green_url",
+    "blue": "blue_url",
+}
+
+TABLE_COLUMNS = (
+    ["zone", "date", "scene", "index", "count", "mean", "std", "min"]
+    + [f"p{p:g}" for p in DEFAULT_PERCENTILES]
+    + ["max"]
+)
+
+
+def select_scenes(
+    catalog_index: CatalogIndex,
+    zones: Sequence[QgsGeometry],
+    zones_crs: QgsCoordinateReferenceSystem,
+    date_from: Union[date, datetime, None] = None,
+    date_to: Union[date, datetime, None] = None,
+    cloud_max: Optional[float] = None,
+) -> List[RasterAsset]:
+    """
+    Scenes of the catalog covering any of the zones within the date and
+    cloud filter, oldest first.
+    """
+    extent = None
+    for zone in zones:
+        box = zone.boundingBox()
+        if extent is None:
+            extent = box
+        else:
+            extent.combineExtentWith(box)
+    aoi_geom = None
+    if extent is not None:
+        aoi_geom = QgsGeometry.fromRect(extent)
+        wgs84 = QgsCoordinateReferenceSystem("EPSG:4326")
+        if zones_crs.isValid() and zones_crs != wgs84:
+            aoi_geom.transform(
+                QgsCoordinateTransform(zones_crs, wgs84, QgsProject.instance())
+            )
+
+    assets = catalog_index.query(
+        aoi_geom=aoi_geom, cloud_max=cloud_max, date_from=date_from, date_to=date_to
+    )
+    return sorted(
+        (asset for asset in assets if asset.capture_date is not None),
+        key=lambda asset: asset.capture_date,
+    )
+
+
+class TimeSeriesTask(QgsTask):
+    """
+    A QGIS task to build an index time series for a set of polygons over many
+    scenes.
+
+    Scenes are processed in parallel by a small thread pool; each worker
+    reads only the COG tiles under the polygons (see
+    compute_remote_zonal_statistics), so nothing is downloaded. The result
+    is a tidy CSV with one row per polygon and date and, when matplotlib is
+    available, a PNG chart of the mean per polygon.
+
+    The pipeline is sized for about 30 scenes per minute with the default
+    TIME_SERIES_WORKERS on a broadband link, for a few dozen polygons of a
+    few hectares each. Larger polygons read proportionally more tiles.
+    The measured rate is logged and reported with the result.
+    """
+
+    # csv_path, chart_path ("" if no chart), scenes per minute
+    timeSeriesFinished = pyqtSignal(str, str, float)
+    errorOccurred = pyqtSignal(str)
+
+    def __init__(
+        self,
+        assets: Sequence[RasterAsset],
+        zones: List[QgsGeometry],
+        zones_crs: QgsCoordinateReferenceSystem,
+        output_csv: str,
+        index_name: str = "NDVI",
+        zone_ids: Optional[List[Any]] = None,
+        max_workers: int = Config.TIME_SERIES_WORKERS,
+    ):
+        super().__init__(
+            f"{index_name} time series over {len(assets)} scenes", QgsTask.CanCancel
+        )
+        self.assets = list(assets)
+        self.zones = zones
+        self.zones_crs = zones_crs
+        self.output_csv = output_csv
+        self.index_name = index_name
+        self.zone_ids = zone_ids
+        self.max_workers = max(1, max_workers)
+        self.chart_path = ""
+        self.scenes_per_minute = 0.0
+        self.rows: List[Dict] = []
+        self.exception = None
+
+    def _band_urls(self, asset: RasterAsset) -> Dict[str, str]:
+        required_bands = INDEX_FUNCTIONS[self.index_name][0]
+        band_urls = {
+            band: getattr(asset, _BAND_URL_ATTRIBUTES[band], None)
+            for band in required_bands
+        }
+        # Cloudy pixels are masked per scene rather than dropping the scene
+        band_urls["scl"] = asset.scl_url
+        return band_urls
+
+    def _scene_rows(self, asset: RasterAsset) -> List[Dict]:
+        # One loader per scene: rasterio datasets are not shared across threads
+        rows = compute_remote_zonal_statistics(
+            self._band_urls(asset),
+            self.zones,
+            self.zones_crs,
+            self.index_name,
+            is_canceled=self.isCanceled,
+            cog_loader=CogAoiLoader(),
+        )
+        scene_date = asset.capture_date.date().isoformat()
+        for row in rows:
+            if self.zone_ids is not None:
+                row["zone"] = self.zone_ids[row["zone"]]
+            row.update(
+                {"date": scene_date, "scene": asset.stac_id, "index": self.index_name}
+            )
+        return rows
+
+    def run(self):
+        """
+        Executes the time series extraction in a background thread.
+        """
+        try:
+            if self.index_name not in INDEX_FUNCTIONS:
+                raise ValueError(f"Unknown index: {self.index_name}")
+            started = time.monotonic()
+            done_scenes = 0
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = {
+                    executor.submit(self._scene_rows, asset): asset
+                    for asset in self.assets
+                }
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        asset = pending.pop(future)
+                        try:
+                            self.rows.extend(future.result())
+                        except ZonalStatisticsCancelled:
+                            pass
+                        except Exception as e:
+                            QgsMessageLog.logMessage(
+                                f"Time series: skipped {asset.stac_id}: {e}",
+                                "IDPMPlugin",
+                                Qgis.Warning,
+                            )
+                        done_scenes += 1
+                        self.setProgress(90 * done_scenes / len(self.assets))
+                    if self.isCanceled():
+                        for future in pending:
+                            future.cancel()
+                        return False
+
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.scenes_per_minute = len(self.assets) * 60.0 / elapsed
+            QgsMessageLog.logMessage(
+                f"Time series: {len(self.assets)} scenes in {elapsed:.1f} s "
+                f"({self.scenes_per_minute:.1f} scenes/min, {self.max_workers} workers)",
+                "IDPMPlugin",
+                Qgis.Info,
+            )
+
+            self.rows.sort(key=lambda row: (str(row["zone"]), row["date"]))
+            self._write_csv()
+            self.chart_path = self._write_chart()
+            return True
+
+        except Exception as e:
+            self.exception = e
+            return False
+        finally:
+            self.setProgress(100)
+
+    def _write_csv(self) -> None:
+        os.makedirs(os.path.dirname(self.output_csv) or ".", exist_ok=True)
+        with open(self.output_csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=TABLE_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+    def _write_chart(self) -> str:
+        """Mean index per zone over time as a PNG next to the CSV; "" if skipped."""
+        try:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+        except ImportError:
+            QgsMessageLog.logMessage(
+                "matplotlib is not available; time series chart skipped",
+                "IDPMPlugin",
+                Qgis.Info,
+            )
+            return ""
+
+        series: Dict[Any, List] = {}
+        for row in self.rows:
+            if row["mean"] is not None:
+                series.setdefault(row["zone"], []).append(
+                    (datetime.strptime(row["date"], "%Y-%m-%d"), row["mean"])
+                )
+        if not series:
+            return ""
+
+        # Figure + Agg canvas rather than pyplot, which is not thread-safe
+        figure = Figure(figsize=(10, 5), dpi=100)
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot(111)
+        for zone, points in series.items():
+            dates, means = zip(*points)
+            axes.plot(dates, means, marker="o", markersize=3, label=str(zone))
+        axes.set_xlabel("Date")
+        axes.set_ylabel(f"Mean {self.index_name}")
+        axes.grid(True, alpha=0.3)
+        if len(series) <= 15:
+            axes.legend(title="Polygon", fontsize="small")
+        figure.autofmt_xdate()
+
+        chart_path = os.path.splitext(self.output_csv)[0] + ".png"
+        figure.savefig(chart_path, bbox_inches="tight")
+        return chart_path
+
+    def finished(self, result):
+        """
+        Called on the main thread when the task is finished.
+        """
+        if result:
+            self.timeSeriesFinished.emit(
+                self.output_csv, self.chart_path, self.scenes_per_minute
+            )
+        else:
+            if self.exception:
+                self.errorOccurred.emit(str(self.exception))
+            else:
+                self.errorOccurred.emit("Time series task was canceled or failed.")
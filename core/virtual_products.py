@@ -0,0 +1,385 @@
+import ast
+import json
+import operator
+import os
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from osgeo import gdal
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsProject,
+    QgsRectangle,
+    QgsTask,
+)
+from PyQt5.QtCore import pyqtSignal
+
+# Functions below are referenced from VRTs as "<this module>.<function>"; GDAL
+# only runs Python pixel functions from modules listed as trusted
+_PIXEL_FUNCTION_MODULE = __name__
+
+# GDAL 3.8 added the built-in normalized difference pixel function
+_HAS_NORM_DIFF = int(gdal.VersionInfo()) >= 3080000
+
+# The only operators a custom index formula may use
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPERATORS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+@lru_cache(maxsize=32)
+def _parse_formula(formula: str) -> ast.expr:
+    """
+    Parses an index formula, allowing only names, numbers, + - * / ** and
+    parentheses. The formula comes from the VRT being opened, so it is
+    never passed to eval().
+
+    Raises:
+        ValueError: if the formula uses anything else
+    """
+    try:
+        tree = ast.parse(formula, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid formula: {formula}") from e
+    for node in ast.walk(tree.body):
+        allowed = (
+            isinstance(node, (ast.Name, ast.Load))
+            or (
+                isinstance(node, ast.Constant)
+                and type(node.value) in (int, float)
+            )
+            or (isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS)
+            or (isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS)
+            or type(node) in _BINARY_OPERATORS
+            or type(node) in _UNARY_OPERATORS
+        )
+        if not allowed:
+            raise ValueError(
+                f"Unsupported element {type(node).__name__} in formula: {formula}"
+            )
+    return tree.body
+
+
+def _evaluate(node: ast.expr, namespace: Dict[str, Any]):
+    """Evaluates a formula parsed by _parse_formula over arrays and numbers."""
+    if isinstance(node, ast.Constant):
+        return float(node.value)  # no unbounded int arithmetic, e.g. 9 ** 9 ** 9
+    if isinstance(node, ast.Name):
+        if node.id not in namespace:
+            raise ValueError(f"Unknown name in formula: {node.id}")
+        return namespace[node.id]
+    if isinstance(node, ast.BinOp):
+        return _BINARY_OPERATORS[type(node.op)](
+            _evaluate(node.left, namespace), _evaluate(node.right, namespace)
+        )
+    return _UNARY_OPERATORS[type(node.op)](_evaluate(node.operand, namespace))
+
+
+def _gdal_path(source: str) -> str:
+    """GDAL path of a local file or remote COG."""
+    if source.startswith(("http://", "https://")):
+        return f"/vsicurl/{source}"
+    return source
+
+
+def enable_python_pixel_functions() -> None:
+    """
+    Trusts this module's pixel functions (GDAL_VRT_PYTHON_TRUSTED_MODULES),
+    keeping any modules trusted already. Python pixel functions stay disabled
+    if the user set GDAL_VRT_ENABLE_PYTHON=NO.
+    """
+    trusted = gdal.GetConfigOption("GDAL_VRT_PYTHON_TRUSTED_MODULES") or ""
+    modules = [module for module in trusted.split(",") if module]
+    if _PIXEL_FUNCTION_MODULE not in modules:
+        modules.append(_PIXEL_FUNCTION_MODULE)
+        gdal.SetConfigOption("GDAL_VRT_PYTHON_TRUSTED_MODULES", ",".join(modules))
+
+
+def _source_bounds(
+    source: str, aoi_rect: QgsRectangle, aoi_crs: QgsCoordinateReferenceSystem
+) -> List[float]:
+    """AOI bounds (xmin, ymin, xmax, ymax) in the CRS of the source raster."""
+    ds = gdal.Open(_gdal_path(source))
+    if ds is None:
+        raise RuntimeError(f"Could not open {source}")
+    try:
+        source_crs = QgsCoordinateReferenceSystem.fromWkt(ds.GetProjection())
+    finally:
+        ds = None
+    rect = QgsRectangle(aoi_rect)
+    if aoi_crs != source_crs:
+        transform = QgsCoordinateTransform(aoi_crs, source_crs, QgsProject.instance())
+        rect = transform.transformBoundingBox(rect)
+    return [rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum()]
+
+
+def _stack_vrt(
+    sources: Sequence[str],
+    aoi_rect: Optional[QgsRectangle],
+    aoi_crs: Optional[QgsCoordinateReferenceSystem],
+) -> ET.Element:
+    """
+    One VRT band per source on the finest source grid (clipped to the AOI
+    if given), as parsed VRT XML. Sources must share a CRS, as the bands of
+    one Sentinel-2 scene do.
+    """
+    options = {"separate": True, "resolution": "highest"}
+    if aoi_rect is not None and aoi_crs is not None:
+        options["outputBounds"] = _source_bounds(sources[0], aoi_rect, aoi_crs)
+    vrt = gdal.BuildVRT("", [_gdal_path(source) for source in sources], **options)
+    if vrt is None:
+        raise RuntimeError("Could not build VRT over the source bands")
+    try:
+        return ET.fromstring(vrt.GetMetadata("xml:VRT")[0])
+    finally:
+        vrt = None
+
+
+def _derive_band(
+    root: ET.Element,
+    pixel_function: str,
+    language: Optional[str] = None,
+    arguments: Optional[Dict[str, str]] = None,
+    description: str = "",
+) -> None:
+    """Replaces the stacked bands of a VRT with one derived float32 band."""
+    bands = root.findall("VRTRasterBand")
+    derived = ET.Element(
+        "VRTRasterBand",
+        {"dataType": "Float32", "band": "1", "subClass": "VRTDerivedRasterBand"},
+    )
+    ET.SubElement(derived, "Description").text = description
+    ET.SubElement(derived, "NoDataValue").text = "nan"
+    ET.SubElement(derived, "PixelFunctionType").text = pixel_function
+    if language:
+        ET.SubElement(derived, "PixelFunctionLanguage").text = language
+    if arguments:
+        ET.SubElement(derived, "PixelFunctionArguments", arguments)
+    for band in bands:
+        for source in band:
+            if source.tag.endswith("Source"):
+                derived.append(source)
+        root.remove(band)
+    root.append(derived)
+
+
+def _write(root: ET.Element, output_path: str) -> str:
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    ET.ElementTree(root).write(output_path, encoding="utf-8")
+    return output_path
+
+
+def write_ndvi_vrt(
+    nir_source: str,
+    red_source: str,
+    output_path: str,
+    aoi_rect: Optional[QgsRectangle] = None,
+    aoi_crs: Optional[QgsCoordinateReferenceSystem] = None,
+) -> str:
+    """
+    Writes NDVI as a virtual product: a VRT whose single band is computed
+    from the NIR and Red COGs only for the pixels being read.
+
+    Uses GDAL's norm_diff pixel function (GDAL >= 3.8), otherwise
+    ndvi_pixel_function from this module. When zoomed out, GDAL reads the
+    COGs' overviews, so rendering cost follows the screen, not the scene.
+
+    Returns:
+        output_path
+    """
+    root = _stack_vrt([nir_source, red_source], aoi_rect, aoi_crs)
+    if _HAS_NORM_DIFF:
+        _derive_band(root, "norm_diff", description="NDVI")
+    else:
+        enable_python_pixel_functions()
+        _derive_band(
+            root,
+            f"{_PIXEL_FUNCTION_MODULE}.ndvi_pixel_function",
+            language="Python",
+            description="NDVI",
+        )
+    return _write(root, output_path)
+
+
+def write_false_color_vrt(
+    nir_source: str,
+    red_source: str,
+    green_source: str,
+    output_path: str,
+    aoi_rect: Optional[QgsRectangle] = None,
+    aoi_crs: Optional[QgsCoordinateReferenceSystem] = None,
+) -> str:
+    """
+    Writes a NIR/Red/Green false color composite as a VRT stacking the
+    three COGs; no pixel function is needed.
+
+    Returns:
+        output_path
+    """
+    root = _stack_vrt([nir_source, red_source, green_source], aoi_rect, aoi_crs)
+    for band, name in zip(root.findall("VRTRasterBand"), ("NIR", "Red", "Green")):
+        ET.SubElement(band, "Description").text = name
+    return _write(root, output_path)
+
+
+def write_custom_index_vrt(
+    band_sources: Dict[str, str],
+    formula: str,
+    output_path: str,
+    coefficients: Optional[Dict] = None,
+    aoi_rect: Optional[QgsRectangle] = None,
+    aoi_crs: Optional[QgsCoordinateReferenceSystem] = None,
+) -> str:
+    """
+    Writes a custom index, e.g. "(nir - red) / (nir + red + L)", as a VRT
+    evaluated per block by custom_index_pixel_function.
+
+    Args:
+        band_sources: Band name used in the formula -> path or COG URL
+        formula: Arithmetic over band names and coefficient names
+        output_path: Where to write the .vrt
+        coefficients: Coefficient name -> value
+
+    Returns:
+        output_path
+    """
+    _parse_formula(formula)  # rejects unsupported formulas before any I/O
+    band_names = list(band_sources)
+    root = _stack_vrt([band_sources[name] for name in band_names], aoi_rect, aoi_crs)
+    enable_python_pixel_functions()
+    _derive_band(
+        root,
+        f"{_PIXEL_FUNCTION_MODULE}.custom_index_pixel_function",
+        language="Python",
+        arguments={
+            "formula": formula,
+            "bands": ",".join(band_names),
+            "coefficients": json.dumps(coefficients or {}),
+        },
+        description=formula,
+    )
+    return _write(root, output_path)
+
+
+class VirtualProductTask(QgsTask):
+    """
+    A QGIS task that runs one of the write_*_vrt functions of this module.
+
+    Building the VRT opens every source with GDAL, which for remote COGs
+    means HTTP requests, so it must not run on the GUI thread. Virtual
+    products are never cloud-masked: Config.CLOUD_MASK_ENABLED only applies
+    to computed products.
+    """
+
+    productReady = pyqtSignal(str)  # output_path
+    errorOccurred = pyqtSignal(str)
+
+    def __init__(
+        self,
+        description: str,
+        writer: Callable[..., str],
+        sources: Sequence,
+        output_path: str,
+        **options,
+    ):
+        """
+        Args:
+            description: Task description shown in the task manager
+            writer: write_ndvi_vrt, write_false_color_vrt or
+                write_custom_index_vrt
+            sources: Positional arguments of the writer before output_path
+            output_path: Where to write the .vrt
+            **options: Keyword arguments of the writer, e.g. aoi_rect
+        """
+        super().__init__(description, QgsTask.CanCancel)
+        self.writer = writer
+        self.sources = list(sources)
+        self.output_path = output_path
+        self.options = options
+        self.exception = None
+
+    def run(self):
+        try:
+            self.writer(*self.sources, output_path=self.output_path, **self.options)
+            if self.isCanceled():
+                if os.path.exists(self.output_path):
+                    os.remove(self.output_path)
+                return False
+            return True
+        except Exception as e:
+            self.exception = e
+            return False
+
+    def finished(self, result):
+        """
+        Called on the main thread when the task is finished. A cancelled
+        task emits nothing.
+        """
+        if result:
+            self.productReady.emit(self.output_path)
+        elif self.exception:
+            self.errorOccurred.emit(str(self.exception))
+
+
+def ndvi_pixel_function(
+    in_ar,
+    out_ar,
+    xoff,
+    yoff,
+    xsize,
+    ysize,
+    raster_xsize,
+    raster_ysize,
+    buf_radius,
+    gt,
+    **kwargs,
+):
+    """VRT pixel function: (NIR - Red) / (NIR + Red), NaN where either is 0 (nodata)."""
+    nir = in_ar[0].astype(np.float32)
+    red = in_ar[1].astype(np.float32)
+    total = nir + red
+    valid = (nir != 0) & (red != 0) & (total != 0)
+    out_ar[:] = np.nan
+    np.divide(nir - red, total, out=out_ar, where=valid)
+
+
+def custom_index_pixel_function(
+    in_ar,
+    out_ar,
+    xoff,
+    yoff,
+    xsize,
+    ysize,
+    raster_xsize,
+    raster_ysize,
+    buf_radius,
+    gt,
+    **kwargs,
+):
+    """
+    VRT pixel function: evaluates the formula from PixelFunctionArguments
+    over the source bands, NaN where any band is 0 (nodata). Formulas are
+    limited to arithmetic (see _parse_formula).
+    """
+    formula = _parse_formula(kwargs["formula"])
+    names = kwargs["bands"].split(",")
+    namespace = {
+        name: float(value)
+        for name, value in json.loads(kwargs.get("coefficients") or "{}").items()
+    }
+    namespace.update(
+        {name: in_ar[i].astype(np.float32) for i, name in enumerate(names)}
+    )
+    valid = np.logical_and.reduce([in_ar[i] != 0 for i in range(len(names))])
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        result = _evaluate(formula, namespace)
+    out_ar[:] = np.where(valid & np.isfinite(result), result, np.nan)
+
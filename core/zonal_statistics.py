@@ -0,0 +1,424 @@
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from osgeo import gdal, ogr, osr
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsGeometry,
+    QgsProject,
+)
+
+from .cloud_mask import scene_cloud_mask
+from .cog_aio_loader import CogAoiLoader
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+DEFAULT_HISTOGRAM_BINS = 20
+
+# Each output histogram bin is split this many times internally; percentiles
+# are interpolated from the fine histogram, so they are exact to within
+# 1 / (bins * factor) of the value range without keeping per-zone pixels.
+_FINE_BINS_PER_BIN = 50
+
+# Pixels per window read; the zone labels for a window are the same size.
+_WINDOW_PIXELS = 4 * 1024 * 1024
+
+
+# Index formulas for statistics computed on the fly from band arrays; the
+# same definitions as CogBandProcessor.calculate_predefined_index.
+INDEX_FUNCTIONS: Dict[str, Tuple[Tuple[str, ...], Callable[..., np.ndarray]]] = {
+    "NDVI": (("nir", "red"), lambda nir, red: (nir - red) / (nir + red)),
+    "NDWI": (("green", "nir"), lambda green, nir: (green - nir) / (green + nir)),
+    "SAVI": (
+        ("nir", "red"),
+        lambda nir, red: ((nir - red) / (nir + red + 0.5)) * 1.5,
+    ),
+    "EVI": (
+        ("nir", "red", "blue"),
+        lambda nir, red, blue: 2.5 * ((nir - red) / (nir + 6 * red - 7.5 * blue + 1)),
+    ),
+    "GNDVI": (("nir", "green"), lambda nir, green: (nir - green) / (nir + green)),
+}
+
+
+class ZonalStatisticsCancelled(Exception):
+    """Raised between windows once cancellation is requested."""
+
+
+class _ZoneAccumulator:
+    """
+    Running per-zone count, sum, sum of squares, extrema and fine histogram.
+    Zone labels are 1..n; label 0 is outside every zone.
+    """
+
+    def __init__(
+        self, n_zones: int, histogram_bins: int, value_range: Tuple[float, float]
+    ):
+        low, high = float(value_range[0]), float(value_range[1])
+        if high <= low:
+            high = low + 1.0
+        self.n_zones = n_zones
+        self.histogram_bins = histogram_bins
+        self.low, self.high = low, high
+        self.n_fine = histogram_bins * _FINE_BINS_PER_BIN
+        self.counts = np.zeros(n_zones + 1, dtype=np.int64)
+        self.sums = np.zeros(n_zones + 1, dtype=np.float64)
+        self.sums_sq = np.zeros(n_zones + 1, dtype=np.float64)
+        self.minimums = np.full(n_zones + 1, np.inf)
+        self.maximums = np.full(n_zones + 1, -np.inf)
+        self.fine_hist = np.zeros((n_zones + 1) * self.n_fine, dtype=np.int64)
+
+    def add(
+        self, labels: np.ndarray, values: np.ndarray, nodata: Optional[float] = None
+    ) -> None:
+        """Adds a window of values with their zone labels (same shape)."""
+        labels = labels.ravel()
+        inside = labels > 0
+        if not inside.any():
+            return
+        values = values.ravel()[inside].astype(np.float64)
+        labels = labels[inside].astype(np.int64)
+
+        valid = np.isfinite(values)
+        if nodata is not None:
+            valid &= values != nodata
+        values, labels = values[valid], labels[valid]
+        if values.size == 0:
+            return
+
+        size = self.n_zones + 1
+        self.counts += np.bincount(labels, minlength=size)
+        self.sums += np.bincount(labels, weights=values, minlength=size)
+        self.sums_sq += np.bincount(labels, weights=values * values, minlength=size)
+        np.minimum.at(self.minimums, labels, values)
+        np.maximum.at(self.maximums, labels, values)
+
+        fine_bin = ((values - self.low) / (self.high - self.low) * self.n_fine).astype(
+            np.int64
+        )
+        np.clip(fine_bin, 0, self.n_fine - 1, out=fine_bin)
+        self.fine_hist += np.bincount(
+            labels * self.n_fine + fine_bin, minlength=size * self.n_fine
+        )
+
+    def table(self, percentiles: Sequence[float]) -> List[Dict]:
+        """One row of statistics per zone, in label order."""
+        fine_hist = self.fine_hist.reshape(self.n_zones + 1, self.n_fine)
+        fine_edges = np.linspace(self.low, self.high, self.n_fine + 1)
+        edges = fine_edges[::_FINE_BINS_PER_BIN].tolist()
+
+        table = []
+        for label in range(1, self.n_zones + 1):
+            count = int(self.counts[label])
+            stats = {"zone": label - 1, "count": count}
+            if count == 0:
+                stats.update({"mean": None, "std": None, "min": None, "max": None})
+                stats.update({f"p{p:g}": None for p in percentiles})
+                stats["histogram"] = [0] * self.histogram_bins
+            else:
+                mean = self.sums[label] / count
+                variance = max(0.0, self.sums_sq[label] / count - mean * mean)
+                stats.update(
+                    {
+                        "mean": float(mean),
+                        "std": math.sqrt(variance),
+                        "min": float(self.minimums[label]),
+                        "max": float(self.maximums[label]),
+                    }
+                )
+                for p in percentiles:
+                    value = _percentile_from_histogram(
+                        fine_hist[label], fine_edges, count, p
+                    )
+                    stats[f"p{p:g}"] = min(max(value, stats["min"]), stats["max"])
+                stats["histogram"] = (
+                    fine_hist[label]
+                    .reshape(self.histogram_bins, _FINE_BINS_PER_BIN)
+                    .sum(axis=1)
+                    .tolist()
+                )
+            stats["histogram_edges"] = edges
+            table.append(stats)
+        return table
+
+
+def _zone_layer(
+    zones: Sequence[QgsGeometry], transform: Optional[QgsCoordinateTransform], srs
+):
+    """OGR memory layer holding every zone, labelled 1..n in a 'zone' field."""
+    datasource = ogr.GetDriverByName("Memory").CreateDataSource("zones")
+    layer = datasource.CreateLayer("zones", srs, ogr.wkbMultiPolygon)
+    layer.CreateField(ogr.FieldDefn("zone", ogr.OFTInteger))
+    for label, geometry in enumerate(zones, start=1):
+        geometry = QgsGeometry(geometry)
+        if transform is not None:
+            geometry.transform(transform)
+        feature = ogr.Feature(layer.GetLayerDefn())
+        feature.SetField("zone", label)
+        feature.SetGeometry(ogr.CreateGeometryFromWkb(bytes(geometry.asWkb())))
+        layer.CreateFeature(feature)
+    return datasource, layer
+
+
+def _rasterize(
+    zone_layer, geotransform: Tuple[float, ...], width: int, height: int, wkt: str
+) -> np.ndarray:
+    """Zone labels of the layer's (filtered) features on the given pixel grid."""
+    labels_ds = gdal.GetDriverByName("MEM").Create("", width, height, 1, gdal.GDT_Int32)
+    labels_ds.SetGeoTransform(geotransform)
+    labels_ds.SetProjection(wkt)
+    gdal.RasterizeLayer(labels_ds, [1], zone_layer, options=["ATTRIBUTE=zone"])
+    labels = labels_ds.GetRasterBand(1).ReadAsArray()
+    labels_ds = None
+    return labels
+
+
+def _zone_transform(
+    zones_crs: QgsCoordinateReferenceSystem, raster_wkt: str
+) -> Optional[QgsCoordinateTransform]:
+    raster_crs = QgsCoordinateReferenceSystem.fromWkt(raster_wkt)
+    if zones_crs.isValid() and raster_crs.isValid() and zones_crs != raster_crs:
+        return QgsCoordinateTransform(zones_crs, raster_crs, QgsProject.instance())
+    return None
+
+
+def _pixel_bounds(
+    zones: Sequence[QgsGeometry],
+    transform: Optional[QgsCoordinateTransform],
+    geotransform: Tuple[float, ...],
+    width: int,
+    height: int,
+) -> Optional[Tuple[int, int, int, int]]:
+    """Pixel window (col, row, cols, rows) covering all zones, clipped to the raster."""
+    if not zones:
+        return None
+    x0, res_x, _, y0, _, res_y = geotransform
+    xmin = ymin = math.inf
+    xmax = ymax = -math.inf
+    for geometry in zones:
+        box = QgsGeometry(geometry)
+        if transform is not None:
+            box.transform(transform)
+        rect = box.boundingBox()
+        xmin, xmax = min(xmin, rect.xMinimum()), max(xmax, rect.xMaximum())
+        ymin, ymax = min(ymin, rect.yMinimum()), max(ymax, rect.yMaximum())
+
+    col_start = max(0, int(math.floor((xmin - x0) / res_x)))
+    col_stop = min(width, int(math.ceil((xmax - x0) / res_x)))
+    row_start = max(0, int(math.floor((ymax - y0) / res_y)))
+    row_stop = min(height, int(math.ceil((ymin - y0) / res_y)))
+    if col_stop <= col_start or row_stop <= row_start:
+        return None
+    return col_start, row_start, col_stop - col_start, row_stop - row_start
+
+
+def _percentile_from_histogram(
+    counts: np.ndarray, edges: np.ndarray, total: int, percentile: float
+) -> float:
+    target = total * percentile / 100.0
+    cumulative = np.cumsum(counts)
+    index = int(np.searchsorted(cumulative, target))
+    index = min(index, len(counts) - 1)
+    below = cumulative[index - 1] if index > 0 else 0
+    inside = counts[index]
+    fraction = (target - below) / inside if inside else 0.0
+    return float(edges[index] + fraction * (edges[index + 1] - edges[index]))
+
+
+def compute_zonal_statistics(
+    raster_path: str,
+    zones: Sequence[QgsGeometry],
+    zones_crs: QgsCoordinateReferenceSystem,
+    band: int = 1,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    histogram_bins: int = DEFAULT_HISTOGRAM_BINS,
+    value_range: Optional[Tuple[float, float]] = None,
+    is_canceled: Optional[Callable[[], bool]] = None,
+) -> List[Dict]:
+    """
+    Computes statistics of a raster band for many polygons in one pass.
+
+    All zones are rasterized together, window by window, into a label array
+    aligned with the raster window (a pixel belongs to a zone if its centre
+    is inside, as with QgsZonalStatistics; where zones overlap, the later
+    zone wins). Counts, sums, extrema and a per-zone histogram are then
+    accumulated with NumPy, so each raster pixel is read once regardless of
+    the number of zones.
+
+    Args:
+        raster_path: Raster to summarize
+        zones: Polygons, in zones_crs
+        zones_crs: CRS of the polygons; they are transformed to the raster CRS
+        band: Band number to summarize
+        percentiles: Percentiles to report, interpolated from the histogram
+        histogram_bins: Number of bins in the reported histogram
+        value_range: Histogram range; defaults to the band's approximate
+            minimum/maximum. Values outside it fall in the end bins.
+        is_canceled: Polled between windows
+
+    Returns:
+        One row per zone, in the order given: zone index, count, mean, std,
+        min, max, p<percentile> for each percentile, histogram counts and
+        histogram edges. Statistics are None for zones without valid pixels.
+
+    Raises:
+        ZonalStatisticsCancelled: if is_canceled() returns True
+    """
+    ds = gdal.Open(raster_path)
+    if ds is None:
+        raise RuntimeError(f"Could not open raster: {raster_path}")
+    raster_band = ds.GetRasterBand(band)
+    nodata = raster_band.GetNoDataValue()
+    geotransform = ds.GetGeoTransform()
+    wkt = ds.GetProjection()
+    transform = _zone_transform(zones_crs, wkt)
+
+    if value_range is None:
+        value_range = raster_band.ComputeRasterMinMax(True)
+    accumulator = _ZoneAccumulator(len(zones), histogram_bins, value_range)
+
+    bounds = _pixel_bounds(zones, transform, geotransform, ds.RasterXSize, ds.RasterYSize)
+    if bounds is not None:
+        srs = osr.SpatialReference()
+        srs.ImportFromWkt(wkt)
+        zone_source = _zone_layer(zones, transform, srs)  # (datasource, layer)
+        zone_layer = zone_source[1]
+
+        col_off, row_off, cols, rows = bounds
+        window_rows = max(1, _WINDOW_PIXELS // cols)
+
+        for row in range(row_off, row_off + rows, window_rows):
+            if is_canceled is not None and is_canceled():
+                raise ZonalStatisticsCancelled()
+            n_rows = min(window_rows, row_off + rows - row)
+
+            window_geotransform = (
+                geotransform[0] + col_off * geotransform[1],
+                geotransform[1],
+                0.0,
+                geotransform[3] + row * geotransform[5],
+                0.0,
+                geotransform[5],
+            )
+            labels = _rasterize(zone_layer, window_geotransform, cols, n_rows, wkt)
+            if not labels.any():
+                continue
+            values = raster_band.ReadAsArray(col_off, row, cols, n_rows)
+            accumulator.add(labels, values, nodata)
+
+        zone_layer = None
+        zone_source = None
+    ds = None
+
+    return accumulator.table(percentiles)
+
+
+def compute_remote_zonal_statistics(
+    band_urls: Dict[str, str],
+    zones: Sequence[QgsGeometry],
+    zones_crs: QgsCoordinateReferenceSystem,
+    index_name: str = "NDVI",
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    histogram_bins: int = DEFAULT_HISTOGRAM_BINS,
+    value_range: Tuple[float, float] = (-1.0, 1.0),
+    is_canceled: Optional[Callable[[], bool]] = None,
+    cog_loader: Optional[CogAoiLoader] = None,
+) -> List[Dict]:
+    """
+    Computes statistics of a spectral index for many polygons straight from
+    the band COGs of one scene, without downloading or writing any raster.
+
+    For each polygon only the tiles under its bounding box are read from
+    each band (see CogAoiLoader.read_aoi_array), the index is evaluated on
+    those arrays, and the pixels inside the polygon are accumulated as in
+    compute_zonal_statistics. Each polygon is summarized on its own, so
+    overlapping polygons all receive their shared pixels. If band_urls has
+    an "scl" entry, cloudy pixels are left out (see SclCloudMask).
+
+    Args:
+        band_urls: Band name -> COG URL; must contain the index's bands
+        zones: Polygons, in zones_crs
+        zones_crs: CRS of the polygons
+        index_name: One of INDEX_FUNCTIONS
+        percentiles: Percentiles to report, interpolated from the histogram
+        histogram_bins: Number of bins in the reported histogram
+        value_range: Histogram range; values outside it fall in the end bins
+        is_canceled: Polled between polygons and between tile reads
+        cog_loader: Loader to reuse across scenes
+
+    Returns:
+        One row per zone, as in compute_zonal_statistics
+
+    Raises:
+        ZonalStatisticsCancelled: if is_canceled() returns True
+    """
+    if index_name not in INDEX_FUNCTIONS:
+        raise ValueError(
+            f"Unknown index: {index_name}. Available indices: {list(INDEX_FUNCTIONS)}"
+        )
+    required_bands, index_function = INDEX_FUNCTIONS[index_name]
+    missing_bands = [band for band in required_bands if not band_urls.get(band)]
+    if missing_bands:
+        raise ValueError(f"Missing bands for {index_name}: {', '.join(missing_bands)}")
+
+    cog_loader = cog_loader or CogAoiLoader()
+    cloud_mask = scene_cloud_mask(band_urls.get("scl"), cog_loader, is_canceled=is_canceled)
+    accumulator = _ZoneAccumulator(len(zones), histogram_bins, value_range)
+    zone_layers = {}  # raster CRS WKT -> (datasource, layer) with zones in that CRS
+
+    for label, zone in enumerate(zones, start=1):
+        if is_canceled is not None and is_canceled():
+            raise ZonalStatisticsCancelled()
+
+        arrays = {}
+        profile = None
+        for band in required_bands:
+            band_data = cog_loader.read_aoi_array(
+                band_urls[band], zone.boundingBox(), zones_crs, is_canceled
+            )
+            if band_data is None:
+                break
+            data, band_profile = band_data
+            if profile is not None and data.shape[1:] != arrays[required_bands[0]].shape:
+                raise RuntimeError(
+                    f"Bands of {index_name} are not on the same pixel grid"
+                )
+            arrays[band] = data[0].astype(np.float32)
+            profile = profile or band_profile
+        if is_canceled is not None and is_canceled():
+            raise ZonalStatisticsCancelled()
+        if len(arrays) < len(required_bands):
+            continue  # polygon outside the scene, or the read failed
+
+        valid = np.ones(arrays[required_bands[0]].shape, dtype=bool)
+        if profile.get("nodata") is not None:
+            for data in arrays.values():
+                valid &= data != profile["nodata"]
+        if cloud_mask is not None:
+            clear = cloud_mask.clear(profile)
+            if clear is not None:
+                valid &= clear
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = index_function(*(arrays[band] for band in required_bands))
+        values[~valid] = np.nan
+
+        wkt = profile["crs"].to_wkt()
+        if wkt not in zone_layers:
+            srs = osr.SpatialReference()
+            srs.ImportFromWkt(wkt)
+            zone_layers[wkt] = _zone_layer(zones, _zone_transform(zones_crs, wkt), srs)
+        zone_layer = zone_layers[wkt][1]
+        zone_layer.SetAttributeFilter(f"zone = {label}")
+        labels = _rasterize(
+            zone_layer,
+            profile["transform"].to_gdal(),
+            profile["width"],
+            profile["height"],
+            wkt,
+        )
+        zone_layer.SetAttributeFilter(None)
+        accumulator.add(labels, values)
+
+    zone_layers.clear()
+    return accumulator.table(percentiles)
@@ -1,15 +1,31 @@
-from qgis.analysis import QgsZonalStatistics
+from typing import Any, Dict, List, Optional
+
 from qgis.core import (
     QgsTask,
-    QgsRasterLayer,
     QgsGeometry,
     QgsVectorLayer,
-    QgsFeature,
-    QgsFields,
     QgsCoordinateReferenceSystem,  # NEW: Import QgsCoordinateReferenceSystem
 )
 from PyQt5.QtCore import pyqtSignal
 
+from .zonal_statistics import (
+    ZonalStatisticsCancelled,
+    compute_remote_zonal_statistics,
+    compute_zonal_statistics,
+)
+
+
+def layer_zones(layer: QgsVectorLayer, id_field: Optional[str]):
+    """Polygons of a layer and their row ids, read on the calling thread."""
+    zones, zone_ids = [], []
+    for feature in layer.getFeatures():
+        geometry = feature.geometry()
+        if geometry is None or geometry.isEmpty():
+            continue
+        zones.append(QgsGeometry(geometry))
+        zone_ids.append(feature[id_field] if id_field else feature.id())
+    return zones, zone_ids
+
 
 class ZonalStatsTask(QgsTask):
     """
@@ -40,56 +56,218 @@ class ZonalStatsTask(QgsTask):
         """
         try:
             self.setProgress(10)
-            raster_layer = QgsRasterLayer(self.raster_path, "temp_stats_layer")
-            if not raster_layer.isValid():
-                self.exception = Exception(
-                    f"Failed to load raster layer for statistics: {self.raster_path}"
-                )
+            if self.isCanceled():
                 return False
 
+            table = compute_zonal_statistics(
+                self.raster_path,
+                [self.aoi_geometry],
+                self.aoi_crs,
+                is_canceled=self.isCanceled,
+            )
+
+            self.setProgress(90)
+
+            # count, mean, std, min, max, percentiles and histogram; empty if
+            # the AOI holds no valid pixels
+            stats = table[0]
+            self.stats = stats if stats["count"] else {}
+            return True
+
+        except ZonalStatisticsCancelled:
+            return False
+        except Exception as e:
+            self.exception = e
+            return False
+        finally:
+            self.setProgress(100)
+
+    def finished(self, result):
+        """
+        Called on the main thread when the task is finished.
+        """
+        if result:
+            self.calculationFinished.emit(self.stats)
+        else:
+            if self.exception:
+                self.errorOccurred.emit(str(self.exception))
+            else:
+                self.errorOccurred.emit("Zonal statistics task was canceled or failed.")
+
+
+class BatchZonalStatsTask(QgsTask):
+    """
+    A QGIS task to calculate zonal statistics for many polygons at once, e.g.
+    NDVI for every Existing/Potensi polygon of a working area.
+
+    The raster is read once for all polygons (see compute_zonal_statistics);
+    the result is a table with one row per polygon.
+    """
+
+    tableFinished = pyqtSignal(list)  # rows of statistics, one per zone
+    errorOccurred = pyqtSignal(str)
+
+    def __init__(
+        self,
+        raster_path: str,
+        zones: List[QgsGeometry],
+        zones_crs: QgsCoordinateReferenceSystem,
+        zone_ids: Optional[List[Any]] = None,
+    ):
+        super().__init__(
+            f"Zonal Statistics for {len(zones)} polygons", QgsTask.CanCancel
+        )
+        self.raster_path = raster_path
+        self.zones = zones
+        self.zones_crs = zones_crs
+        self.zone_ids = zone_ids
+        self.table = []
+        self.exception = None
+
+    @classmethod
+    def from_layer(
+        cls,
+        raster_path: str,
+        layer: QgsVectorLayer,
+        id_field: Optional[str] = None,
+    ) -> "BatchZonalStatsTask":
+        """
+        Builds the task from the polygons of a vector layer. Features are read
+        here, on the calling (main) thread, since layers are not thread-safe.
+
+        Args:
+            raster_path: Raster to summarize
+            layer: Polygon layer
+            id_field: Attribute identifying each row; feature ids if omitted
+        """
+        zones, zone_ids = layer_zones(layer, id_field)
+        return cls(raster_path, zones, layer.crs(), zone_ids)
+
+    def run(self):
+        """
+        Executes the batch calculation in a background thread.
+        """
+        try:
+            self.setProgress(10)
             if self.isCanceled():
                 return False
 
-            self.setProgress(40)
-
-            # --- REFACTORED: Create an in-memory vector layer for the AOI ---
-            # MODIFIED: Use the correct CRS for the temporary layer
-            mem_layer = QgsVectorLayer(
-                f"Polygon?crs={self.aoi_crs.authid()}", "temp_aoi_layer", "memory"
+            table = compute_zonal_statistics(
+                self.raster_path,
+                self.zones,
+                self.zones_crs,
+                is_canceled=self.isCanceled,
             )
-            provider = mem_layer.dataProvider()
 
-            # Add a feature with the AOI geometry to the memory layer
-            feature = QgsFeature()
-            feature.setGeometry(self.aoi_geometry)
-            provider.addFeatures([feature])
+            if self.zone_ids is not None:
+                for row in table:
+                    row["zone"] = self.zone_ids[row["zone"]]
+            self.table = table
+            return True
 
-            # Use the in-memory layer to calculate zonal statistics
-            zonal_stats = QgsZonalStatistics(
-                mem_layer, raster_layer, stats=QgsZonalStatistics.Mean
-            )
-            zonal_stats.calculateStatistics(None)
+        except ZonalStatisticsCancelled:
+            return False
+        except Exception as e:
+            self.exception = e
+            return False
+        finally:
+            self.setProgress(100)
 
-            self.setProgress(90)
+    def finished(self, result):
+        """
+        Called on the main thread when the task is finished.
+        """
+        if result:
+            self.tableFinished.emit(self.table)
+        else:
+            if self.exception:
+                self.errorOccurred.emit(str(self.exception))
+            else:
+                self.errorOccurred.emit("Zonal statistics task was canceled or failed.")
 
-            # The result is now attached as an attribute to the feature in our memory layer
-            # We need to retrieve that feature to get the calculated mean.
-            feat = next(mem_layer.getFeatures())
 
-            # Find the actual field name for the mean value
-            mean_value = None
-            for field in feat.fields():
-                if "mean" in field.name().lower():
-                    mean_value = feat.attribute(field.name())
-                    break
+class RemoteZonalStatsTask(QgsTask):
+    """
+    A QGIS task to calculate index statistics for many polygons across many
+    scenes, reading only the COG tiles under each polygon (see
+    compute_remote_zonal_statistics). Nothing is downloaded or written.
+    """
 
-            if mean_value is not None:
-                self.stats = {"mean": float(mean_value)}
-            else:
-                self.stats = {"mean": 0.0}
+    tableFinished = pyqtSignal(list)  # rows of statistics, one per scene and zone
+    errorOccurred = pyqtSignal(str)
+
+    def __init__(
+        self,
+        scenes: Dict[str, Dict[str, str]],
+        zones: List[QgsGeometry],
+        zones_crs: QgsCoordinateReferenceSystem,
+        index_name: str = "NDVI",
+        zone_ids: Optional[List[Any]] = None,
+    ):
+        """
+        Args:
+            scenes: Scene id (e.g. stac_id) -> band name -> COG URL
+            zones: Polygons, in zones_crs
+            zones_crs: CRS of the polygons
+            index_name: Index to summarize, e.g. "NDVI"
+            zone_ids: Row id per polygon; polygon indices if omitted
+        """
+        super().__init__(
+            f"{index_name} Statistics for {len(zones)} polygons in {len(scenes)} scenes",
+            QgsTask.CanCancel,
+        )
+        self.scenes = scenes
+        self.zones = zones
+        self.zones_crs = zones_crs
+        self.index_name = index_name
+        self.zone_ids = zone_ids
+        self.table = []
+        self.exception = None
+
+    @classmethod
+    def from_layer(
+        cls,
+        scenes: Dict[str, Dict[str, str]],
+        layer: QgsVectorLayer,
+        index_name: str = "NDVI",
+        id_field: Optional[str] = None,
+    ) -> "RemoteZonalStatsTask":
+        """Builds the task from the polygons of a vector layer (main thread only)."""
+        zones, zone_ids = layer_zones(layer, id_field)
+        return cls(scenes, zones, layer.crs(), index_name, zone_ids)
+
+    def run(self):
+        """
+        Executes the calculation in a background thread, scene by scene.
+        """
+        try:
+            from .cog_aio_loader import CogAoiLoader
+
+            cog_loader = CogAoiLoader()
+            table = []
+            for i, (scene_id, band_urls) in enumerate(self.scenes.items()):
+                if self.isCanceled():
+                    return False
+                rows = compute_remote_zonal_statistics(
+                    band_urls,
+                    self.zones,
+                    self.zones_crs,
+                    self.index_name,
+                    is_canceled=self.isCanceled,
+                    cog_loader=cog_loader,
+                )
+                for row in rows:
+                    if self.zone_ids is not None:
+                        row["zone"] = self.zone_ids[row["zone"]]
+                    row["scene"] = scene_id
+                table.extend(rows)
+                self.setProgress(100 * (i + 1) / len(self.scenes))
 
+            self.table = table
             return True
 
+        except ZonalStatisticsCancelled:
+            return False
         except Exception as e:
             self.exception = e
             return False
@@ -101,7 +279,7 @@ class ZonalStatsTask(QgsTask):
         Called on the main thread when the task is finished.
         """
         if result:
-            self.calculationFinished.emit(self.stats)
+            self.tableFinished.emit(self.table)
         else:
             if self.exception:
                 self.errorOccurred.emit(str(self.exception))
@@ -1,5 +1,7 @@
+import csv
 import tempfile
-from typing import Optional, List, Dict, Any
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Union
 import os
 import re
 
@@ -19,6 +21,8 @@ from qgis.core import (
     QgsCoordinateReferenceSystem,
     QgsCoordinateTransform,
     QgsGeometry,
+    QgsVectorLayer,
+    QgsWkbTypes,
 )
 
 from PyQt5.QtWidgets import (
@@ -29,16 +33,16 @@ from PyQt5.QtWidgets import (
     QLabel,
     QPushButton,
     QDialog,
-    QScrollArea,
     QMessageBox,
     QProgressBar,
     QProgressDialog,
     QComboBox,
-    QFrame,
+    QFileDialog,
+    QInputDialog,
+    QMenu,
 )
 from PyQt5.QtGui import QPixmap, QPainter, QPainterPath, QBrush, QColor
-from PyQt5.QtCore import QSettings, QTimer, Qt, QUrl, QRectF, pyqtSignal
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt5.QtCore import QSettings, QTimer, Qt, QRectF, pyqtSignal
 
 from ..config import Config
 from .base_dialog import BaseDialog
@@ -46,11 +50,14 @@ from .ndvi_style_dialog import NdviStyleDialog
 from .raster_calculator_dialog import RasterCalculatorDialog
 from .spinner_widget import SpinnerWidget
 from .aoi_map_tool import AoiMapTool
+from .raster_list_view import RasterListView
 from ..core import (
+    BatchZonalStatsTask,
     NdviTask,
     FalseColorTask,
     RasterAsset,
     RasterCalculatorTask,
+    RemoteZonalStatsTask,
     ZonalStatsTask,
     CogAoiLoader,
     CogBandProcessor,
@@ -60,217 +67,36 @@ from ..core import (
     AoiNdviProcessingTask,
     AoiFalseColorProcessingTask,
     AoiCustomCalculationTask,
+    CacheCompactionTask,
+    CacheManager,
+    CatalogIndex,
+    CogIngestTask,
+    DownloadManager,
+    LocalProductIndex,
+    PRIORITY_NORMAL,
+    PRIORITY_VISIBLE,
+    ThumbnailLoader,
+)
+from ..core.compositing import (
+    COMPOSITE_METHODS,
+    TemporalCompositeTask,
+    least_cloudy,
+    max_composite_scenes,
+)
+from ..core.mosaic import select_mosaic_tiles, tile_band_urls
+from ..core.time_series import TABLE_COLUMNS, TimeSeriesTask, select_scenes
+from ..core.zonal_statistics import INDEX_FUNCTIONS
+from ..core.zonal_stats_worker import layer_zones
+from ..core.virtual_products import (
+    VirtualProductTask,
+    write_custom_index_vrt,
+    write_false_color_vrt,
+    write_ndvi_vrt,
 )
 from ..core.util import add_basemap_global_osm
 from .themed_message_box import ThemedMessageBox
 
 
-class AoiCacheManager:
-    """Manages timestamped AOI cache files to prevent disk space issues."""
-
-    def __init__(self, cache_base_dir: str):
-        self.cache_base_dir = cache_base_dir
-
-    def cleanup_old_aoi_files(
-        self, max_age_hours: int = 24, max_files_per_asset: int = 5
-    ):
-        """
-        Clean up old timestamped AOI files to manage disk space.
-
-        Args:
-            max_age_hours: Remove files older than this many hours
-            max_files_per_asset: Keep only the newest N files per asset
-        """
-        try:
-            QgsMessageLog.logMessage(
-                f"Starting AOI cache cleanup (age: {max_age_hours}h, max per asset: {max_files_per_asset})",
-                "AOICacheManager",
-                Qgis.Info,
-            )
-
-            current_time = time.time()
-            max_age_seconds = max_age_hours * 3600
-
-            # Statistics
-            files_removed = 0
-            space_freed_mb = 0
-
-            # Walk through all cache directories
-            for root, dirs, files in os.walk(self.cache_base_dir):
-                # Group timestamped files by asset and type
-                file_groups = self._group_timestamped_files(root, files)
-
-                for group_key, file_list in file_groups.items():
-                    asset_id, file_type = group_key
-
-                    # Sort by timestamp (newest first)
-                    file_list.sort(key=lambda x: x["timestamp"], reverse=True)
-
-                    # Remove files older than max_age
-                    for file_info in file_list:
-                        file_path = file_info["path"]
-                        file_age = current_time - os.path.getmtime(file_path)
-
-                        should_remove = False
-                        reason = ""
-
-                        if file_age > max_age_seconds:
-                            should_remove = True
-                            reason = f"age ({file_age/3600:.1f}h)"
-                        elif (
-                            len([f for f in file_list if not f.get("to_remove", False)])
-                            > max_files_per_asset
-                        ):
-                            should_remove = True
-                            reason = f"excess (keeping newest {max_files_per_asset})"
-
-                        if should_remove:
-                            try:
-                                file_size = os.path.getsize(file_path)
-                                os.remove(file_path)
-                                files_removed += 1
-                                space_freed_mb += file_size / (1024 * 1024)
-
-                                QgsMessageLog.logMessage(
-                                    f"Removed {os.path.basename(file_path)} ({reason})",
-                                    "AOICacheManager",
-                                    Qgis.Info,
-                                )
-
-                                file_info["to_remove"] = True
-
-                            except Exception as e:
-                                QgsMessageLog.logMessage(
-                                    f"Error removing {file_path}: {str(e)}",
-                                    "AOICacheManager",
-                                    Qgis.Warning,
-                                )
-
-            # Remove empty directories
-            self._remove_empty_directories()
-
-            QgsMessageLog.logMessage(
-                f"AOI cache cleanup completed: {files_removed} files removed, {space_freed_mb:.1f} MB freed",
-                "AOICacheManager",
-                Qgis.Info,
-            )
-
-            return {"files_removed": files_removed, "space_freed_mb": space_freed_mb}
-
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f"Error during AOI cache cleanup: {str(e)}",
-                "AOICacheManager",
-                Qgis.Critical,
-            )
-            return {"files_removed": 0, "space_freed_mb": 0}
-
-    def _group_timestamped_files(self, directory: str, files: list) -> dict:
-        """Group timestamped AOI files by asset ID and type."""
-        file_groups = {}
-
-        for filename in files:
-            if not filename.endswith(".tif"):
-                continue
-
-            # Parse timestamped filename: ASSET_TYPE_aoi_TIMESTAMP.tif
-            if "_aoi_" in filename and filename.count("_") >= 3:
-                parts = filename.replace(".tif", "").split("_")
-
-                # Find the aoi part
-                try:
-                    aoi_index = parts.index("aoi")
-                    if aoi_index + 1 < len(parts):
-                        # Extract asset_id, file_type, and timestamp
-                        asset_parts = parts[: aoi_index - 1]  # Everything before type
-                        file_type = parts[aoi_index - 1]  # Type (ndvi, visual, etc.)
-                        timestamp = parts[aoi_index + 1]  # Timestamp after 'aoi'
-
-                        asset_id = "_".join(asset_parts)
-                        group_key = (asset_id, file_type)
-
-                        if group_key not in file_groups:
-                            file_groups[group_key] = []
-
-                        file_groups[group_key].append(
-                            {
-                                "path": os.path.join(directory, filename),
-                                "timestamp": timestamp,
-                                "asset_id": asset_id,
-                                "file_type": file_type,
-                            }
-                        )
-
-                except (ValueError, IndexError):
-                    # Not a properly formatted timestamped file
-                    continue
-
-        return file_groups
-
-    def _remove_empty_directories(self):
-        """Remove empty cache directories."""
-        for root, dirs, files in os.walk(self.cache_base_dir, topdown=False):
-            for dir_name in dirs:
-                dir_path = os.path.join(root, dir_name)
-                try:
-                    if not os.listdir(dir_path):  # Directory is empty
-                        os.rmdir(dir_path)
-                        QgsMessageLog.logMessage(
-                            f"Removed empty directory: {dir_name}",
-                            "AOICacheManager",
-                            Qgis.Info,
-                        )
-                except:
-                    pass
-
-    def get_cache_statistics(self) -> dict:
-        """Get statistics about AOI cache usage."""
-        try:
-            total_size = 0
-            file_count = 0
-            asset_count = 0
-            assets = set()
-
-            for root, dirs, files in os.walk(self.cache_base_dir):
-                for filename in files:
-                    if filename.endswith(".tif") and "_aoi_" in filename:
-                        file_path = os.path.join(root, filename)
-                        try:
-                            total_size += os.path.getsize(file_path)
-                            file_count += 1
-
-                            # Extract asset ID for counting
-                            parts = filename.split("_")
-                            if len(parts) >= 3:
-                                asset_id = parts[0]  # First part is usually asset ID
-                                assets.add(asset_id)
-
-                        except:
-                            pass
-
-            return {
-                "total_size_mb": total_size / (1024 * 1024),
-                "file_count": file_count,
-                "asset_count": len(assets),
-                "avg_size_per_file_mb": (
-                    (total_size / file_count / (1024 * 1024)) if file_count > 0 else 0
-                ),
-            }
-
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f"Error getting cache statistics: {str(e)}",
-                "AOICacheManager",
-                Qgis.Warning,
-            )
-            return {
-                "total_size_mb": 0,
-                "file_count": 0,
-                "asset_count": 0,
-                "avg_size_per_file_mb": 0,
-            }
-
-
 class RoundedImageLabel(QLabel):
     """A custom label for displaying pixmaps with rounded corners."""
 
@@ -310,7 +136,10 @@ class RoundedImageLabel(QLabel):
 
 
 class RasterItemWidget(QWidget):
-    """A widget to display a single raster asset with its details and actions."""
+    """
+    A widget to display a single raster asset with its details and actions.
+    Instances are pooled by RasterListView and rebound with set_asset().
+    """
 
     downloadVisualRequested = pyqtSignal(RasterAsset)
     openVisualRequested = pyqtSignal(RasterAsset)
@@ -323,20 +152,24 @@ class RasterItemWidget(QWidget):
     zoomToExtentRequested = pyqtSignal(dict)
     cancelOperationRequested = pyqtSignal(str)
     selectAoiRequested = pyqtSignal(RasterAsset)
+    refreshed = pyqtSignal()
 
     def __init__(
         self,
-        asset: RasterAsset,
+        asset: Optional[RasterAsset],
         dialog: "ImageListDialog",
         parent: Optional[QWidget] = None,
     ):
         super().__init__(parent)
-        self.asset = asset
+        self.asset: Optional[RasterAsset] = None
         self.dialog = dialog
         self.setObjectName("rasterItem")
         self.setAutoFillBackground(True)
-        self.network_manager = QNetworkAccessManager(self)
-        self.network_manager.finished.connect(self._handle_thumbnail_loaded)
+        self.thumbnail_loader = ThumbnailLoader.instance()
+        self.thumbnail_loader.thumbnailReady.connect(self._handle_thumbnail_loaded)
+        self.local_products = LocalProductIndex.instance()
+        self.local_products.productsChanged.connect(self._on_local_products_changed)
+        self._pending_thumbnail_url: Optional[str] = None
 
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(15, 15, 15, 15)
@@ -346,13 +179,12 @@ class RasterItemWidget(QWidget):
         self.thumb_label.setFixedSize(202, 148)
         self.thumb_label.clicked.connect(self._on_thumbnail_clicked)
         main_layout.addWidget(self.thumb_label)
-        self.load_thumbnail()
 
         details_layout = QVBoxLayout()
         details_layout.setSpacing(4)
 
         title_layout = QHBoxLayout()
-        self.stac_id_label = QLabel(self.asset.stac_id)
+        self.stac_id_label = QLabel()
         self.stac_id_label.setObjectName("rasterTitle")
 
         self.spinner_widget = SpinnerWidget(self)
@@ -366,17 +198,14 @@ class RasterItemWidget(QWidget):
         details_layout.addLayout(title_layout)
         details_layout.addStretch(1)
 
-        date_str = "N/A"
-        if self.asset.capture_date:
-            date_str = self.asset.capture_date.strftime("%d %b %Y %H:%M:%S")
-        published_label = QLabel(f"Published on: {date_str}")
-        published_label.setObjectName("rasterSubtitle")
-        cloud_label = QLabel(f"Cloud Cover: {self.asset.cloud_cover:.2f}%")
-        cloud_label.setObjectName("rasterCloud")
-
-        details_layout.addWidget(published_label)
+        self.published_label = QLabel()
+        self.published_label.setObjectName("rasterSubtitle")
+        self.cloud_label = QLabel()
+        self.cloud_label.setObjectName("rasterCloud")
+
+        details_layout.addWidget(self.published_label)
         details_layout.addStretch(1)
-        details_layout.addWidget(cloud_label)
+        details_layout.addWidget(self.cloud_label)
         details_layout.addStretch(2)
         main_layout.addLayout(details_layout)
         main_layout.addStretch()
@@ -384,10 +213,32 @@ class RasterItemWidget(QWidget):
         right_column_layout = self._create_actions_layout()
         main_layout.addLayout(right_column_layout)
 
+        if asset is not None:
+            self.set_asset(asset)
+
+    def set_asset(self, asset: RasterAsset):
+        """Binds the widget to another asset, reusing all child widgets."""
+        if asset is self.asset:
+            self.update_ui_based_on_local_files()
+            return
+        self.asset = asset
+        self.stac_id_label.setText(asset.stac_id)
+        date_str = "N/A"
+        if asset.capture_date:
+            date_str = asset.capture_date.strftime("%d %b %Y %H:%M:%S")
+        self.published_label.setText(f"Published on: {date_str}")
+        self.cloud_label.setText(f"Cloud Cover: {asset.cloud_cover:.2f}%")
+        self.thumb_label.setPixmap(QPixmap())
+        self.load_thumbnail()
         self.update_ui_based_on_local_files()
 
+    def unbind(self):
+        """Detaches the widget from its asset when it scrolls out of view."""
+        self._cancel_thumbnail()
+        self.asset = None
+
     def _on_thumbnail_clicked(self):
-        if self.asset.geometry:
+        if self.asset is not None and self.asset.geometry:
             self.zoomToExtentRequested.emit(self.asset.geometry)
 
     def _create_actions_layout(self) -> QVBoxLayout:
@@ -507,20 +358,35 @@ class RasterItemWidget(QWidget):
         return pbar
 
     def load_thumbnail(self):
-        if self.asset.thumbnail_url:
-            request = QNetworkRequest(QUrl(self.asset.thumbnail_url))
-            self.network_manager.get(request)
-
-    def _handle_thumbnail_loaded(self, reply: QNetworkReply):
-        if reply.error() == QNetworkReply.NoError:
-            pixmap = QPixmap()
-            pixmap.loadFromData(reply.readAll())
+        # A recycled widget must not keep waiting for the previous asset's thumbnail
+        self._cancel_thumbnail()
+        url = self.asset.thumbnail_url
+        if not url:
+            return
+        pixmap = self.thumbnail_loader.request(url)
+        if pixmap is not None:
+            self.thumb_label.setPixmap(pixmap)
+        else:
+            self._pending_thumbnail_url = url
+
+    def _cancel_thumbnail(self):
+        if self._pending_thumbnail_url:
+            self.thumbnail_loader.cancel(self._pending_thumbnail_url)
+            self._pending_thumbnail_url = None
+
+    def _handle_thumbnail_loaded(self, url: str, pixmap: QPixmap):
+        # Also picks up refreshed thumbnails after ETag revalidation
+        if self.asset is not None and url == self.asset.thumbnail_url:
+            self._pending_thumbnail_url = None
             self.thumb_label.setPixmap(pixmap)
-        reply.deleteLater()
+
+    def _on_local_products_changed(self, stac_id: str):
+        if self.asset is not None and stac_id == self.asset.stac_id:
+            self.update_ui_based_on_local_files()
 
     def _on_visual_button_clicked(self):
         visual_path = self.asset.get_local_path("visual")
-        if os.path.exists(visual_path) and os.path.getsize(visual_path) > 0:
+        if self.local_products.exists(visual_path):
             self.openVisualRequested.emit(self.asset)
         else:
             self.downloadVisualRequested.emit(self.asset)
@@ -574,20 +440,22 @@ class RasterItemWidget(QWidget):
 
     def update_ui_based_on_local_files(self):
         """Updates UI based on local files and checks for ongoing operations."""
+        if self.asset is None:
+            return
         visual_path = self.asset.get_local_path("visual")
-        if os.path.exists(visual_path) and os.path.getsize(visual_path) > 0:
+        if self.local_products.exists(visual_path):
             self.btn_visual.setText("Open Visual")
         else:
             self.btn_visual.setText("Download Visual")
 
         ndvi_path = self.asset.get_local_path("ndvi")
-        if os.path.exists(ndvi_path) and os.path.getsize(ndvi_path) > 0:
+        if self.local_products.exists(ndvi_path):
             self.btn_ndvi.setText("Open NDVI")
         else:
             self.btn_ndvi.setText("Process NDVI")
 
         fc_path = self.asset.get_local_path("false_color")
-        if os.path.exists(fc_path) and os.path.getsize(fc_path) > 0:
+        if self.local_products.exists(fc_path):
             self.btn_false_color.setText("Open False Color")
         else:
             self.btn_false_color.setText("Process False Color")
@@ -645,6 +513,8 @@ class RasterItemWidget(QWidget):
             )
             self._update_custom_output_buttons()
 
+        self.refreshed.emit()
+
     def _clear_layout(self, layout):
         if layout is not None:
             while layout.count():
@@ -658,11 +528,8 @@ class RasterItemWidget(QWidget):
     def _update_custom_output_buttons(self):
         self._clear_layout(self.custom_outputs_layout)
         folder_path = os.path.join(Config.DOWNLOAD_DIR, self.asset.stac_id)
-        if not os.path.isdir(folder_path):
-            self.custom_outputs_container.setVisible(False)
-            return
         has_custom_outputs = False
-        for filename in os.listdir(folder_path):
+        for filename in sorted(self.local_products.files(folder_path)):
             if filename.startswith(f"{self.asset.stac_id}_") and filename.endswith(
                 ".tif"
             ):
@@ -693,11 +560,18 @@ class RasterItemWidget(QWidget):
 
 
 class ImageListDialog(BaseDialog):
-    """Dialog to display a list of raster assets with filtering and pagination."""
+    """Dialog to display a list of raster assets with filtering and a virtualized list."""
+
+    # Cloud filter label -> (min, max, min_inclusive)
+    CLOUD_FILTER_RANGES = {
+        "0 - 10%": (0, 10, True),
+        "10 - 20%": (10, 20, False),
+        "20 - 30%": (20, 30, False),
+    }
 
     def __init__(
         self,
-        data: List[Dict[str, Any]],
+        data: List[Union[Dict[str, Any], RasterAsset]],
         iface: QgisInterface,
         parent: Optional[QWidget] = None,
         aoi: Optional[QgsRectangle] = None,
@@ -740,18 +614,62 @@ class ImageListDialog(BaseDialog):
             )
 
         self.iface = iface
-        self.all_assets = [RasterAsset(feature) for feature in data]
+        self.all_assets = self._to_assets(data)
+        self.catalog_index = CatalogIndex(self.all_assets)
         self.filtered_assets: List[RasterAsset] = []
-        self.download_network_manager = QNetworkAccessManager(self)
+        self.download_manager = DownloadManager(parent=self)
+        self.local_products = LocalProductIndex.instance()
+        self._cache_compaction_task = None
+        self.download_manager.metricsUpdated.connect(self._update_download_metrics)
         self.active_operations: Dict[str, Any] = {}
-        self.current_page = 1
-        self.items_per_page = 5
         self.aoi_tool = None
         self.previous_map_tool = None
 
         self.init_list_ui()
         self._apply_filters()
         add_basemap_global_osm(self.iface, zoom=False)
+        # Trim the AOI cache to its byte budget off the UI thread
+        self._cleanup_old_aoi_cache()
+
+    @staticmethod
+    def _to_assets(data: List[Union[Dict[str, Any], RasterAsset]]) -> List[RasterAsset]:
+        """Accepts GeoJSON features or already parsed (e.g. cached) RasterAssets."""
+        return [
+            item if isinstance(item, RasterAsset) else RasterAsset(item)
+            for item in data
+        ]
+
+    def update_features(
+        self,
+        data: List[Union[Dict[str, Any], RasterAsset]],
+        aoi: Optional[QgsRectangle] = None,
+    ):
+        """Replaces the catalog shown by the dialog, e.g. after a background refresh."""
+        if aoi is not None:
+            self.aoi = aoi
+        self.all_assets = self._to_assets(data)
+        self.catalog_index = CatalogIndex(self.all_assets)
+        self._apply_filters()
+
+    def append_assets(self, data: List[Union[Dict[str, Any], RasterAsset]]):
+        """
+        Adds a streamed catalog page without resetting the list, so rows the
+        user is looking at stay in place while later pages arrive.
+        """
+        new_assets = self._to_assets(data)
+        if not new_assets:
+            return
+        self.all_assets.extend(new_assets)
+        self.catalog_index.add_assets(new_assets)
+        # Results come back in catalog order, so earlier matches are a prefix
+        filtered = self._query_catalog()
+        appended = filtered[len(self.filtered_assets) :]
+        self.filtered_assets = filtered
+        if appended:
+            self.list_view.append_assets(appended)
+            self.list_view.setVisible(True)
+            self.no_results_label.setVisible(False)
+        self._update_list_status()
 
     def init_list_ui(self):
         self.setWindowTitle("Citra Satelit")
@@ -781,24 +699,51 @@ class ImageListDialog(BaseDialog):
         self.cloud_filter_combo.addItems(["All", "0 - 10%", "10 - 20%", "20 - 30%"])
         self.cloud_filter_combo.currentIndexChanged.connect(self._apply_filters)
         filter_layout.addWidget(self.cloud_filter_combo)
+        self.analysis_button = QPushButton(
+            "Analysis", objectName="actionButton", cursor=Qt.PointingHandCursor
+        )
+        self.analysis_menu = QMenu(self)
+        self.analysis_menu.addAction(
+            "Zonal Statistics for Layer Polygons...", self._run_batch_zonal_stats
+        )
+        self.analysis_menu.addAction(
+            "Index Time Series for Layer Polygons...", self._run_time_series
+        )
+        self.analysis_menu.addAction(
+            "Cloud-free Composite of AOI...", self._run_temporal_composite
+        )
+        self.analysis_button.setMenu(self.analysis_menu)
+        filter_layout.addWidget(self.analysis_button)
         header_layout.addLayout(filter_layout)
         main_layout.addLayout(header_layout)
         main_layout.addSpacing(20)
 
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setObjectName("scrollArea")
-        scroll_area.setFrameShape(QFrame.NoFrame)
-        scroll_area.viewport().setObjectName("scrollAreaViewport")
-        scroll_content = QWidget()
-        scroll_content.setObjectName("scrollContent")
-        self.list_layout = QVBoxLayout(scroll_content)
-        self.list_layout.setContentsMargins(20, 20, 20, 20)
-        self.list_layout.setSpacing(15)
-        self.list_layout.addStretch()
-        scroll_area.setWidget(scroll_content)
-        main_layout.addWidget(scroll_area)
-        main_layout.addLayout(self._create_pagination_controls())
+        self.list_view = RasterListView(self._create_item_widget)
+        self.list_view.list_model.rowsInserted.connect(self._update_list_status)
+        self.list_view.visibleRowsChanged.connect(self._prefetch_thumbnails)
+        self.list_view.visibleRowsChanged.connect(self._update_download_priorities)
+        main_layout.addWidget(self.list_view, 1)
+
+        self.no_results_label = QLabel("No assets match the current filter.")
+        self.no_results_label.setObjectName("noResultsLabel")
+        self.no_results_label.setAlignment(Qt.AlignCenter)
+        self.no_results_label.setVisible(False)
+        main_layout.addWidget(self.no_results_label, 1)
+
+        footer_layout = QHBoxLayout()
+        self.list_status_label = QLabel("", objectName="pageLabel")
+        footer_layout.addWidget(self.list_status_label)
+        footer_layout.addStretch()
+        self.download_metrics_label = QLabel("", objectName="downloadMetrics")
+        self.download_metrics_label.setVisible(False)
+        footer_layout.addWidget(self.download_metrics_label)
+        self.pause_downloads_button = QPushButton(
+            "Pause Downloads", objectName="actionButton", cursor=Qt.PointingHandCursor
+        )
+        self.pause_downloads_button.clicked.connect(self._toggle_downloads_paused)
+        self.pause_downloads_button.setVisible(False)
+        footer_layout.addWidget(self.pause_downloads_button)
+        main_layout.addLayout(footer_layout)
 
         self.apply_stylesheet()
 
@@ -821,11 +766,12 @@ class ImageListDialog(BaseDialog):
         return aoi_layout
 
     def _apply_filters(self):
-        assets_to_filter = self.all_assets
+        self.filtered_assets = self._query_catalog()
+        self.update_list()
 
+    def _query_catalog(self) -> List[RasterAsset]:
+        aoi_geom = None
         if self.aoi:
-            aoi_filtered_assets = []
-
             canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
             asset_crs = QgsCoordinateReferenceSystem("EPSG:4326")
             transform = QgsCoordinateTransform(
@@ -835,45 +781,17 @@ class ImageListDialog(BaseDialog):
             aoi_geom = QgsGeometry.fromRect(self.aoi)
             aoi_geom.transform(transform)
 
-            for asset in assets_to_filter:
-                if not asset.geometry:
-                    continue
-
-                try:
-                    asset_geom = QgsGeometry.fromWkt(
-                        "POLYGON(("
-                        + ", ".join(
-                            [f"{p[0]} {p[1]}" for p in asset.geometry["coordinates"][0]]
-                        )
-                        + "))"
-                    )
-                    if asset_geom.intersects(aoi_geom):
-                        aoi_filtered_assets.append(asset)
-                except Exception:
-                    continue
-
-            assets_to_filter = aoi_filtered_assets
-
         filter_text = self.cloud_filter_combo.currentText()
-        if filter_text == "All":
-            self.filtered_assets = assets_to_filter
-        elif filter_text == "0 - 10%":
-            self.filtered_assets = [
-                a for a in assets_to_filter if 0 <= a.cloud_cover <= 10
-            ]
-        elif filter_text == "10 - 20%":
-            self.filtered_assets = [
-                a for a in assets_to_filter if 10 < a.cloud_cover <= 20
-            ]
-        elif filter_text == "20 - 30%":
-            self.filtered_assets = [
-                a for a in assets_to_filter if 20 < a.cloud_cover <= 30
-            ]
-        else:
-            self.filtered_assets = assets_to_filter
+        cloud_min, cloud_max, min_inclusive = self.CLOUD_FILTER_RANGES.get(
+            filter_text, (None, None, True)
+        )
 
-        self.current_page = 1
-        self.update_list_and_pagination()
+        return self.catalog_index.query(
+            aoi_geom=aoi_geom,
+            cloud_min=cloud_min,
+            cloud_max=cloud_max,
+            cloud_min_inclusive=min_inclusive,
+        )
 
     def _create_top_bar(self) -> QHBoxLayout:
         layout = QHBoxLayout()
@@ -888,100 +806,94 @@ class ImageListDialog(BaseDialog):
         layout.addLayout(self._create_window_controls())
         return layout
 
-    def _create_pagination_controls(self) -> QHBoxLayout:
-        layout = QHBoxLayout()
-        self.prev_button = QPushButton(
-            "← Previous", objectName="paginationButton", cursor=Qt.PointingHandCursor
+    def _create_item_widget(self, parent: QWidget) -> RasterItemWidget:
+        """Creates a pooled item widget for the list view; signals are wired once."""
+        item_widget = RasterItemWidget(None, self, parent)
+        item_widget.downloadVisualRequested.connect(
+            self._handle_download_visual_requested
         )
-        self.prev_button.clicked.connect(self.prev_page)
-        self.page_label = QLabel("Page 1", objectName="pageLabel")
-        self.next_button = QPushButton(
-            "Next →", objectName="paginationButton", cursor=Qt.PointingHandCursor
+        item_widget.openVisualRequested.connect(self._handle_open_visual_requested)
+        item_widget.processNdviRequested.connect(self._handle_process_ndvi_requested)
+        item_widget.processFalseColorRequested.connect(
+            self._handle_process_false_color_requested
+        )
+        item_widget.openNdviRequested.connect(self._handle_open_ndvi_requested)
+        item_widget.openFalseColorRequested.connect(
+            self._handle_open_false_color_requested
+        )
+        item_widget.customCalculationRequested.connect(
+            self._handle_custom_calculation_requested
+        )
+        item_widget.classifyCustomRequested.connect(
+            self._handle_classify_custom_requested
+        )
+        item_widget.zoomToExtentRequested.connect(self._handle_zoom_to_extent)
+        item_widget.cancelOperationRequested.connect(
+            self._handle_cancel_operation_requested
+        )
+        item_widget.selectAoiRequested.connect(self._handle_select_aoi_requested)
+        return item_widget
+
+    def update_list(self):
+        has_results = bool(self.filtered_assets)
+        self.list_view.setVisible(has_results)
+        self.no_results_label.setVisible(not has_results)
+        self.list_view.set_assets(self.filtered_assets)
+        self._update_list_status()
+
+    def _prefetch_thumbnails(self, first: int, stop: int):
+        """Warms the thumbnail cache for the next screenful of rows."""
+        upcoming = self.list_view.list_model.assets_in_range(stop, stop + (stop - first))
+        ThumbnailLoader.instance().prefetch(a.thumbnail_url for a in upcoming)
+
+    def _update_download_priorities(self, *args):
+        """Downloads of assets on screen are scheduled ahead of the others."""
+        visible = {
+            w.asset.stac_id for w in self.list_view.bound_widgets() if w.asset is not None
+        }
+        for op_key, op in self.active_operations.items():
+            asset = op.get("asset")
+            priority = (
+                PRIORITY_VISIBLE
+                if asset is not None and asset.stac_id in visible
+                else PRIORITY_NORMAL
+            )
+            self.download_manager.set_group_priority(op_key, priority)
+
+    def _update_download_metrics(self, metrics: Dict[str, Any]):
+        has_jobs = metrics["jobs"] > 0
+        self.download_metrics_label.setVisible(has_jobs)
+        self.pause_downloads_button.setVisible(has_jobs or metrics["paused"])
+        self.pause_downloads_button.setText(
+            "Resume Downloads" if metrics["paused"] else "Pause Downloads"
+        )
+        if not has_jobs:
+            return
+        rate_mb = metrics["bytes_per_sec"] / (1024 * 1024)
+        state = "paused" if metrics["paused"] else f"{rate_mb:.1f} MB/s"
+        self.download_metrics_label.setText(
+            f"Downloads: {state} · {metrics['active_connections']} active · "
+            f"{metrics['queued_segments']} queued"
         )
-        self.next_button.clicked.connect(self.next_page)
-        layout.addWidget(self.prev_button)
-        layout.addStretch()
-        layout.addWidget(self.page_label)
-        layout.addStretch()
-        layout.addWidget(self.next_button)
-        return layout
-
-    def update_list_and_pagination(self):
-        while self.list_layout.count() > 1:
-            item = self.list_layout.takeAt(0)
-            if widget := item.widget():
-                widget.setParent(None)
-                widget.deleteLater()
-
-        if self.list_layout.count() > 1 and isinstance(
-            self.list_layout.itemAt(0).widget(), QLabel
-        ):
-            self.list_layout.itemAt(0).widget().deleteLater()
-
-        if not self.filtered_assets:
-            no_results_label = QLabel("No assets match the current filter.")
-            no_results_label.setObjectName("noResultsLabel")
-            no_results_label.setAlignment(Qt.AlignCenter)
-            self.list_layout.insertWidget(0, no_results_label)
-
-        start_index = (self.current_page - 1) * self.items_per_page
-        paginated_assets = self.filtered_assets[
-            start_index : start_index + self.items_per_page
-        ]
-
-        for asset in paginated_assets:
-            item_widget = RasterItemWidget(asset, self, self.list_layout.parentWidget())
-            item_widget.downloadVisualRequested.connect(
-                self._handle_download_visual_requested
-            )
-            item_widget.openVisualRequested.connect(self._handle_open_visual_requested)
-            item_widget.processNdviRequested.connect(
-                self._handle_process_ndvi_requested
-            )
-            item_widget.processFalseColorRequested.connect(
-                self._handle_process_false_color_requested
-            )
-            item_widget.openNdviRequested.connect(self._handle_open_ndvi_requested)
-            item_widget.openFalseColorRequested.connect(
-                self._handle_open_false_color_requested
-            )
-            item_widget.customCalculationRequested.connect(
-                self._handle_custom_calculation_requested
-            )
-            item_widget.classifyCustomRequested.connect(
-                self._handle_classify_custom_requested
-            )
-            item_widget.zoomToExtentRequested.connect(self._handle_zoom_to_extent)
-            item_widget.cancelOperationRequested.connect(
-                self._handle_cancel_operation_requested
-            )
-            item_widget.selectAoiRequested.connect(self._handle_select_aoi_requested)
-            self.list_layout.insertWidget(self.list_layout.count() - 1, item_widget)
-
-        total_pages = (
-            len(self.filtered_assets) + self.items_per_page - 1
-        ) // self.items_per_page
-        self.page_label.setText(f"Page {self.current_page} of {max(1, total_pages)}")
-        self.prev_button.setEnabled(self.current_page > 1)
-        self.next_button.setEnabled(self.current_page < total_pages)
 
-    def prev_page(self):
-        if self.current_page > 1:
-            self.current_page -= 1
-            self.update_list_and_pagination()
+    def _toggle_downloads_paused(self):
+        if self.download_manager.is_paused():
+            self.download_manager.resume_all()
+        else:
+            self.download_manager.pause_all()
 
-    def next_page(self):
-        total_pages = (
-            len(self.filtered_assets) + self.items_per_page - 1
-        ) // self.items_per_page
-        if self.current_page < total_pages:
-            self.current_page += 1
-            self.update_list_and_pagination()
+    def _update_list_status(self, *args):
+        model = self.list_view.list_model
+        self.list_status_label.setText(
+            f"Showing {model.rowCount()} of {model.total_count()} images"
+        )
 
     def _on_aoi_visual_processed(
         self, output_path: str, asset_id: str, layer_name: str
     ):
         """Handle completion of visual AOI processing."""
+        self.local_products.notify_written(output_path)
+        self._get_cache_manager().register(output_path, key=asset_id, pinned=True)
         try:
             # Clean up operation tracking
             op_key = f"{asset_id}_visual_aoi"
@@ -1011,6 +923,8 @@ class ImageListDialog(BaseDialog):
 
     def _on_aoi_ndvi_processed(self, output_path: str, asset_id: str, layer_name: str):
         """Handle completion of NDVI AOI processing."""
+        self.local_products.notify_written(output_path)
+        self._get_cache_manager().register(output_path, key=asset_id, pinned=True)
         try:
             # Clean up operation tracking
             op_key = f"{asset_id}_ndvi_aoi"
@@ -1042,6 +956,8 @@ class ImageListDialog(BaseDialog):
         self, output_path: str, asset_id: str, layer_name: str
     ):
         """Handle completion of False Color AOI processing."""
+        self.local_products.notify_written(output_path)
+        self._get_cache_manager().register(output_path, key=asset_id, pinned=True)
         try:
             # Clean up operation tracking
             op_key = f"{asset_id}_falsecolor_aoi"
@@ -1073,6 +989,8 @@ class ImageListDialog(BaseDialog):
         self, output_path: str, asset_id: str, layer_name: str, formula: str
     ):
         """Handle completion of custom calculation AOI processing."""
+        self.local_products.notify_written(output_path)
+        self._get_cache_manager().register(output_path, key=asset_id, pinned=True)
         try:
             # Clean up operation tracking
             op_keys = [
@@ -1192,6 +1110,13 @@ class ImageListDialog(BaseDialog):
         layers = QgsProject.instance().mapLayersByName(ndvi_layer_name)
 
         if not layers:
+            if asset.nir_url and asset.red_url:
+                # No processed layer: read the AOI's tiles from the band COGs
+                canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+                self._run_remote_zonal_stats_task(
+                    asset, QgsGeometry.fromRect(aoi_rect), canvas_crs
+                )
+                return
             ThemedMessageBox.show_message(
                 self,
                 QMessageBox.Warning,
@@ -1257,6 +1182,45 @@ class ImageListDialog(BaseDialog):
 
         QgsApplication.taskManager().addTask(task)
 
+    def _run_remote_zonal_stats_task(
+        self,
+        asset: RasterAsset,
+        aoi_geometry: QgsGeometry,
+        aoi_crs: QgsCoordinateReferenceSystem,
+    ):
+        task = RemoteZonalStatsTask(
+            {
+                asset.stac_id: {
+                    "nir": asset.nir_url,
+                    "red": asset.red_url,
+                    "scl": asset.scl_url,
+                }
+            },
+            [aoi_geometry],
+            aoi_crs,
+            "NDVI",
+        )
+
+        progress = QProgressDialog(
+            "Analyzing Vegetation in AOI...", "Cancel", 0, 100, self
+        )
+        progress.setWindowModality(Qt.WindowModal)
+
+        task.progressChanged.connect(lambda value: progress.setValue(int(value)))
+        task.tableFinished.connect(
+            lambda table: self._on_zonal_stats_finished(
+                table[0] if table and table[0]["count"] else {}
+            )
+        )
+        task.errorOccurred.connect(
+            lambda err: ThemedMessageBox.show_message(
+                self, QMessageBox.Critical, "Analysis Error", err
+            )
+        )
+        progress.canceled.connect(task.cancel)
+
+        QgsApplication.taskManager().addTask(task)
+
     def _on_zonal_stats_finished(self, stats: dict):
         if not stats:
             ThemedMessageBox.show_message(
@@ -1268,18 +1232,304 @@ class ImageListDialog(BaseDialog):
             return
 
         mean_ndvi = stats.get("mean", 0.0)
+        details = (
+            f"\nRange: {stats['min']:.3f} to {stats['max']:.3f}"
+            f" (median {stats['p50']:.3f}, std {stats['std']:.3f})"
+        )
 
         if mean_ndvi > 0.4:
-            message = f"Dense vegetation found!\n\nAverage NDVI in the selected area: {mean_ndvi:.3f}"
+            message = f"Dense vegetation found!\n\nAverage NDVI in the selected area: {mean_ndvi:.3f}{details}"
             ThemedMessageBox.show_message(
                 self, QMessageBox.Information, "Analysis Complete", message
             )
         else:
-            message = f"No dense vegetation found.\n\nAverage NDVI in the selected area: {mean_ndvi:.3f}"
+            message = f"No dense vegetation found.\n\nAverage NDVI in the selected area: {mean_ndvi:.3f}{details}"
             ThemedMessageBox.show_message(
                 self, QMessageBox.Warning, "Analysis Complete", message
             )
 
+    def _active_polygon_layer(self, title: str) -> Optional[QgsVectorLayer]:
+        """The active layer if it is a polygon layer; warns and returns None otherwise."""
+        layer = self.iface.activeLayer()
+        if (
+            isinstance(layer, QgsVectorLayer)
+            and layer.geometryType() == QgsWkbTypes.PolygonGeometry
+            and layer.featureCount() > 0
+        ):
+            return layer
+        ThemedMessageBox.show_message(
+            self,
+            QMessageBox.Warning,
+            title,
+            "Select a polygon layer with features in the Layers panel first.",
+        )
+        return None
+
+    def _run_batch_zonal_stats(self):
+        """
+        Statistics of a raster layer for every polygon of the active layer,
+        written to a CSV with one row per polygon.
+        """
+        title = "Zonal Statistics"
+        layer = self._active_polygon_layer(title)
+        if layer is None:
+            return
+        rasters = [
+            raster
+            for raster in QgsProject.instance().mapLayers().values()
+            if isinstance(raster, QgsRasterLayer) and raster.providerType() == "gdal"
+        ]
+        if not rasters:
+            ThemedMessageBox.show_message(
+                self,
+                QMessageBox.Warning,
+                title,
+                "Load the raster to summarize (e.g. an NDVI layer) first.",
+            )
+            return
+        names = [raster.name() for raster in rasters]
+        name, ok = QInputDialog.getItem(
+            self, title, f"Raster to summarize over '{layer.name()}':", names, 0, False
+        )
+        if not ok:
+            return
+        raster = rasters[names.index(name)]
+        csv_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Zonal Statistics",
+            f"{layer.name()}_{raster.name()}_zonal_stats.csv",
+            "CSV (*.csv)",
+        )
+        if not csv_path:
+            return
+
+        task = BatchZonalStatsTask.from_layer(raster.source(), layer)
+
+        progress = QProgressDialog(
+            f"Calculating statistics for {len(task.zones)} polygons...",
+            "Cancel",
+            0,
+            100,
+            self,
+        )
+        progress.setWindowModality(Qt.WindowModal)
+
+        task.progressChanged.connect(lambda value: progress.setValue(int(value)))
+        task.tableFinished.connect(
+            lambda table: self._on_batch_zonal_stats_finished(table, csv_path)
+        )
+        task.errorOccurred.connect(
+            lambda err: ThemedMessageBox.show_message(
+                self, QMessageBox.Critical, "Analysis Error", err
+            )
+        )
+        progress.canceled.connect(task.cancel)
+
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_batch_zonal_stats_finished(self, table: List[Dict], csv_path: str):
+        columns = [
+            column
+            for column in TABLE_COLUMNS
+            if column not in ("date", "scene", "index")
+        ]
+        try:
+            with open(csv_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(table)
+        except OSError as e:
+            ThemedMessageBox.show_message(
+                self, QMessageBox.Critical, "Analysis Error", f"Could not save CSV: {e}"
+            )
+            return
+        self.iface.messageBar().pushMessage(
+            "Success",
+            f"Zonal statistics for {len(table)} polygons saved to {csv_path}",
+            level=Qgis.Success,
+            duration=8,
+        )
+
+    def _run_time_series(self):
+        """
+        Index time series for every polygon of the active layer over the
+        catalog scenes covering them (within the cloud filter), written to a
+        CSV and, with matplotlib, a chart next to it.
+        """
+        title = "Index Time Series"
+        layer = self._active_polygon_layer(title)
+        if layer is None:
+            return
+        index_name, ok = QInputDialog.getItem(
+            self, title, "Index:", list(INDEX_FUNCTIONS), 0, False
+        )
+        if not ok:
+            return
+
+        zones, zone_ids = layer_zones(layer, None)
+        _, cloud_max, _ = self.CLOUD_FILTER_RANGES.get(
+            self.cloud_filter_combo.currentText(), (None, None, True)
+        )
+        scenes = select_scenes(
+            self.catalog_index, zones, layer.crs(), cloud_max=cloud_max
+        )
+        if not scenes:
+            ThemedMessageBox.show_message(
+                self,
+                QMessageBox.Warning,
+                title,
+                f"No scenes in the catalog cover '{layer.name()}'.",
+            )
+            return
+        csv_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Time Series",
+            f"{layer.name()}_{index_name}_time_series.csv",
+            "CSV (*.csv)",
+        )
+        if not csv_path:
+            return
+
+        task = TimeSeriesTask(
+            scenes, zones, layer.crs(), csv_path, index_name, zone_ids=zone_ids
+        )
+
+        progress = QProgressDialog(
+            f"Extracting {index_name} for {len(zones)} polygons "
+            f"over {len(scenes)} scenes...",
+            "Cancel",
+            0,
+            100,
+            self,
+        )
+        progress.setWindowModality(Qt.WindowModal)
+
+        task.progressChanged.connect(lambda value: progress.setValue(int(value)))
+        task.timeSeriesFinished.connect(self._on_time_series_finished)
+        task.errorOccurred.connect(
+            lambda err: ThemedMessageBox.show_message(
+                self, QMessageBox.Critical, "Analysis Error", err
+            )
+        )
+        progress.canceled.connect(task.cancel)
+
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_time_series_finished(
+        self, csv_path: str, chart_path: str, scenes_per_minute: float
+    ):
+        chart_note = f" and chart {os.path.basename(chart_path)}" if chart_path else ""
+        self.iface.messageBar().pushMessage(
+            "Success",
+            f"Time series saved to {csv_path}{chart_note} "
+            f"({scenes_per_minute:.0f} scenes/min)",
+            level=Qgis.Success,
+            duration=10,
+        )
+
+    def _run_temporal_composite(self):
+        """
+        Cloud-free composite of the AOI from the least cloudy of the scenes
+        currently listed (AOI and cloud filter applied), loaded as a layer
+        when done. The scene count is capped by max_composite_scenes.
+        """
+        title = "Cloud-free Composite"
+        if self.aoi is None or self.aoi.isEmpty():
+            ThemedMessageBox.show_message(
+                self, QMessageBox.Warning, title, "Select an AOI first."
+            )
+            return
+        scenes = [
+            asset for asset in self.filtered_assets if asset.nir_url and asset.red_url
+        ]
+        if len(scenes) < 2:
+            ThemedMessageBox.show_message(
+                self,
+                QMessageBox.Warning,
+                title,
+                "At least two listed scenes with NIR and Red bands are needed.",
+            )
+            return
+        limit = min(len(scenes), max_composite_scenes())
+        if limit < 2:
+            ThemedMessageBox.show_message(
+                self,
+                QMessageBox.Warning,
+                title,
+                "The composite memory budget (COMPOSITE_MAX_MEMORY_MB) is too "
+                "small for two scenes.",
+            )
+            return
+        count, ok = QInputDialog.getInt(
+            self,
+            title,
+            f"{len(scenes)} scenes listed. Number of least cloudy scenes to use:",
+            limit,
+            2,
+            limit,
+        )
+        if not ok:
+            return
+        scenes = least_cloudy(scenes, count)
+        method, ok = QInputDialog.getItem(
+            self,
+            title,
+            f"Combine {len(scenes)} scenes by:",
+            list(COMPOSITE_METHODS),
+            0,
+            False,
+        )
+        if not ok:
+            return
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = os.path.join(
+            Config.DOWNLOAD_DIR, "composites", f"composite_{method}_{timestamp}.tif"
+        )
+        canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+        task = TemporalCompositeTask(
+            scenes, QgsRectangle(self.aoi), canvas_crs, output_path, method
+        )
+
+        progress = QProgressDialog(
+            f"Compositing {len(scenes)} scenes ({method})...", "Cancel", 0, 100, self
+        )
+        progress.setWindowModality(Qt.WindowModal)
+
+        task.progressChanged.connect(lambda value: progress.setValue(int(value)))
+        task.compositeFinished.connect(
+            lambda path: self._on_temporal_composite_finished(path, method, len(scenes))
+        )
+        task.errorOccurred.connect(
+            lambda err: ThemedMessageBox.show_message(
+                self, QMessageBox.Critical, "Analysis Error", err
+            )
+        )
+        progress.canceled.connect(task.cancel)
+
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_temporal_composite_finished(
+        self, output_path: str, method: str, count: int
+    ):
+        layer_name = os.path.splitext(os.path.basename(output_path))[0]
+        layer = QgsRasterLayer(output_path, layer_name)
+        if not layer.isValid():
+            ThemedMessageBox.show_message(
+                self,
+                QMessageBox.Critical,
+                "Analysis Error",
+                f"Could not load composite {output_path}",
+            )
+            return
+        QgsProject.instance().addMapLayer(layer)
+        self.iface.messageBar().pushMessage(
+            "Success",
+            f"{method} composite of {count} scenes loaded - {layer_name}",
+            level=Qgis.Success,
+            duration=8,
+        )
+
     def _on_aoi_cancelled(self):
         self._restore_map_tool_and_show()
         self.iface.messageBar().pushMessage(
@@ -1306,11 +1556,8 @@ class ImageListDialog(BaseDialog):
         return group_node
 
     def _get_item_widget(self, stac_id: str) -> Optional[RasterItemWidget]:
-        for i in range(self.list_layout.count()):
-            widget = self.list_layout.itemAt(i).widget()
-            if isinstance(widget, RasterItemWidget) and widget.asset.stac_id == stac_id:
-                return widget
-        return None
+        """Returns the widget currently showing stac_id, or None if it is off-screen."""
+        return self.list_view.widget_for(stac_id)
 
     def _zoom_to_geometry(self, geometry_dict: Optional[Dict[str, Any]]):
         if not geometry_dict or "coordinates" not in geometry_dict:
@@ -1364,15 +1611,22 @@ class ImageListDialog(BaseDialog):
         """
         Download visual asset to AOI using background processing.
 
-        Always downloads fresh from URL - no cache checking.
+        Bands come from the AOI cache, a downloaded full band, or the remote COG.
         """
         try:
             cache_dir = self._get_cache_directory(asset.stac_id)
             canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
 
-            # Create background task - always download fresh
+            # Create background task
+            # A downloaded full visual is cropped locally instead of re-fetched
+            local_visual_path = asset.get_local_path("visual")
             task = AoiVisualProcessingTask(
-                asset.stac_id, asset.visual_url, self.aoi, canvas_crs, cache_dir
+                asset.stac_id,
+                asset.visual_url,
+                self.aoi,
+                canvas_crs,
+                cache_dir,
+                local_visual_path=local_visual_path,
             )
 
             # Show progress dialog
@@ -1501,14 +1755,37 @@ class ImageListDialog(BaseDialog):
             self._process_ndvi_original(asset, classification_items)
 
     def _process_ndvi_with_aoi(
-        self, asset, classification_items: Optional[List] = None
+        self,
+        asset,
+        classification_items: Optional[List] = None,
+        allow_virtual: bool = True,
     ):
         """
         Process NDVI using AOI-cropped bands with background processing.
 
-        Always downloads fresh from URLs - no cache checking.
+        Bands come from the AOI cache, a downloaded full band, or the remote COG.
+        With allow_virtual, NDVI is published as a VRT when possible.
         """
         try:
+            cache_dir = self._get_cache_directory(asset.stac_id)
+            canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+            local_band_paths = self._get_local_band_paths(asset)
+            mosaic_tiles = self._get_mosaic_tiles(asset, ["nir", "red"], canvas_crs)
+
+            if allow_virtual and Config.VIRTUAL_PRODUCTS_ENABLED and not mosaic_tiles:
+                self._publish_virtual_product(
+                    asset,
+                    "ndvi",
+                    write_ndvi_vrt,
+                    local_band_paths.get("nir", asset.nir_url),
+                    local_band_paths.get("red", asset.red_url),
+                    on_ready=lambda vrt_path: self._load_ndvi_layer(asset, vrt_path),
+                    on_fallback=lambda: self._process_ndvi_with_aoi(
+                        asset, classification_items, allow_virtual=False
+                    ),
+                )
+                return
+
             # Validate AOI size
             aoi_area = self.aoi.width() * self.aoi.height()
             if aoi_area > 1.0:  # 1 square degree
@@ -1523,10 +1800,7 @@ class ImageListDialog(BaseDialog):
                 if reply != QMessageBox.Yes:
                     return
 
-            cache_dir = self._get_cache_directory(asset.stac_id)
-            canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
-
-            # Create background task - always download fresh
+            # Create background task
             task = AoiNdviProcessingTask(
                 asset.stac_id,
                 asset.nir_url,
@@ -1534,6 +1808,9 @@ class ImageListDialog(BaseDialog):
                 self.aoi,
                 canvas_crs,
                 cache_dir,
+                local_band_paths=local_band_paths,
+                scl_url=asset.scl_url,
+                mosaic_tiles=mosaic_tiles,
             )
 
             # Show progress dialog
@@ -1706,7 +1983,7 @@ class ImageListDialog(BaseDialog):
 
         if hasattr(self, "_start_download"):
             for band_type, (url, save_path) in bands_to_download.items():
-                if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
+                if self.local_products.exists(save_path):
                     if hasattr(self, "_on_band_download_complete"):
                         self._on_band_download_complete(op_key, band_type, save_path)
                 else:
@@ -1738,19 +2015,49 @@ class ImageListDialog(BaseDialog):
         else:
             self._process_false_color_original(asset)
 
-    def _process_false_color_with_aoi(self, asset, band_urls: Dict[str, str]):
+    def _process_false_color_with_aoi(
+        self, asset, band_urls: Dict[str, str], allow_virtual: bool = True
+    ):
         """
         Process False Color composite using AOI-cropped bands with background processing.
 
-        Always downloads fresh from URLs - no cache checking.
+        Bands come from the AOI cache, a downloaded full band, or the remote COG.
+        With allow_virtual, the composite is published as a VRT when possible.
         """
         try:
             cache_dir = self._get_cache_directory(asset.stac_id)
             canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+            local_band_paths = self._get_local_band_paths(asset)
+            mosaic_tiles = self._get_mosaic_tiles(asset, band_urls, canvas_crs)
 
-            # Create background task - always download fresh
+            if allow_virtual and Config.VIRTUAL_PRODUCTS_ENABLED and not mosaic_tiles:
+                self._publish_virtual_product(
+                    asset,
+                    "falsecolor",
+                    write_false_color_vrt,
+                    *(
+                        local_band_paths.get(band, band_urls[band])
+                        for band in ("nir", "red", "green")
+                    ),
+                    on_ready=lambda vrt_path: self._load_false_color_layer(
+                        asset, vrt_path
+                    ),
+                    on_fallback=lambda: self._process_false_color_with_aoi(
+                        asset, band_urls, allow_virtual=False
+                    ),
+                )
+                return
+
+            # Create background task
             task = AoiFalseColorProcessingTask(
-                asset.stac_id, band_urls, self.aoi, canvas_crs, cache_dir
+                asset.stac_id,
+                band_urls,
+                self.aoi,
+                canvas_crs,
+                cache_dir,
+                local_band_paths=local_band_paths,
+                scl_url=asset.scl_url,
+                mosaic_tiles=mosaic_tiles,
             )
 
             # Show progress dialog
@@ -1869,7 +2176,7 @@ class ImageListDialog(BaseDialog):
 
         if hasattr(self, "_start_download"):
             for band_type, (url, save_path) in bands_to_download.items():
-                if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
+                if self.local_products.exists(save_path):
                     if hasattr(self, "_on_band_download_complete"):
                         self._on_band_download_complete(op_key, band_type, save_path)
                 else:
@@ -1884,7 +2191,7 @@ class ImageListDialog(BaseDialog):
                 cache_dir, f"cropped_{os.path.basename(asset.visual_url)}"
             )
 
-            if os.path.exists(aoi_visual_path) and os.path.getsize(aoi_visual_path) > 0:
+            if self.local_products.exists(aoi_visual_path):
                 self._load_visual_layer(asset, aoi_visual_path)
                 return
 
@@ -1892,11 +2199,7 @@ class ImageListDialog(BaseDialog):
         if hasattr(asset, "get_local_path"):
             try:
                 local_visual_path = asset.get_local_path("visual")
-                if (
-                    local_visual_path
-                    and os.path.exists(local_visual_path)
-                    and os.path.getsize(local_visual_path) > 0
-                ):
+                if local_visual_path and self.local_products.exists(local_visual_path):
                     # If AOI is selected, crop from local file
                     if self._should_use_aoi_processing():
                         cache_dir = self._get_cache_directory(asset.stac_id)
@@ -1932,9 +2235,9 @@ class ImageListDialog(BaseDialog):
                                 if hasattr(self, "_zoom_to_geometry"):
                                     self._zoom_to_geometry(asset.geometry)
 
-                            file_size_mb = os.path.getsize(local_visual_path) / (
-                                1024 * 1024
-                            )
+                            file_size_mb = self.local_products.file_size(
+                                local_visual_path
+                            ) / (1024 * 1024)
                             self.iface.messageBar().pushMessage(
                                 "Success",
                                 f"Visual opened ({file_size_mb:.1f} MB) - {layer_name}",
@@ -1960,7 +2263,7 @@ class ImageListDialog(BaseDialog):
             cache_dir = self._get_cache_directory(asset.stac_id)
             aoi_ndvi_path = os.path.join(cache_dir, f"{asset.stac_id}_ndvi_aoi.tif")
 
-            if os.path.exists(aoi_ndvi_path) and os.path.getsize(aoi_ndvi_path) > 0:
+            if self.local_products.exists(aoi_ndvi_path):
                 self._load_ndvi_layer(asset, aoi_ndvi_path)
                 return
 
@@ -1968,11 +2271,7 @@ class ImageListDialog(BaseDialog):
         if hasattr(asset, "get_local_path"):
             try:
                 full_ndvi_path = asset.get_local_path("ndvi")
-                if (
-                    full_ndvi_path
-                    and os.path.exists(full_ndvi_path)
-                    and os.path.getsize(full_ndvi_path) > 0
-                ):
+                if full_ndvi_path and self.local_products.exists(full_ndvi_path):
                     # Load full NDVI without styling (natural grayscale)
                     layer_name = f"{asset.stac_id}_NDVI"
                     layer = QgsRasterLayer(full_ndvi_path, layer_name)
@@ -1983,7 +2282,9 @@ class ImageListDialog(BaseDialog):
                             if hasattr(self, "_zoom_to_geometry"):
                                 self._zoom_to_geometry(asset.geometry)
 
-                        file_size_mb = os.path.getsize(full_ndvi_path) / (1024 * 1024)
+                        file_size_mb = self.local_products.file_size(
+                            full_ndvi_path
+                        ) / (1024 * 1024)
                         self.iface.messageBar().pushMessage(
                             "Success",
                             f"NDVI opened ({file_size_mb:.1f} MB) - {layer_name}",
@@ -2009,7 +2310,7 @@ class ImageListDialog(BaseDialog):
             cache_dir = self._get_cache_directory(asset.stac_id)
             aoi_fc_path = os.path.join(cache_dir, f"{asset.stac_id}_falsecolor_aoi.tif")
 
-            if os.path.exists(aoi_fc_path) and os.path.getsize(aoi_fc_path) > 0:
+            if self.local_products.exists(aoi_fc_path):
                 self._load_false_color_layer(asset, aoi_fc_path)
                 return
 
@@ -2017,11 +2318,7 @@ class ImageListDialog(BaseDialog):
         if hasattr(asset, "get_local_path"):
             try:
                 full_fc_path = asset.get_local_path("false_color")
-                if (
-                    full_fc_path
-                    and os.path.exists(full_fc_path)
-                    and os.path.getsize(full_fc_path) > 0
-                ):
+                if full_fc_path and self.local_products.exists(full_fc_path):
                     # Load full False Color
                     layer_name = f"{asset.stac_id}_FalseColor"
                     layer = QgsRasterLayer(full_fc_path, layer_name)
@@ -2032,7 +2329,9 @@ class ImageListDialog(BaseDialog):
                             if hasattr(self, "_zoom_to_geometry"):
                                 self._zoom_to_geometry(asset.geometry)
 
-                        file_size_mb = os.path.getsize(full_fc_path) / (1024 * 1024)
+                        file_size_mb = self.local_products.file_size(
+                            full_fc_path
+                        ) / (1024 * 1024)
                         self.iface.messageBar().pushMessage(
                             "Success",
                             f"False Color opened ({file_size_mb:.1f} MB) - {layer_name}",
@@ -2067,12 +2366,18 @@ class ImageListDialog(BaseDialog):
             )
 
     def _handle_custom_calculation_with_aoi(
-        self, asset, formula: str, output_name: str, coefficients: dict
+        self,
+        asset,
+        formula: str,
+        output_name: str,
+        coefficients: dict,
+        allow_virtual: bool = True,
     ):
         """
         Handle custom calculation using AOI-cropped bands with background processing.
 
-        Always downloads fresh from URLs - no cache checking.
+        Bands come from the AOI cache, a downloaded full band, or the remote COG.
+        With allow_virtual, the index is published as a VRT when possible.
         """
         try:
             import re
@@ -2113,8 +2418,34 @@ class ImageListDialog(BaseDialog):
 
             cache_dir = self._get_cache_directory(asset.stac_id)
             canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+            local_band_paths = self._get_local_band_paths(asset)
+            mosaic_tiles = self._get_mosaic_tiles(asset, band_urls, canvas_crs)
+
+            if allow_virtual and Config.VIRTUAL_PRODUCTS_ENABLED and not mosaic_tiles:
+                self._publish_virtual_product(
+                    asset,
+                    output_name,
+                    write_custom_index_vrt,
+                    {
+                        band: local_band_paths.get(band, url)
+                        for band, url in band_urls.items()
+                    },
+                    formula,
+                    coefficients=coefficients,
+                    on_ready=lambda vrt_path: self._load_custom_calculation_layer(
+                        asset, vrt_path, output_name, formula
+                    ),
+                    on_fallback=lambda: self._handle_custom_calculation_with_aoi(
+                        asset,
+                        formula,
+                        output_name,
+                        coefficients,
+                        allow_virtual=False,
+                    ),
+                )
+                return
 
-            # Create background task - always download fresh
+            # Create background task
             task = AoiCustomCalculationTask(
                 asset.stac_id,
                 band_urls,
@@ -2124,6 +2455,9 @@ class ImageListDialog(BaseDialog):
                 self.aoi,
                 canvas_crs,
                 cache_dir,
+                local_band_paths=local_band_paths,
+                scl_url=asset.scl_url,
+                mosaic_tiles=mosaic_tiles,
             )
 
             # Show progress dialog
@@ -2308,7 +2642,7 @@ class ImageListDialog(BaseDialog):
         if item_widget := self._get_item_widget(asset.stac_id):
             item_widget.update_ui_based_on_local_files()
         for band_type, (url, save_path) in bands_to_download.items():
-            if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
+            if self.local_products.exists(save_path):
                 self._on_band_download_complete(op_key, band_type, save_path)
             else:
                 self._start_download(asset, band_type, url, save_path, op_key)
@@ -2316,67 +2650,99 @@ class ImageListDialog(BaseDialog):
     def _start_download(
         self, asset: RasterAsset, band: str, url: str, save_path: str, op_key: str
     ):
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        request = QNetworkRequest(QUrl(url))
-        reply = self.download_network_manager.get(request)
+        # Segmented and resumable: partial data stays in save_path + ".part"
+        priority = (
+            PRIORITY_VISIBLE
+            if self._get_item_widget(asset.stac_id) is not None
+            else PRIORITY_NORMAL
+        )
+        job = self.download_manager.download(
+            url, save_path, priority=priority, group=op_key
+        )
         if op_key in self.active_operations:
             self.active_operations[op_key]["replies"] = self.active_operations[
                 op_key
             ].get("replies", [])
-            self.active_operations[op_key]["replies"].append(reply)
-        reply.setProperty("stac_id", asset.stac_id)
-        reply.setProperty("band", band)
-        reply.setProperty("save_path", save_path)
-        reply.setProperty("op_key", op_key)
-        file_handle = open(save_path, "wb")
-        reply.setProperty("file_handle", file_handle)
-        reply.downloadProgress.connect(self._on_download_progress)
-        reply.finished.connect(lambda r=reply: self._on_download_finished(r))
-        reply.readyRead.connect(
-            lambda r=reply: r.property("file_handle").write(r.readAll())
-        )
-
-    def _on_download_progress(self, bytes_received: int, bytes_total: int):
-        reply = self.sender()
-        if not reply:
-            return
-        stac_id = reply.property("stac_id")
-        band = reply.property("band")
-        if item_widget := self._get_item_widget(stac_id):
-            item_widget.update_download_progress(bytes_received, bytes_total, band)
+            self.active_operations[op_key]["replies"].append(job)
+        stac_id = asset.stac_id
+        job.progress.connect(
+            lambda received, total: self._on_download_progress(
+                stac_id, band, received, total
+            )
+        )
+        job.finished.connect(lambda path: self._ingest_download(op_key, band, path))
+        job.failed.connect(
+            lambda error, j=job: self._on_download_failed(
+                stac_id, band, op_key, error, j.partial_kept
+            )
+        )
+        job.cancelled.connect(
+            lambda: QgsMessageLog.logMessage(
+                f"Download canceled for {band} of {stac_id}", "IDPMPlugin", Qgis.Info
+            )
+        )
 
-    def _on_download_finished(self, reply: QNetworkReply):
-        if not reply:
+    def _ingest_download(self, op_key: str, band: str, save_path: str):
+        """
+        Rewrites a finished download as a tiled COG with internal overviews
+        before it is used. A failed ingest only logs a warning: the original
+        file is still valid, just slower to read.
+        """
+        if not Config.COG_INGEST_ENABLED or op_key not in self.active_operations:
+            self._on_band_download_complete(op_key, band, save_path)
             return
-        stac_id = reply.property("stac_id")
-        band = reply.property("band")
-        save_path = reply.property("save_path")
-        op_key = reply.property("op_key")
-        if file_handle := reply.property("file_handle"):
-            file_handle.close()
-        if reply.error() == QNetworkReply.OperationCanceledError:
+
+        task = CogIngestTask(save_path)
+        self.active_operations[op_key].setdefault("ingest_tasks", []).append(task)
+        task.ingestFinished.connect(
+            lambda path: self._on_band_download_complete(op_key, band, path)
+        )
+
+        def on_error(error: str):
             QgsMessageLog.logMessage(
-                f"Download canceled for {band} of {stac_id}", "IDPMPlugin", Qgis.Info
-            )
-            if os.path.exists(save_path):
-                os.remove(save_path)
-        elif reply.error() != QNetworkReply.NoError:
-            ThemedMessageBox.show_message(
-                self,
-                QMessageBox.Critical,
-                "Download Failed",
-                f"Failed to download {band} for {stac_id}: {reply.errorString()}",
+                f"COG ingest skipped for {os.path.basename(save_path)}: {error}",
+                "IDPMPlugin",
+                Qgis.Warning,
             )
-            if os.path.exists(save_path):
-                os.remove(save_path)
-            if op_key in self.active_operations:
-                del self.active_operations[op_key]
-            if item_widget := self._get_item_widget(stac_id):
-                item_widget.update_ui_based_on_local_files()
-        else:
-            if op_key:
-                self._on_band_download_complete(op_key, band, save_path)
-        reply.deleteLater()
+            self._on_band_download_complete(op_key, band, save_path)
+
+        task.errorOccurred.connect(on_error)
+        QgsApplication.taskManager().addTask(task)
+
+    def _on_download_progress(
+        self, stac_id: str, band: str, bytes_received: int, bytes_total: int
+    ):
+        if item_widget := self._get_item_widget(stac_id):
+            item_widget.update_download_progress(bytes_received, bytes_total, band)
+
+    def _on_download_failed(
+        self,
+        stac_id: str,
+        band: str,
+        op_key: str,
+        error: str,
+        partial_kept: bool = True,
+    ):
+        op = self.active_operations.pop(op_key, None)
+        if op:
+            # Stop the other bands of this operation; their .part files are kept
+            for job in op.get("replies", []):
+                if job.isRunning():
+                    job.abort()
+        ThemedMessageBox.show_message(
+            self,
+            QMessageBox.Critical,
+            "Download Failed",
+            f"Failed to download {band} for {stac_id}: {error}\n\n"
+            + (
+                "Downloaded data was kept; retrying will resume the download."
+                if partial_kept
+                else "The downloaded data failed verification and was "
+                "discarded; retrying will start over."
+            ),
+        )
+        if item_widget := self._get_item_widget(stac_id):
+            item_widget.update_ui_based_on_local_files()
 
     # Hook into your existing band download completion workflow
     def _on_band_download_complete(self, op_key: str, band: str, save_path: str):
@@ -2384,6 +2750,7 @@ class ImageListDialog(BaseDialog):
         Enhanced version of your existing _on_band_download_complete method
         to handle custom calculations.
         """
+        self.local_products.notify_written(save_path)
         op = self.active_operations.get(op_key)
         if not op:
             return
@@ -2510,49 +2877,9 @@ class ImageListDialog(BaseDialog):
 
     # Additional utility methods for cache management
     def _cleanup_old_cache_files(self, max_age_hours: int = 24):
-        """Clean up old cache files to manage disk space."""
+        """Evicts AOI cache files that were not used within max_age_hours."""
         try:
-            import time
-
-            settings = QSettings()
-            cache_base = settings.value("IDPMPlugin/cache_dir", tempfile.gettempdir())
-            cache_root = os.path.join(cache_base, "idpm_aoi_cache")
-
-            if not os.path.exists(cache_root):
-                return
-
-            current_time = time.time()
-            max_age_seconds = max_age_hours * 3600
-
-            for root, dirs, files in os.walk(cache_root):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        file_age = current_time - os.path.getmtime(file_path)
-                        if file_age > max_age_seconds:
-                            os.remove(file_path)
-                            QgsMessageLog.logMessage(
-                                f"Removed old cache file: {file}",
-                                "IDPMPlugin",
-                                Qgis.Info,
-                            )
-                    except Exception as e:
-                        QgsMessageLog.logMessage(
-                            f"Error removing cache file {file}: {str(e)}",
-                            "IDPMPlugin",
-                            Qgis.Warning,
-                        )
-
-            # Remove empty directories
-            for root, dirs, files in os.walk(cache_root, topdown=False):
-                for dir_name in dirs:
-                    dir_path = os.path.join(root, dir_name)
-                    try:
-                        if not os.listdir(dir_path):  # Directory is empty
-                            os.rmdir(dir_path)
-                    except:
-                        pass
-
+            self._get_cache_manager().evict_older_than(max_age_hours)
         except Exception as e:
             QgsMessageLog.logMessage(
                 f"Error during cache cleanup: {str(e)}", "IDPMPlugin", Qgis.Warning
@@ -2561,30 +2888,11 @@ class ImageListDialog(BaseDialog):
     def _get_cache_size_info(self) -> Dict[str, float]:
         """Get information about cache usage."""
         try:
-            settings = QSettings()
-            cache_base = settings.value("IDPMPlugin/cache_dir", tempfile.gettempdir())
-            cache_root = os.path.join(cache_base, "idpm_aoi_cache")
-
-            if not os.path.exists(cache_root):
-                return {"total_size_mb": 0, "file_count": 0}
-
-            total_size = 0
-            file_count = 0
-
-            for root, dirs, files in os.walk(cache_root):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        total_size += os.path.getsize(file_path)
-                        file_count += 1
-                    except:
-                        pass
-
+            stats = self._get_cache_manager().statistics()
             return {
-                "total_size_mb": total_size / (1024 * 1024),
-                "file_count": file_count,
+                "total_size_mb": stats["total_size_mb"],
+                "file_count": stats["file_count"],
             }
-
         except Exception as e:
             QgsMessageLog.logMessage(
                 f"Error getting cache info: {str(e)}", "IDPMPlugin", Qgis.Warning
@@ -2622,6 +2930,7 @@ class ImageListDialog(BaseDialog):
         QgsApplication.taskManager().addTask(task)
 
     def _on_custom_calculation_finished(self, path: str, name: str, stac_id: str):
+        self.local_products.notify_written(path)
         op_key = f"{stac_id}_{name}"
         if op_key in self.active_operations:
             del self.active_operations[op_key]
@@ -2660,6 +2969,8 @@ class ImageListDialog(BaseDialog):
                         reply.abort()
             if "task" in op and op["task"]:
                 op["task"].cancel()
+            for task in op.get("ingest_tasks", []):
+                task.cancel()
             del self.active_operations[op_key_to_cancel]
             if widget := self._get_item_widget(stac_id):
                 widget.update_ui_based_on_local_files()
@@ -2731,6 +3042,7 @@ class ImageListDialog(BaseDialog):
     def _on_ndvi_processing_finished(
         self, ndvi_path: str, stac_id: str, style_items: list
     ):
+        self.local_products.notify_written(ndvi_path)
         op_key = f"{stac_id}_ndvi"
         if op_key in self.active_operations:
             del self.active_operations[op_key]
@@ -2749,6 +3061,7 @@ class ImageListDialog(BaseDialog):
             item_widget.update_ui_based_on_local_files()
 
     def _on_fc_processing_finished(self, fc_path: str, stac_id: str):
+        self.local_products.notify_written(fc_path)
         op_key = f"{stac_id}_false_color"
         if op_key in self.active_operations:
             del self.active_operations[op_key]
@@ -2839,11 +3152,7 @@ class ImageListDialog(BaseDialog):
             if hasattr(asset, "get_local_path"):
                 try:
                     local_path = asset.get_local_path(band_key)
-                    if (
-                        local_path
-                        and os.path.exists(local_path)
-                        and os.path.getsize(local_path) > 0
-                    ):
+                    if local_path and self.local_products.exists(local_path):
                         local_paths[band_name] = local_path
                         QgsMessageLog.logMessage(
                             f"Found local {band_name} file: {os.path.basename(local_path)}",
@@ -2856,38 +3165,143 @@ class ImageListDialog(BaseDialog):
 
         return local_paths
 
-    def _get_cache_manager(self) -> AoiCacheManager:
-        """Get AOI cache manager instance."""
-        settings = QSettings()
-        cache_base = settings.value("IDPMPlugin/cache_dir", tempfile.gettempdir())
-        cache_root = os.path.join(cache_base, "idpm_aoi_cache")
-        return AoiCacheManager(cache_root)
+    def _get_mosaic_tiles(
+        self, asset, band_names, aoi_crs: QgsCoordinateReferenceSystem
+    ) -> List[Dict[str, str]]:
+        """Band URLs of the other tiles of the same pass that the AOI spans."""
+        try:
+            tiles = select_mosaic_tiles(self.catalog_index, asset, self.aoi, aoi_crs)
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"Could not look up neighbouring tiles: {str(e)}",
+                "IDPMPlugin",
+                Qgis.Warning,
+            )
+            return []
+        return [
+            tile_band_urls(tile, list(band_names) + ["scl"]) for tile in tiles[1:]
+        ]
 
-    def _cleanup_old_aoi_cache(
-        self, max_age_hours: int = 24, max_files_per_asset: int = 3
+    def _publish_virtual_product(
+        self, asset, product: str, writer, *sources, on_ready, on_fallback, **options
     ):
-        """Clean up old timestamped AOI cache files."""
-        try:
-            cache_manager = self._get_cache_manager()
-            result = cache_manager.cleanup_old_aoi_files(
-                max_age_hours, max_files_per_asset
+        """
+        Builds an AOI product as a GDAL VRT over the band COGs (see
+        core.virtual_products), so QGIS computes only the pixels it renders.
+        The VRT is built in a background task since GDAL opens the remote
+        COGs to build it.
+
+        Args:
+            on_ready: Called with the VRT path once it is written
+            on_fallback: Called if the VRT cannot be built, to compute a
+                GeoTIFF instead
+        """
+        cache_dir = self._get_cache_directory(asset.stac_id)
+        # Timestamped like the computed AOI outputs, so a new AOI never
+        # rewrites a VRT that is still loaded as a layer
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        vrt_path = os.path.join(
+            cache_dir, f"{asset.stac_id}_{product}_aoi_{timestamp}.vrt"
+        )
+        canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+        task = VirtualProductTask(
+            f"Virtual {product} for {asset.stac_id}",
+            writer,
+            sources,
+            vrt_path,
+            aoi_rect=QgsRectangle(self.aoi),
+            aoi_crs=canvas_crs,
+            **options,
+        )
+
+        progress = QProgressDialog(
+            f"Preparing {product} AOI for {asset.stac_id}...", "Cancel", 0, 0, self
+        )
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+        op_key = f"{asset.stac_id}_{product}_virtual"
+
+        def on_product_ready(path: str):
+            self._end_virtual_product(op_key, asset.stac_id)
+            QgsMessageLog.logMessage(
+                f"Published {product} as virtual product {os.path.basename(path)}",
+                "IDPMPlugin",
+                Qgis.Info,
             )
+            on_ready(path)
 
-            if result["files_removed"] > 0:
-                self.iface.messageBar().pushMessage(
-                    "Cache Cleanup",
-                    f"Cleaned up {result['files_removed']} old AOI files ({result['space_freed_mb']:.1f} MB freed)",
-                    level=Qgis.Info,
-                    duration=5,
-                )
+        def on_error(error_msg: str):
+            self._end_virtual_product(op_key, asset.stac_id)
+            QgsMessageLog.logMessage(
+                f"Could not publish {product} as a VRT ({error_msg}); computing it instead",
+                "IDPMPlugin",
+                Qgis.Warning,
+            )
+            on_fallback()
 
-            return result
+        task.productReady.connect(on_product_ready)
+        task.errorOccurred.connect(on_error)
+        task.taskTerminated.connect(
+            lambda: self._end_virtual_product(op_key, asset.stac_id)
+        )
+        progress.canceled.connect(task.cancel)
 
+        self.active_operations[op_key] = {
+            "type": "virtual",
+            "task": task,
+            "progress": progress,
+            "asset": asset,
+        }
+        if item_widget := self._get_item_widget(asset.stac_id):
+            item_widget.update_ui_based_on_local_files()
+
+        QgsApplication.taskManager().addTask(task)
+
+    def _end_virtual_product(self, op_key: str, stac_id: str):
+        """Stops tracking a virtual product task; safe to call more than once."""
+        op = self.active_operations.pop(op_key, None)
+        if op is None:
+            return
+        if progress := op.get("progress"):
+            progress.close()
+        if item_widget := self._get_item_widget(stac_id):
+            item_widget.update_ui_based_on_local_files()
+
+    def _get_cache_manager(self) -> CacheManager:
+        """Get the shared AOI cache manager."""
+        return CacheManager.for_aoi_cache()
+
+    def _cleanup_old_aoi_cache(self, max_age_hours: Optional[int] = None):
+        """
+        Compacts the AOI cache in the background: evicts files unused for
+        max_age_hours (if given) and trims it to the byte budget. Files open
+        as layers are pinned and kept.
+        """
+        try:
+            in_use = [
+                layer.source().split("|")[0]
+                for layer in QgsProject.instance().mapLayers().values()
+            ]
+            task = CacheCompactionTask(
+                self._get_cache_manager(), in_use, max_age_hours=max_age_hours
+            )
+            task.compacted.connect(self._on_cache_compacted)
+            self._cache_compaction_task = task
+            QgsApplication.taskManager().addTask(task)
         except Exception as e:
             QgsMessageLog.logMessage(
                 f"Error during cache cleanup: {str(e)}", "IDPMPlugin", Qgis.Warning
             )
-            return {"files_removed": 0, "space_freed_mb": 0}
+
+    def _on_cache_compacted(self, stats: dict):
+        self._cache_compaction_task = None
+        if stats["files_removed"] > 0:
+            self.iface.messageBar().pushMessage(
+                "Cache Cleanup",
+                f"Cleaned up {stats['files_removed']} old AOI files ({stats['space_freed_mb']:.1f} MB freed)",
+                level=Qgis.Info,
+                duration=5,
+            )
 
     def apply_stylesheet(self) -> None:
         qss = """
@@ -2922,11 +3336,10 @@ class ImageListDialog(BaseDialog):
                 padding: 4px 12px; border-radius: 6px; font-weight: bold;
             }
             #cancelButton:hover { background-color: #e0a800; }
-            QScrollArea, #scrollAreaViewport, #scrollContent { border: none; background-color: #F8F9FA; }
-            #paginationButton { background-color: white; color: #274423; border: 1px solid #274423; padding: 8px 16px; border-radius: 8px; }
-            #paginationButton:disabled { background-color: #E9ECEF; color: #6C757D; border: 1px solid #CED4DA; }
+            #rasterListView, #rasterListViewport { border: none; background-color: #F8F9FA; }
             #pageLabel { color: #274423; font-size: 14px; }
             #filterLabel { color: #274423; font-weight: bold; font-size: 14px; }
+            #downloadMetrics { color: #495057; font-size: 12px; }
             QComboBox#filterComboBox { font-family: "Montserrat"; padding: 5px; min-width: 120px; }
         """
         self.setStyleSheet(qss)
@@ -2952,6 +3365,8 @@ class ImageListDialog(BaseDialog):
                 if task := op.get("task"):
                     if hasattr(task, "cancel"):
                         task.cancel()
+                for ingest_task in op.get("ingest_tasks", []):
+                    ingest_task.cancel()
 
                 # Close progress dialogs
                 if progress := op.get("progress"):
@@ -2968,10 +3383,8 @@ class ImageListDialog(BaseDialog):
                 del self.active_operations[op_key]
 
         # Update all widget UIs
-        for i in range(self.list_layout.count()):
-            widget = self.list_layout.itemAt(i).widget()
-            if hasattr(widget, "update_ui_based_on_local_files"):
-                QTimer.singleShot(100, widget.update_ui_based_on_local_files)
+        for widget in self.list_view.bound_widgets():
+            QTimer.singleShot(100, widget.update_ui_based_on_local_files)
 
     def reject(self):
         """
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 import os
 import json
 from datetime import datetime
@@ -20,8 +20,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QFont, QHideEvent, QPixmap, QIcon, QPainter, QMouseEvent
 from PyQt5.QtSvg import QSvgRenderer
-from PyQt5.QtCore import QTimer, Qt, QSize, QUrl, QSettings, pyqtSignal
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt5.QtCore import QTimer, Qt, QSize, QSettings, pyqtSignal
 from qgis.gui import QgisInterface
 from qgis.core import (
     Qgis,
@@ -44,6 +43,9 @@ from .themed_message_box import ThemedMessageBox
 from .mangrove_classification import MangroveClassificationDialog
 from ..core.util import add_basemap_global_osm
 from ..core.layer_loader_worker import LayerLoaderTask
+from ..core.asset_model import RasterAsset
+from ..core.catalog_cache import CatalogCache, CachedCatalog
+from ..core.catalog_client import CatalogClient, CatalogQuery
 
 
 class ActionCard(QWidget):
@@ -132,8 +134,16 @@ class MenuWidget(BaseDialog):
     def __init__(self, iface: QgisInterface, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.iface = iface
-        self.network_manager = QNetworkAccessManager(self)
         self.image_list_dialog = None
+        self.catalog_cache = CatalogCache()
+        self.catalog_client = CatalogClient(self)
+        self.catalog_client.assetsReceived.connect(self._on_catalog_assets_received)
+        self.catalog_client.notModified.connect(self._on_catalog_not_modified)
+        self.catalog_client.finished.connect(self._on_catalog_finished)
+        self.catalog_client.failed.connect(self._on_catalog_failed)
+        self._catalog_query: Optional[CatalogQuery] = None
+        self._catalog_cached: Optional[CachedCatalog] = None
+        self._catalog_dialog_shown = False
         self.profile_dialog = None
         self.loading_dialog = None
         self.mangrove_dialog = None  # NEW: Add mangrove dialog reference
@@ -389,7 +399,9 @@ class MenuWidget(BaseDialog):
     def open_image_list(self):
         """
         Modified to store AOI information for passing to the raster dialog.
-        This replaces your existing open_image_list method.
+        The catalog is streamed page by page and filtered server-side by the
+        AOI; a cached result for the same query is shown immediately and
+        revalidated in the background with a conditional request.
         """
         selected_wilker = self._get_selected_wilker()
         if not selected_wilker:
@@ -406,13 +418,6 @@ class MenuWidget(BaseDialog):
             )
             return
 
-        # Show loading dialog
-        if self.loading_dialog is None:
-            self.loading_dialog = LoadingDialog(self)
-        self.setEnabled(False)
-        self.loading_dialog.show()
-        self.hide()
-
         # Store current AOI selection to pass to raster dialog
         # This is the key addition - we store the AOI for later use
         self._pending_aoi_for_raster_list = self.selected_aoi
@@ -430,160 +435,158 @@ class MenuWidget(BaseDialog):
                 "Opening raster list without AOI selection", "IDPMPlugin", Qgis.Info
             )
 
-        # Make API request (your existing logic)
-        request_url = (
-            f"{Config.FRONT_END_URL}/api/geoportal/sentinel/catalog/{selected_wilker}"
-        )
-        request = QNetworkRequest(QUrl(request_url))
-        request.setRawHeader(b"Authorization", f"Bearer {token}".encode())
+        query = CatalogQuery(wilker=selected_wilker, bbox=self._aoi_bbox_wgs84())
+        cached = self.catalog_cache.load(query.cache_key())
+        self._catalog_query = query
+        self._catalog_cached = cached
+        self._catalog_dialog_shown = False
 
-        # Connect to response handler
-        self.network_manager.finished.connect(self.handle_catalog_list_response)
-        self.network_manager.get(request)
+        if cached is not None:
+            QgsMessageLog.logMessage(
+                f"Showing {len(cached.assets)} cached catalog images for {selected_wilker}, revalidating",
+                "IDPMPlugin",
+                Qgis.Info,
+            )
+            self.hide()
+            self._show_image_list(cached.assets)
+            self._catalog_dialog_shown = True
+        else:
+            # Show loading dialog
+            if self.loading_dialog is None:
+                self.loading_dialog = LoadingDialog(self)
+            self.setEnabled(False)
+            self.loading_dialog.show()
+            self.hide()
+
+        self.catalog_client.fetch(
+            query,
+            etag=cached.etag if cached else None,
+            last_modified=cached.last_modified if cached else None,
+        )
 
-    def handle_catalog_list_response(self, reply: QNetworkReply):
-        """
-        Modified to pass AOI information to the ImageListDialog.
-        This replaces your existing handle_catalog_list_response method.
-        """
-        from .list_raster import ImageListDialog
+    def _aoi_bbox_wgs84(self) -> Optional[Tuple[float, float, float, float]]:
+        """The selected AOI as (minx, miny, maxx, maxy) in EPSG:4326, if any."""
+        if not self.selected_aoi or self.selected_aoi.isEmpty():
+            return None
+        canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+        transform = QgsCoordinateTransform(
+            canvas_crs,
+            QgsCoordinateReferenceSystem("EPSG:4326"),
+            QgsProject.instance(),
+        )
+        rect = transform.transformBoundingBox(self.selected_aoi)
+        return (rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum())
 
-        # Re-enable UI and close loading dialog
+    def _close_catalog_loading(self):
         self.setEnabled(True)
         if self.loading_dialog:
             self.loading_dialog.close()
 
-        try:
-            # Disconnect to prevent multiple calls
-            self.network_manager.finished.disconnect(self.handle_catalog_list_response)
-        except TypeError:
-            pass
+    def _on_catalog_assets_received(self, assets: List[RasterAsset]):
+        """Shows the first streamed page right away and appends later ones."""
+        if self._catalog_cached is not None:
+            # Background refresh: the cached list stays until the query completes
+            return
+        if not self._catalog_dialog_shown:
+            self._close_catalog_loading()
+            self._show_image_list(assets)
+            self._catalog_dialog_shown = True
+        elif self.image_list_dialog is not None:
+            self.image_list_dialog.append_assets(assets)
+
+    def _on_catalog_not_modified(self):
+        QgsMessageLog.logMessage(
+            f"Catalog for {self._catalog_query.wilker} unchanged (304), using cache",
+            "IDPMPlugin",
+            Qgis.Info,
+        )
 
-        # Handle network errors
-        if reply.error():
-            error_message = f"Failed to fetch catalog: {reply.errorString()}"
-            QgsMessageLog.logMessage(error_message, "IDPMPlugin", Qgis.Critical)
+    def _on_catalog_finished(
+        self, assets: List[RasterAsset], etag: str, last_modified: str
+    ):
+        self.catalog_cache.store(
+            CachedCatalog(
+                key=self._catalog_query.cache_key(),
+                assets=assets,
+                etag=etag or None,
+                last_modified=last_modified or None,
+            )
+        )
+
+        if self._catalog_cached is not None:
+            # Background refresh of a list that is already on screen
+            if self.image_list_dialog is not None:
+                self.image_list_dialog.update_features(assets, aoi=self.selected_aoi)
+        elif not self._catalog_dialog_shown:
+            self._close_catalog_loading()
+            QgsMessageLog.logMessage(
+                "No raster data found for the selected area",
+                "IDPMPlugin",
+                Qgis.Info,
+            )
 
             ThemedMessageBox.show_message(
-                self, QMessageBox.Critical, "Network Error", error_message
+                self,
+                QMessageBox.Information,
+                "No Data",
+                "No satellite imagery found for the selected working area and time period.",
             )
-            reply.deleteLater()
             return
 
-        try:
-            # Parse response
-            response_data = reply.readAll()
-            reply.deleteLater()
-
-            response_json = json.loads(response_data.data().decode("utf-8"))
-
-            if not response_json.get("statusCode", 500) == 200:
-                error_msg = response_json.get("message", "Unknown error occurred")
-                QgsMessageLog.logMessage(
-                    f"API Error: {error_msg}", "IDPMPlugin", Qgis.Warning
-                )
-
-                ThemedMessageBox.show_message(
-                    self, QMessageBox.Warning, "API Error", error_msg
-                )
-                return
-
-            # Get the catalog data
-            geojson_data = response_json.get("data", {})
-
-            if not geojson_data or not geojson_data.get("features"):
-                QgsMessageLog.logMessage(
-                    "No raster data found for the selected area",
-                    "IDPMPlugin",
-                    Qgis.Info,
-                )
-
-                ThemedMessageBox.show_message(
-                    self,
-                    QMessageBox.Information,
-                    "No Data",
-                    "No satellite imagery found for the selected working area and time period.",
-                )
-                return
-
-            # Extract features for your existing constructor
-            features = geojson_data.get("features", [])
-
-            # WORK WITH YOUR EXISTING IMPLEMENTATION:
-            # ImageListDialog(features, iface, parent, aoi=selected_aoi)
-
-            # Use your existing singleton pattern
-            if self.image_list_dialog is None:
-                QgsMessageLog.logMessage(
-                    f"Creating new ImageListDialog with {len(features)} features and AOI: {self.selected_aoi is not None}",
-                    "IDPMPlugin",
-                    Qgis.Info,
-                )
-
-                # Use your EXISTING constructor signature
-                self.image_list_dialog = ImageListDialog(
-                    features,  # Your geojson features
-                    self.iface,  # QGIS interface
-                    self.iface.mainWindow(),  # Parent window
-                    aoi=self.selected_aoi,  # AOI (already built into your dialog!)
-                )
-
-                # Your existing event connections
-                self.image_list_dialog.finished.connect(self._on_image_list_closed)
-                self.image_list_dialog.show()
-
-                QgsMessageLog.logMessage(
-                    "ImageListDialog created and shown", "IDPMPlugin", Qgis.Info
-                )
+        # Log success
+        aoi_status = "with AOI" if self.selected_aoi else "without AOI"
+        QgsMessageLog.logMessage(
+            f"Successfully loaded raster catalog with {len(assets)} images {aoi_status}",
+            "IDPMPlugin",
+            Qgis.Info,
+        )
 
-            else:
-                # Your existing reuse logic
-                QgsMessageLog.logMessage(
-                    "Reusing existing ImageListDialog", "IDPMPlugin", Qgis.Info
-                )
+    def _on_catalog_failed(self, error_message: str):
+        if self._catalog_cached is not None or self._catalog_dialog_shown:
+            QgsMessageLog.logMessage(
+                f"{error_message}. Keeping the catalog already shown.",
+                "IDPMPlugin",
+                Qgis.Warning,
+            )
+            return
 
-                # Update the dialog with new features and AOI
-                if hasattr(self.image_list_dialog, "update_features"):
-                    self.image_list_dialog.update_features(
-                        features, aoi=self.selected_aoi
-                    )
-                elif hasattr(self.image_list_dialog, "populate_list"):
-                    self.image_list_dialog.populate_list(geojson_data)
+        self._close_catalog_loading()
+        QgsMessageLog.logMessage(error_message, "IDPMPlugin", Qgis.Critical)
+        ThemedMessageBox.show_message(
+            self, QMessageBox.Critical, "Catalog Error", error_message
+        )
 
-                # Your existing window management
-                self.image_list_dialog.raise_()
-                self.image_list_dialog.activateWindow()
+    def _show_image_list(self, assets: List[RasterAsset]):
+        """Opens the image list for assets, or refreshes the one already open."""
+        from .list_raster import ImageListDialog
 
-            # Log success
-            feature_count = len(features)
-            aoi_status = "with AOI" if self.selected_aoi else "without AOI"
+        if self.image_list_dialog is None:
             QgsMessageLog.logMessage(
-                f"Successfully loaded raster catalog with {feature_count} images {aoi_status}",
+                f"Creating new ImageListDialog with {len(assets)} assets and AOI: {self.selected_aoi is not None}",
                 "IDPMPlugin",
                 Qgis.Info,
             )
 
-        except json.JSONDecodeError as e:
-            error_msg = f"Failed to parse server response: {str(e)}"
-            QgsMessageLog.logMessage(error_msg, "IDPMPlugin", Qgis.Critical)
-
-            ThemedMessageBox.show_message(
-                self,
-                QMessageBox.Critical,
-                "Parse Error",
-                "Invalid response from server. Please try again.",
+            self.image_list_dialog = ImageListDialog(
+                assets,
+                self.iface,
+                self.iface.mainWindow(),
+                aoi=self.selected_aoi,
             )
 
-        except Exception as e:
-            error_msg = f"Unexpected error processing catalog response: {str(e)}"
-            QgsMessageLog.logMessage(error_msg, "IDPMPlugin", Qgis.Critical)
+            self.image_list_dialog.finished.connect(self._on_image_list_closed)
+            self.image_list_dialog.show()
 
-            ThemedMessageBox.show_message(
-                self,
-                QMessageBox.Critical,
-                "Error",
-                f"An unexpected error occurred: {str(e)}",
+            QgsMessageLog.logMessage(
+                "ImageListDialog created and shown", "IDPMPlugin", Qgis.Info
+            )
+        else:
+            QgsMessageLog.logMessage(
+                "Reusing existing ImageListDialog", "IDPMPlugin", Qgis.Info
             )
+            self.image_list_dialog.update_features(assets, aoi=self.selected_aoi)
+            self.image_list_dialog.raise_()
+            self.image_list_dialog.activateWindow()
 
     def _clear_aoi(self):
         """
@@ -0,0 +1,274 @@
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QSize,
+    Qt,
+    QTimer,
+    pyqtSignal,
+)
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QFrame,
+    QListView,
+    QStyledItemDelegate,
+    QWidget,
+)
+
+from ..core import RasterAsset
+
+
+class RasterAssetListModel(QAbstractListModel):
+    """
+    List model over the filtered RasterAssets. Rows are exposed in batches
+    through canFetchMore()/fetchMore(), so the view grows as the user scrolls.
+    """
+
+    AssetRole = Qt.UserRole + 1
+    BATCH_SIZE = 20
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._assets: List[RasterAsset] = []
+        self._loaded = 0
+
+    def set_assets(self, assets: List[RasterAsset]) -> None:
+        self.beginResetModel()
+        self._assets = list(assets)
+        self._loaded = min(self.BATCH_SIZE, len(self._assets))
+        self.endResetModel()
+
+    def append_assets(self, assets: List[RasterAsset]) -> None:
+        """Adds assets at the end; rows are exposed right away only while the
+        view still shows less than one batch, otherwise through fetchMore()."""
+        self._assets.extend(assets)
+        count = min(self.BATCH_SIZE, len(self._assets)) - self._loaded
+        if count > 0:
+            self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+            self._loaded += count
+            self.endInsertRows()
+
+    def total_count(self) -> int:
+        return len(self._assets)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < self._loaded:
+            return None
+        asset = self._assets[index.row()]
+        if role == self.AssetRole:
+            return asset
+        if role == Qt.DisplayRole:
+            return asset.stac_id
+        return None
+
+    def asset_at(self, row: int) -> Optional[RasterAsset]:
+        if 0 <= row < self._loaded:
+            return self._assets[row]
+        return None
+
+    def assets_in_range(self, start: int, stop: int) -> List[RasterAsset]:
+        """Assets in [start, stop), including rows not fetched into the view yet."""
+        return self._assets[max(0, start) : max(0, stop)]
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < len(self._assets)
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        remaining = len(self._assets) - self._loaded
+        count = min(self.BATCH_SIZE, remaining)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+
+class RasterItemDelegate(QStyledItemDelegate):
+    """
+    Sizes rows for the item widgets that the view overlays on them. Heights
+    are reported by the bound widgets and remembered per stac_id.
+    """
+
+    DEFAULT_HEIGHT = 178
+
+    def __init__(self, view: "RasterListView"):
+        super().__init__(view)
+        self.view = view
+        self._heights: Dict[str, int] = {}
+
+    def sizeHint(self, option, index: QModelIndex) -> QSize:
+        asset = index.data(RasterAssetListModel.AssetRole)
+        height = self.DEFAULT_HEIGHT
+        if asset is not None:
+            height = self._heights.get(asset.stac_id, self.DEFAULT_HEIGHT)
+        return QSize(self.view.item_width(), height)
+
+    def set_height(self, index: QModelIndex, height: int) -> None:
+        asset = index.data(RasterAssetListModel.AssetRole)
+        if asset is None:
+            return
+        if self._heights.get(asset.stac_id, self.DEFAULT_HEIGHT) != height:
+            self._heights[asset.stac_id] = height
+            self.sizeHintChanged.emit(index)
+
+    def paint(self, painter, option, index: QModelIndex) -> None:
+        # The overlaid item widget draws the row.
+        pass
+
+
+class RasterListView(QListView):
+    """
+    Virtualized list of raster assets. Only the visible rows get an item
+    widget; widgets scrolled out of view go back to a pool and are rebound
+    to other assets, so memory stays flat regardless of catalog size.
+    """
+
+    visibleRowsChanged = pyqtSignal(int, int)  # first row, row after the last
+
+    def __init__(
+        self,
+        widget_factory: Callable[[QWidget], QWidget],
+        parent: Optional[QWidget] = None,
+    ):
+        super().__init__(parent)
+        self._widget_factory = widget_factory
+        self._free: List[QWidget] = []
+        self._bound: Dict[int, QWidget] = {}
+
+        self.setObjectName("rasterListView")
+        self.viewport().setObjectName("rasterListViewport")
+        self.setFrameShape(QFrame.NoFrame)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(20)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(False)
+        self.setSpacing(8)
+        self.setMouseTracking(False)
+
+        self.list_model = RasterAssetListModel(self)
+        self.item_delegate = RasterItemDelegate(self)
+        self.setModel(self.list_model)
+        self.setItemDelegate(self.item_delegate)
+
+        self._relayout_timer = QTimer(self)
+        self._relayout_timer.setSingleShot(True)
+        self._relayout_timer.timeout.connect(self._relayout_widgets)
+
+        self.list_model.modelReset.connect(self._on_model_reset)
+        self.list_model.rowsInserted.connect(self._schedule_relayout)
+        self.list_model.layoutChanged.connect(self._schedule_relayout)
+
+    def item_width(self) -> int:
+        return max(0, self.viewport().width() - 2 * self.spacing())
+
+    def set_assets(self, assets: List[RasterAsset]) -> None:
+        self.list_model.set_assets(assets)
+
+    def append_assets(self, assets: List[RasterAsset]) -> None:
+        self.list_model.append_assets(assets)
+
+    def bound_widgets(self) -> List[QWidget]:
+        return list(self._bound.values())
+
+    def widget_for(self, stac_id: str) -> Optional[QWidget]:
+        for widget in self._bound.values():
+            if widget.asset is not None and widget.asset.stac_id == stac_id:
+                return widget
+        return None
+
+    def _on_model_reset(self) -> None:
+        for widget in self._bound.values():
+            self._release(widget)
+        self._bound.clear()
+        self.scrollToTop()
+        self._schedule_relayout()
+
+    def _schedule_relayout(self, *args) -> None:
+        self._relayout_timer.start(0)
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        super().scrollContentsBy(dx, dy)
+        self._relayout_widgets()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._schedule_relayout()
+
+    def updateGeometries(self) -> None:
+        super().updateGeometries()
+        self._schedule_relayout()
+
+    def _visible_rows(self) -> range:
+        row_count = self.list_model.rowCount()
+        if row_count == 0:
+            return range(0)
+        height = self.viewport().height()
+        # Rows are laid out top to bottom, so find the first row whose
+        # bottom edge is inside the viewport by binary search.
+        first, hi = 0, row_count
+        while first < hi:
+            mid = (first + hi) // 2
+            if self.visualRect(self.list_model.index(mid)).bottom() < 0:
+                first = mid + 1
+            else:
+                hi = mid
+        last = first
+        while (
+            last < row_count
+            and self.visualRect(self.list_model.index(last)).top() < height
+        ):
+            last += 1
+        return range(first, last)
+
+    def _release(self, widget: QWidget) -> None:
+        widget.unbind()
+        widget.hide()
+        self._free.append(widget)
+
+    def _acquire(self) -> QWidget:
+        if self._free:
+            return self._free.pop()
+        widget = self._widget_factory(self.viewport())
+        widget.refreshed.connect(lambda w=widget: self._sync_widget_height(w))
+        return widget
+
+    def _relayout_widgets(self) -> None:
+        visible = self._visible_rows()
+
+        for row in [r for r in self._bound if r not in visible]:
+            self._release(self._bound.pop(row))
+
+        rebound = False
+        for row in visible:
+            asset = self.list_model.asset_at(row)
+            widget = self._bound.get(row)
+            if widget is None or widget.asset is not asset:
+                if widget is None:
+                    widget = self._acquire()
+                    self._bound[row] = widget
+                widget.set_asset(asset)
+                rebound = True
+            rect = self.visualRect(self.list_model.index(row))
+            widget.setGeometry(rect)
+            widget.show()
+            self._sync_widget_height(widget, row)
+
+        if rebound:
+            self.visibleRowsChanged.emit(visible.start, visible.stop)
+
+    def _sync_widget_height(self, widget: QWidget, row: Optional[int] = None) -> None:
+        if row is None:
+            row = next((r for r, w in self._bound.items() if w is widget), None)
+            if row is None:
+                return
+        if widget.layout() is not None:
+            widget.layout().activate()
+        height = max(RasterItemDelegate.DEFAULT_HEIGHT, widget.sizeHint().height())
+        self.item_delegate.set_height(self.list_model.index(row), height)